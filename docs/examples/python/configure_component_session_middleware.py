@@ -0,0 +1,4 @@
+MIDDLEWARE = [
+    ...,
+    "reactpy_django.http.middleware.ComponentSessionMiddleware",
+]
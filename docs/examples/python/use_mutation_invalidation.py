@@ -0,0 +1,39 @@
+from reactpy import component, html
+
+from example.models import TodoItem
+from reactpy_django.hooks import use_mutation, use_query
+from reactpy_django.types import Invalidation
+
+
+def get_item(pk: int):
+    return TodoItem.objects.get(pk=pk)
+
+
+def rename_item(pk: int, text: str):
+    TodoItem.objects.filter(pk=pk).update(text=text)
+
+    # Only refetch the `use_query` hooks that fetched this item
+    return Invalidation(get_item, {"pk": pk})
+
+
+@component
+def todo_item(pk: int):
+    item_query = use_query(get_item, {"pk": pk})
+    item_mutation = use_mutation(rename_item)
+
+    def submit_event(event):
+        if event["key"] == "Enter":
+            item_mutation(pk=pk, text=event["target"]["value"])
+
+    if item_query.loading:
+        rendered_item = html.h2("Loading...")
+    elif item_query.error or not item_query.data:
+        rendered_item = html.h2("Error when loading!")
+    else:
+        rendered_item = html.h2(item_query.data.text)
+
+    return html.div(
+        rendered_item,
+        html.label("Rename this item:"),
+        html.input({"type": "text", "onKeyDown": submit_event}),
+    )
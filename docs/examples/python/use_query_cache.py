@@ -0,0 +1,20 @@
+from reactpy import component, html
+
+from example.models import TodoItem
+from reactpy_django.hooks import use_query
+
+
+def get_items():
+    return TodoItem.objects.all()
+
+
+@component
+def todo_list():
+    # Every component on this server shares the same result for up to 30 seconds
+    item_query = use_query(get_items, cache_ttl=30, cache_stale_ttl=300)
+
+    if item_query.loading:
+        return html.h2("Loading...")
+    if item_query.error or not item_query.data:
+        return html.h2("Error when loading!")
+    return html.ul([html.li(item.text, key=item.pk) for item in item_query.data])
@@ -0,0 +1,23 @@
+from reactpy import component, html
+
+from example.models import TodoItem
+from reactpy_django.hooks import use_query
+
+
+def get_items():
+    return TodoItem.objects.all()
+
+
+@component
+def todo_list():
+    # Refetched whenever a `TodoItem` is saved or deleted
+    item_query = use_query(get_items, live=True)
+
+    if item_query.loading:
+        rendered_items = html.h2("Loading...")
+    elif item_query.error or not item_query.data:
+        rendered_items = html.h2("Error when loading!")
+    else:
+        rendered_items = html.ul([html.li(item.text, key=item.pk) for item in item_query.data])
+
+    return html.div("Rendered items: ", rendered_items)
@@ -47,8 +47,9 @@ export class ReactPyDjangoClient
     this.pageClient.registerComponent(this.rootId, {
       handleIncoming: (message: any) => this.handleIncoming(message),
       onOpen: () => {
-        // Reset mount guard on (re)connect — the server drops all component
-        // state and we must send mount-component again.
+        // Reset mount guard on (re)connect and send mount-component again.
+        // Reconnections within REACTPY_RESUME_GRACE_PERIOD resume the existing
+        // component instead, otherwise the server constructs a new one.
         this.mountSent = false;
         this.sendMountMessage();
         if (this.offlineElement && this.mountElement) {
@@ -95,12 +96,14 @@ export class ReactPyDjangoClient
   private sendMountMessage(): void {
     if (this.mountSent) return;
     this.mountSent = true;
-    this.pageClient.sendMessage(this.rootId, {
+    this.pageClient.sendMount(this.rootId, {
       type: "mount-component",
       rootId: this.rootId,
       dottedPath: this.componentConfig.dottedPath,
       componentUuid: this.componentConfig.componentUuid,
       hasArgs: Boolean(this.componentConfig.hasArgs),
+      paramsKey: this.componentConfig.paramsKey,
+      inlineParams: this.componentConfig.inlineParams,
     });
   }
 
@@ -6,6 +6,8 @@ export type ComponentConfig = {
   dottedPath: string;
   componentUuid: string;
   hasArgs: number;
+  paramsKey?: string;
+  inlineParams?: string;
 };
 
 export function mountComponent(
@@ -32,6 +34,11 @@ export function mountComponent(
     wsUrl.searchParams.set("qs", window.location.search);
   }
 
+  // Let the server know we are able to decompress large messages
+  if (typeof DecompressionStream !== "undefined") {
+    wsUrl.searchParams.set("compression", "deflate");
+  }
+
   // HTTP route for JavaScript modules
   const httpProtocol = window.location.protocol;
   const httpOrigin: string = host
@@ -1,3 +1,4 @@
+import { decode } from "@msgpack/msgpack";
 import { type ReactPyModule } from "@reactpy/client";
 import { createReconnectingWebSocket } from "./websocket";
 
@@ -9,6 +10,9 @@ type ComponentRecord = {
 
 const pageClients = new Map<string, PageClient>();
 
+// First byte of every zlib stream. MessagePack messages are maps, and never begin with this byte.
+const ZLIB_HEADER = 0x78;
+
 function pageClientKey(wsUrl: URL): string {
   return `${wsUrl.origin}${wsUrl.pathname}`;
 }
@@ -47,6 +51,8 @@ export class PageClient {
   private readonly messageQueue: any[] = [];
   private readonly jsModulesPath: string;
   private connected = false;
+  private incoming: Promise<void> = Promise.resolve();
+  private pendingMounts: any[] = [];
 
   constructor(
     private readonly key: string,
@@ -76,7 +82,18 @@ export class PageClient {
       url: this.wsUrl,
       readyPromise: Promise.resolve(),
       ...this.reconnectOptions,
-      onMessage: async ({ data }) => this.handleIncoming(JSON.parse(data)),
+      // The server will only select the MessagePack subprotocol if it is enabled,
+      // otherwise all messages are sent as JSON text.
+      protocols: ["reactpy.msgpack"],
+      onMessage: ({ data }) => {
+        // Decoding can be asynchronous, so chain each message to preserve ordering
+        this.incoming = this.incoming
+          .then(() => this.decodeIncoming(data))
+          .then((message) => this.handleIncoming(message))
+          .catch((error) =>
+            console.error("ReactPy failed to decode a message!", error),
+          );
+      },
       onOpen: () => {
         for (const [, record] of this.components) {
           if (record.onOpen) record.onOpen();
@@ -107,6 +124,23 @@ export class PageClient {
     this.sendRaw(message);
   }
 
+  /**
+   * Queue a mount-component message. All components that mount within the same
+   * task are sent together as one mount-components message, which allows the
+   * server to fetch their parameters with a single database query.
+   */
+  sendMount(rootId: string, message: any): void {
+    message.rootId = rootId;
+    this.pendingMounts.push(message);
+    if (this.pendingMounts.length === 1) {
+      queueMicrotask(() => {
+        const components = this.pendingMounts;
+        this.pendingMounts = [];
+        this.sendRaw({ type: "mount-components", components });
+      });
+    }
+  }
+
   private sendRaw(message: any): void {
     if (
       this.socket.current &&
@@ -118,8 +152,50 @@ export class PageClient {
     }
   }
 
+  /**
+   * Convert a WebSocket frame into a message. Text frames are JSON, while binary
+   * frames are MessagePack (if negotiated) and may be zlib compressed.
+   */
+  private async decodeIncoming(data: string | ArrayBuffer): Promise<any> {
+    if (typeof data === "string") return JSON.parse(data);
+
+    let bytes = new Uint8Array(data);
+    if (bytes[0] === ZLIB_HEADER) {
+      const stream = new Blob([bytes])
+        .stream()
+        .pipeThrough(new DecompressionStream("deflate"));
+      bytes = new Uint8Array(await new Response(stream).arrayBuffer());
+    }
+
+    return this.socket.current?.protocol === "reactpy.msgpack"
+      ? decode(bytes)
+      : JSON.parse(new TextDecoder().decode(bytes));
+  }
+
   /** Route an incoming message to the correct component by rootId. */
   private handleIncoming(message: any): void {
+    // Batched messages contain updates for any number of components
+    if (message.type === "layout-batch") {
+      for (const batchedMessage of message.messages) {
+        this.handleIncoming(batchedMessage);
+      }
+      return;
+    }
+
+    // Reconnect with this token to resume the same components, if the connection drops
+    if (message.type === "resume-token") {
+      this.wsUrl.searchParams.set("resume", message.token);
+      return;
+    }
+
+    // The server's event queue for this component is full
+    if (message.type === "event-rejected") {
+      console.warn(
+        `ReactPy server is busy, an event for component '${message.rootId}' was discarded.`,
+      );
+      return;
+    }
+
     const rootId = message.rootId;
     if (rootId && this.components.has(rootId)) {
       const componentMessage = { ...message };
@@ -3,7 +3,7 @@ import type { CreateReconnectingWebSocketProps } from "@reactpy/client";
 const log = console;
 
 export function createReconnectingWebSocket(
-  props: CreateReconnectingWebSocketProps,
+  props: CreateReconnectingWebSocketProps & { protocols?: string[] },
 ) {
   const { interval, maxInterval, maxRetries, backoffMultiplier } = props;
   let retries = 0;
@@ -17,7 +17,8 @@ export function createReconnectingWebSocket(
     // navigation in an SPA.
     props.url.searchParams.set("path", window.location.pathname);
     props.url.searchParams.set("qs", window.location.search);
-    socket.current = new WebSocket(props.url);
+    socket.current = new WebSocket(props.url, props.protocols);
+    socket.current.binaryType = "arraybuffer";
     socket.current.onopen = () => {
       everConnected = true;
       log.info("Connected!");
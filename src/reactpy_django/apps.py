@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 from reactpy_django.utils import RootComponentFinder
 
@@ -10,6 +11,11 @@ class ReactPyConfig(AppConfig):
         # Populate the ReactPy component registry when Django is ready
         RootComponentFinder().run()
 
+        # Tables of the `BucketedSessionStore` are created alongside ReactPy's migrations
+        from reactpy_django.sessions import create_session_buckets
+
+        post_migrate.connect(create_session_buckets, sender=self)
+
         # Mirror the ReactPy wheel into our static directory so PyScript
         # pages can fetch it. This is safe under multi-process servers:
         # see ``reactpy_django/_static_wheels.py`` for the locking and
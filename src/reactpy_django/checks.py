@@ -1,4 +1,5 @@
 import contextlib
+import importlib.util
 import math
 import sys
 from uuid import uuid4
@@ -251,6 +252,17 @@ def reactpy_warnings(app_configs, **kwargs):
             )
         )
 
+    # Check if the binary protocol is enabled without msgpack installed
+    if config.REACTPY_BINARY_PROTOCOL and not importlib.util.find_spec("msgpack"):
+        warnings.append(
+            checks.Warning(
+                "REACTPY_BINARY_PROTOCOL is enabled, but the `msgpack` package is not installed. "
+                "ReactPy will fall back to using JSON.",
+                hint="Install `reactpy-django[msgpack]` or set settings.py:REACTPY_BINARY_PROTOCOL to False.",
+                id="reactpy_django.W022",
+            )
+        )
+
     return warnings
 
 
@@ -564,4 +576,402 @@ def reactpy_errors(app_configs, **kwargs):
             )
         )
 
+    # Check if REACTPY_BATCH_INTERVAL is a valid data type
+    if not isinstance(config.REACTPY_BATCH_INTERVAL, (int, type(None))):
+        errors.append(
+            checks.Error(
+                "Invalid type for REACTPY_BATCH_INTERVAL.",
+                hint="REACTPY_BATCH_INTERVAL should be an integer or None.",
+                id="reactpy_django.E030",
+            )
+        )
+
+    # Check if REACTPY_BATCH_INTERVAL is a positive integer
+    if isinstance(config.REACTPY_BATCH_INTERVAL, int) and config.REACTPY_BATCH_INTERVAL < 0:
+        errors.append(
+            checks.Error(
+                "Invalid value for REACTPY_BATCH_INTERVAL.",
+                hint="REACTPY_BATCH_INTERVAL should be a positive integer or None.",
+                id="reactpy_django.E031",
+            )
+        )
+
+    # Check if REACTPY_BATCH_MAX_MESSAGES is a valid data type
+    if not isinstance(config.REACTPY_BATCH_MAX_MESSAGES, int):
+        errors.append(
+            checks.Error(
+                "Invalid type for REACTPY_BATCH_MAX_MESSAGES.",
+                hint="REACTPY_BATCH_MAX_MESSAGES should be an integer.",
+                id="reactpy_django.E032",
+            )
+        )
+
+    # Check if REACTPY_BATCH_MAX_MESSAGES is at least 1
+    if isinstance(config.REACTPY_BATCH_MAX_MESSAGES, int) and config.REACTPY_BATCH_MAX_MESSAGES < 1:
+        errors.append(
+            checks.Error(
+                "Invalid value for REACTPY_BATCH_MAX_MESSAGES.",
+                hint="REACTPY_BATCH_MAX_MESSAGES should be greater than or equal to 1.",
+                id="reactpy_django.E033",
+            )
+        )
+
+    # Check if REACTPY_BACKHAUL_THREAD_COUNT is a valid data type
+    if not isinstance(config.REACTPY_BACKHAUL_THREAD_COUNT, int):
+        errors.append(
+            checks.Error(
+                "Invalid type for REACTPY_BACKHAUL_THREAD_COUNT.",
+                hint="REACTPY_BACKHAUL_THREAD_COUNT should be an integer.",
+                id="reactpy_django.E034",
+            )
+        )
+
+    # Check if REACTPY_BACKHAUL_THREAD_COUNT is at least 1
+    if isinstance(config.REACTPY_BACKHAUL_THREAD_COUNT, int) and config.REACTPY_BACKHAUL_THREAD_COUNT < 1:
+        errors.append(
+            checks.Error(
+                "Invalid value for REACTPY_BACKHAUL_THREAD_COUNT.",
+                hint="REACTPY_BACKHAUL_THREAD_COUNT should be greater than or equal to 1.",
+                id="reactpy_django.E035",
+            )
+        )
+
+    # Check if REACTPY_PROCESS_POOL_SIZE is a valid data type
+    if not isinstance(config.REACTPY_PROCESS_POOL_SIZE, (int, type(None))):
+        errors.append(
+            checks.Error(
+                "Invalid type for REACTPY_PROCESS_POOL_SIZE.",
+                hint="REACTPY_PROCESS_POOL_SIZE should be an integer or None.",
+                id="reactpy_django.E036",
+            )
+        )
+
+    # Check if REACTPY_PROCESS_POOL_SIZE is at least 1
+    if isinstance(config.REACTPY_PROCESS_POOL_SIZE, int) and config.REACTPY_PROCESS_POOL_SIZE < 1:
+        errors.append(
+            checks.Error(
+                "Invalid value for REACTPY_PROCESS_POOL_SIZE.",
+                hint="REACTPY_PROCESS_POOL_SIZE should be greater than or equal to 1, or None.",
+                id="reactpy_django.E037",
+            )
+        )
+
+    # Check if REACTPY_EVENT_QUEUE_SIZE is a valid data type
+    if not isinstance(config.REACTPY_EVENT_QUEUE_SIZE, (int, type(None))):
+        errors.append(
+            checks.Error(
+                "Invalid type for REACTPY_EVENT_QUEUE_SIZE.",
+                hint="REACTPY_EVENT_QUEUE_SIZE should be an integer or None.",
+                id="reactpy_django.E038",
+            )
+        )
+
+    # Check if REACTPY_EVENT_QUEUE_SIZE is at least 1
+    if isinstance(config.REACTPY_EVENT_QUEUE_SIZE, int) and config.REACTPY_EVENT_QUEUE_SIZE < 1:
+        errors.append(
+            checks.Error(
+                "Invalid value for REACTPY_EVENT_QUEUE_SIZE.",
+                hint="REACTPY_EVENT_QUEUE_SIZE should be greater than or equal to 1, or None.",
+                id="reactpy_django.E039",
+            )
+        )
+
+    # Check if REACTPY_EVENT_QUEUE_POLICY is a valid value
+    if config.REACTPY_EVENT_QUEUE_POLICY not in {"drop-oldest", "coalesce", "reject"}:
+        errors.append(
+            checks.Error(
+                "Invalid value for REACTPY_EVENT_QUEUE_POLICY.",
+                hint="REACTPY_EVENT_QUEUE_POLICY should be one of 'drop-oldest', 'coalesce', or 'reject'.",
+                id="reactpy_django.E040",
+            )
+        )
+
+    # Check if REACTPY_BINARY_PROTOCOL is a valid data type
+    if not isinstance(config.REACTPY_BINARY_PROTOCOL, bool):
+        errors.append(
+            checks.Error(
+                "Invalid type for REACTPY_BINARY_PROTOCOL.",
+                hint="REACTPY_BINARY_PROTOCOL should be a boolean.",
+                id="reactpy_django.E041",
+            )
+        )
+
+    # Check if REACTPY_COMPRESSION_THRESHOLD is a valid data type
+    if not isinstance(config.REACTPY_COMPRESSION_THRESHOLD, (int, type(None))):
+        errors.append(
+            checks.Error(
+                "Invalid type for REACTPY_COMPRESSION_THRESHOLD.",
+                hint="REACTPY_COMPRESSION_THRESHOLD should be an integer or None.",
+                id="reactpy_django.E042",
+            )
+        )
+
+    # Check if REACTPY_COMPRESSION_THRESHOLD is a positive integer
+    if isinstance(config.REACTPY_COMPRESSION_THRESHOLD, int) and config.REACTPY_COMPRESSION_THRESHOLD < 0:
+        errors.append(
+            checks.Error(
+                "Invalid value for REACTPY_COMPRESSION_THRESHOLD.",
+                hint="REACTPY_COMPRESSION_THRESHOLD should be a positive integer or None.",
+                id="reactpy_django.E043",
+            )
+        )
+
+    # Check if REACTPY_RESUME_GRACE_PERIOD is a valid data type
+    if not isinstance(config.REACTPY_RESUME_GRACE_PERIOD, (int, type(None))):
+        errors.append(
+            checks.Error(
+                "Invalid type for REACTPY_RESUME_GRACE_PERIOD.",
+                hint="REACTPY_RESUME_GRACE_PERIOD should be an integer or None.",
+                id="reactpy_django.E044",
+            )
+        )
+
+    # Check if REACTPY_RESUME_GRACE_PERIOD is a positive integer
+    if isinstance(config.REACTPY_RESUME_GRACE_PERIOD, int) and config.REACTPY_RESUME_GRACE_PERIOD < 0:
+        errors.append(
+            checks.Error(
+                "Invalid value for REACTPY_RESUME_GRACE_PERIOD.",
+                hint="REACTPY_RESUME_GRACE_PERIOD should be a positive integer or None.",
+                id="reactpy_django.E045",
+            )
+        )
+
+    # Check if REACTPY_SESSION_STORE is a valid data type
+    if not isinstance(config.REACTPY_SESSION_STORE, str):
+        errors.append(
+            checks.Error(
+                "Invalid type for REACTPY_SESSION_STORE.",
+                hint="REACTPY_SESSION_STORE should be a string.",
+                id="reactpy_django.E046",
+            )
+        )
+
+    # Check if REACTPY_SESSION_STORE is a component session store
+    else:
+        from reactpy_django.sessions import ComponentSessionStore
+        from reactpy_django.utils import import_dotted_path
+
+        try:
+            session_store = import_dotted_path(config.REACTPY_SESSION_STORE)
+        except (AttributeError, RuntimeError, ValueError):
+            session_store = None
+        if not (isinstance(session_store, type) and issubclass(session_store, ComponentSessionStore)):
+            errors.append(
+                checks.Error(
+                    "Invalid value for REACTPY_SESSION_STORE.",
+                    hint="REACTPY_SESSION_STORE should be a dotted path to a ComponentSessionStore subclass.",
+                    id="reactpy_django.E047",
+                )
+            )
+
+    # Check if REACTPY_PARAMS_CODEC is a valid data type
+    if not isinstance(config.REACTPY_PARAMS_CODEC, str):
+        errors.append(
+            checks.Error(
+                "Invalid type for REACTPY_PARAMS_CODEC.",
+                hint="REACTPY_PARAMS_CODEC should be a string.",
+                id="reactpy_django.E048",
+            )
+        )
+
+    # Check if REACTPY_PARAMS_CODEC is a component parameter codec
+    else:
+        from reactpy_django.codecs import ParamsCodec
+        from reactpy_django.utils import import_dotted_path
+
+        try:
+            params_codec = import_dotted_path(config.REACTPY_PARAMS_CODEC)
+        except (AttributeError, RuntimeError, ValueError):
+            params_codec = None
+        if not (isinstance(params_codec, type) and issubclass(params_codec, ParamsCodec)):
+            errors.append(
+                checks.Error(
+                    "Invalid value for REACTPY_PARAMS_CODEC.",
+                    hint="REACTPY_PARAMS_CODEC should be a dotted path to a ParamsCodec subclass.",
+                    id="reactpy_django.E049",
+                )
+            )
+
+    # Check if REACTPY_INLINE_PARAMS is a valid data type
+    if not isinstance(config.REACTPY_INLINE_PARAMS, bool):
+        errors.append(
+            checks.Error(
+                "Invalid type for REACTPY_INLINE_PARAMS.",
+                hint="REACTPY_INLINE_PARAMS should be a boolean.",
+                id="reactpy_django.E050",
+            )
+        )
+
+    # Check if REACTPY_INLINE_PARAMS_MAX_SIZE is a valid data type
+    if not isinstance(config.REACTPY_INLINE_PARAMS_MAX_SIZE, int):
+        errors.append(
+            checks.Error(
+                "Invalid type for REACTPY_INLINE_PARAMS_MAX_SIZE.",
+                hint="REACTPY_INLINE_PARAMS_MAX_SIZE should be an integer.",
+                id="reactpy_django.E051",
+            )
+        )
+
+    # Check if REACTPY_INLINE_PARAMS_MAX_SIZE is a positive integer
+    if isinstance(config.REACTPY_INLINE_PARAMS_MAX_SIZE, int) and config.REACTPY_INLINE_PARAMS_MAX_SIZE < 0:
+        errors.append(
+            checks.Error(
+                "Invalid value for REACTPY_INLINE_PARAMS_MAX_SIZE.",
+                hint="REACTPY_INLINE_PARAMS_MAX_SIZE should be a positive integer.",
+                id="reactpy_django.E052",
+            )
+        )
+
+    # Check if REACTPY_SESSION_TOUCH_INTERVAL is a valid data type
+    if not isinstance(config.REACTPY_SESSION_TOUCH_INTERVAL, (int, type(None))):
+        errors.append(
+            checks.Error(
+                "Invalid type for REACTPY_SESSION_TOUCH_INTERVAL.",
+                hint="REACTPY_SESSION_TOUCH_INTERVAL should be an integer or None.",
+                id="reactpy_django.E053",
+            )
+        )
+
+    # Check if REACTPY_SESSION_TOUCH_INTERVAL is a positive integer
+    if isinstance(config.REACTPY_SESSION_TOUCH_INTERVAL, int) and config.REACTPY_SESSION_TOUCH_INTERVAL < 0:
+        errors.append(
+            checks.Error(
+                "Invalid value for REACTPY_SESSION_TOUCH_INTERVAL.",
+                hint="REACTPY_SESSION_TOUCH_INTERVAL should be a positive integer or None.",
+                id="reactpy_django.E054",
+            )
+        )
+
+    # Check if REACTPY_CLEAN_BATCH_SIZE is a valid data type
+    if not isinstance(config.REACTPY_CLEAN_BATCH_SIZE, int):
+        errors.append(
+            checks.Error(
+                "Invalid type for REACTPY_CLEAN_BATCH_SIZE.",
+                hint="REACTPY_CLEAN_BATCH_SIZE should be an integer.",
+                id="reactpy_django.E055",
+            )
+        )
+
+    # Check if REACTPY_CLEAN_BATCH_SIZE is a positive integer
+    if isinstance(config.REACTPY_CLEAN_BATCH_SIZE, int) and config.REACTPY_CLEAN_BATCH_SIZE < 1:
+        errors.append(
+            checks.Error(
+                "Invalid value for REACTPY_CLEAN_BATCH_SIZE.",
+                hint="REACTPY_CLEAN_BATCH_SIZE should be a positive integer.",
+                id="reactpy_django.E056",
+            )
+        )
+
+    # Check if REACTPY_CLEAN_TIME_BUDGET is a valid data type
+    if not isinstance(config.REACTPY_CLEAN_TIME_BUDGET, (int, float, type(None))):
+        errors.append(
+            checks.Error(
+                "Invalid type for REACTPY_CLEAN_TIME_BUDGET.",
+                hint="REACTPY_CLEAN_TIME_BUDGET should be a number or None.",
+                id="reactpy_django.E057",
+            )
+        )
+
+    # Check if REACTPY_CLEAN_TIME_BUDGET is a positive number
+    if isinstance(config.REACTPY_CLEAN_TIME_BUDGET, (int, float)) and config.REACTPY_CLEAN_TIME_BUDGET <= 0:
+        errors.append(
+            checks.Error(
+                "Invalid value for REACTPY_CLEAN_TIME_BUDGET.",
+                hint="REACTPY_CLEAN_TIME_BUDGET should be a positive number or None.",
+                id="reactpy_django.E058",
+            )
+        )
+
+    # Check if REACTPY_SESSION_BUCKET_SIZE is a valid data type
+    if not isinstance(config.REACTPY_SESSION_BUCKET_SIZE, int):
+        errors.append(
+            checks.Error(
+                "Invalid type for REACTPY_SESSION_BUCKET_SIZE.",
+                hint="REACTPY_SESSION_BUCKET_SIZE should be an integer.",
+                id="reactpy_django.E059",
+            )
+        )
+
+    # Check if REACTPY_SESSION_BUCKET_SIZE is a positive integer
+    if isinstance(config.REACTPY_SESSION_BUCKET_SIZE, int) and config.REACTPY_SESSION_BUCKET_SIZE < 1:
+        errors.append(
+            checks.Error(
+                "Invalid value for REACTPY_SESSION_BUCKET_SIZE.",
+                hint="REACTPY_SESSION_BUCKET_SIZE should be a positive integer.",
+                id="reactpy_django.E060",
+            )
+        )
+
+    # Check if REACTPY_QUERY_CACHE_MAX_ENTRIES is a valid data type
+    if not isinstance(config.REACTPY_QUERY_CACHE_MAX_ENTRIES, int):
+        errors.append(
+            checks.Error(
+                "Invalid type for REACTPY_QUERY_CACHE_MAX_ENTRIES.",
+                hint="REACTPY_QUERY_CACHE_MAX_ENTRIES should be an integer.",
+                id="reactpy_django.E061",
+            )
+        )
+
+    # Check if REACTPY_QUERY_CACHE_MAX_ENTRIES is a positive integer
+    if isinstance(config.REACTPY_QUERY_CACHE_MAX_ENTRIES, int) and config.REACTPY_QUERY_CACHE_MAX_ENTRIES < 1:
+        errors.append(
+            checks.Error(
+                "Invalid value for REACTPY_QUERY_CACHE_MAX_ENTRIES.",
+                hint="REACTPY_QUERY_CACHE_MAX_ENTRIES should be a positive integer.",
+                id="reactpy_django.E062",
+            )
+        )
+
+    # Check if REACTPY_QUERY_CACHE_SHARED is a valid data type
+    if not isinstance(config.REACTPY_QUERY_CACHE_SHARED, bool):
+        errors.append(
+            checks.Error(
+                "Invalid type for REACTPY_QUERY_CACHE_SHARED.",
+                hint="REACTPY_QUERY_CACHE_SHARED should be a boolean.",
+                id="reactpy_django.E063",
+            )
+        )
+
+    # Check if REACTPY_REFETCH_CHANNEL_LAYER is a valid data type
+    if not isinstance(config.REACTPY_REFETCH_CHANNEL_LAYER, (str, type(None))):
+        errors.append(
+            checks.Error(
+                "Invalid type for REACTPY_REFETCH_CHANNEL_LAYER.",
+                hint="REACTPY_REFETCH_CHANNEL_LAYER should be a string or None.",
+                id="reactpy_django.E064",
+            )
+        )
+
+    # Check if REACTPY_REFETCH_CHANNEL_LAYER exists
+    if isinstance(config.REACTPY_REFETCH_CHANNEL_LAYER, str) and config.REACTPY_REFETCH_CHANNEL_LAYER not in getattr(
+        settings, "CHANNEL_LAYERS", {}
+    ):
+        errors.append(
+            checks.Error(
+                "REACTPY_REFETCH_CHANNEL_LAYER is not a valid channel layer.",
+                hint="REACTPY_REFETCH_CHANNEL_LAYER should be the name of a layer within settings.py:CHANNEL_LAYERS.",
+                id="reactpy_django.E065",
+            )
+        )
+
+    # Check if REACTPY_REFETCH_INTERVAL is a valid data type
+    if not isinstance(config.REACTPY_REFETCH_INTERVAL, int):
+        errors.append(
+            checks.Error(
+                "Invalid type for REACTPY_REFETCH_INTERVAL.",
+                hint="REACTPY_REFETCH_INTERVAL should be an integer.",
+                id="reactpy_django.E066",
+            )
+        )
+
+    # Check if REACTPY_REFETCH_INTERVAL is a positive integer
+    if isinstance(config.REACTPY_REFETCH_INTERVAL, int) and config.REACTPY_REFETCH_INTERVAL < 0:
+        errors.append(
+            checks.Error(
+                "Invalid value for REACTPY_REFETCH_INTERVAL.",
+                hint="REACTPY_REFETCH_INTERVAL should be a positive integer.",
+                id="reactpy_django.E067",
+            )
+        )
+
     return errors
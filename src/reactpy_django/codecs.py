@@ -0,0 +1,205 @@
+"""Serializers used to store the args/kwargs of a component within its component session."""
+
+from __future__ import annotations
+
+import logging
+import math
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from functools import cache
+from typing import TYPE_CHECKING, Any
+
+import dill
+import orjson
+from django.apps import apps
+from django.core import signing
+from django.db.models.base import Model
+from django.utils.safestring import SafeString
+
+from reactpy_django.exceptions import ParamsDecodeError
+from reactpy_django.types import ComponentParams
+from reactpy_django.utils import import_dotted_path
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+_logger = logging.getLogger(__name__)
+SIGNING_SALT = "reactpy_django.component_params"
+FAST_PATH_PREFIX = b"\x00"
+MODEL_REFERENCE_KEY = "__reactpy_model__"
+_MODEL_REFERENCE_BYTES = MODEL_REFERENCE_KEY.encode()
+
+
+class ParamsCodec:
+    """Base class for component parameter codecs."""
+
+    def encode(self, params: ComponentParams) -> bytes:
+        """Serialize component parameters. This is called while rendering a template."""
+        raise NotImplementedError
+
+    def decode(self, data: bytes) -> ComponentParams:
+        """Deserialize component parameters."""
+        raise NotImplementedError
+
+    def decode_many(self, payloads: Mapping[str, bytes]) -> dict[str, ComponentParams]:
+        """Deserialize the parameters of many component sessions at once. Sessions that
+        fail to decode are omitted from the result.
+
+        This is run within a thread, so it is safe to perform synchronous database queries."""
+        decoded: dict[str, ComponentParams] = {}
+        for uuid, data in payloads.items():
+            try:
+                decoded[uuid] = self.decode(data)
+            except Exception:
+                _logger.exception("Failed to load parameters of component session '%s'!", uuid)
+
+        return decoded
+
+
+class DillParamsCodec(ParamsCodec):
+    """Pickles parameters with `dill`, which supports nearly any Python object."""
+
+    def encode(self, params: ComponentParams) -> bytes:
+        return dill.dumps(params)
+
+    def decode(self, data: bytes) -> ComponentParams:
+        return dill.loads(data)
+
+
+class FastParamsCodec(ParamsCodec):
+    """Serializes parameters with `orjson` when they only contain JSON types (`str`, `int`,
+    `float`, `bool`, `None`, `list`, and `dict` with string keys) or saved Django model
+    instances. `SafeString` values are stored as `str`. Anything else falls back to `dill`.
+
+    Model instances are stored as a reference to their primary key, and are re-fetched from
+    the database when the component is mounted. All references within a batch of mounted
+    components are fetched with one query per model. Since instances are re-fetched, any
+    annotations or unsaved changes are not preserved."""
+
+    fallback = DillParamsCodec()
+
+    def encode(self, params: ComponentParams) -> bytes:
+        try:
+            args = [self._to_json(value) for value in params.args]
+            kwargs = self._to_json(params.kwargs)
+            return FAST_PATH_PREFIX + orjson.dumps([args, kwargs])
+        except TypeError:
+            return self.fallback.encode(params)
+
+    def decode(self, data: bytes) -> ComponentParams:
+        decoded = self.decode_many({"": data})
+        if "" not in decoded:
+            msg = "Failed to decode component parameters."
+            raise ParamsDecodeError(msg)
+        return decoded[""]
+
+    def decode_many(self, payloads: Mapping[str, bytes]) -> dict[str, ComponentParams]:
+        # Parse every payload, while collecting the model references they contain.
+        # Payloads without any model references are complete as soon as they are parsed.
+        decoded: dict[str, ComponentParams] = {}
+        parsed: dict[str, Any] = {}
+        references: dict[str, set[Any]] = {}
+        for uuid, data in payloads.items():
+            if not data.startswith(FAST_PATH_PREFIX):
+                decoded |= self.fallback.decode_many({uuid: data})
+                continue
+            try:
+                args, kwargs = orjson.loads(data[len(FAST_PATH_PREFIX) :])
+            except ValueError:
+                _logger.exception("Failed to load parameters of component session '%s'!", uuid)
+                continue
+            if _MODEL_REFERENCE_BYTES in data:
+                parsed[uuid] = [args, kwargs]
+                self._find_references(parsed[uuid], references)
+            else:
+                decoded[uuid] = ComponentParams(tuple(args), kwargs)
+
+        # Fetch all referenced model instances
+        instances: dict[tuple[str, Any], Model] = {}
+        for label, pks in references.items():
+            try:
+                # The base manager is used, since a default manager may filter out instances
+                fetched = apps.get_model(label)._base_manager.in_bulk(pks)
+            except Exception:
+                _logger.exception("Failed to fetch %s instances referenced by component parameters!", label)
+                continue
+            for pk, instance in fetched.items():
+                instances[label, pk] = instance
+
+        for uuid, value in parsed.items():
+            try:
+                args, kwargs = self._from_json(value, instances)
+                decoded[uuid] = ComponentParams(tuple(args), kwargs)
+            except LookupError:
+                _logger.exception("Failed to load parameters of component session '%s'!", uuid)
+
+        return decoded
+
+    def _to_json(self, value: Any) -> Any:
+        value_type = type(value)
+        if value is None or value_type in {str, bool, int}:
+            return value
+        # String literals within the `component` template tag are resolved as `SafeString`,
+        # which ReactPy doesn't need to distinguish from `str`
+        if isinstance(value, SafeString):
+            return str(value)
+        if value_type is float and math.isfinite(value):
+            return value
+        if value_type is list:
+            return [self._to_json(item) for item in value]
+        if value_type is dict and MODEL_REFERENCE_KEY not in value and all(type(key) is str for key in value):
+            return {key: self._to_json(item) for key, item in value.items()}
+        if isinstance(value, Model) and type(value.pk) in {int, str}:
+            return {MODEL_REFERENCE_KEY: [value._meta.label_lower, value.pk]}
+
+        msg = f"{value_type} is not supported by the fast path."
+        raise TypeError(msg)
+
+    def _find_references(self, value: Any, references: dict[str, set[Any]]) -> None:
+        if isinstance(value, list):
+            for item in value:
+                self._find_references(item, references)
+        elif isinstance(value, dict):
+            if MODEL_REFERENCE_KEY in value:
+                label, pk = value[MODEL_REFERENCE_KEY]
+                references.setdefault(label, set()).add(pk)
+            else:
+                for item in value.values():
+                    self._find_references(item, references)
+
+    def _from_json(self, value: Any, instances: Mapping[tuple[str, Any], Model]) -> Any:
+        if isinstance(value, list):
+            return [self._from_json(item, instances) for item in value]
+        if isinstance(value, dict):
+            if MODEL_REFERENCE_KEY in value:
+                label, pk = value[MODEL_REFERENCE_KEY]
+                return instances[label, pk]
+            return {key: self._from_json(item, instances) for key, item in value.items()}
+        return value
+
+
+def sign_params(data: bytes) -> str:
+    """Sign serialized component parameters, so they can be embedded within a webpage."""
+    return signing.TimestampSigner(salt=SIGNING_SALT).sign(urlsafe_b64encode(data).decode())
+
+
+def unsign_params(value: str) -> bytes:
+    """Verify component parameters that were signed by `sign_params`.
+
+    Raises `django.core.signing.BadSignature` if the parameters were tampered with, or
+    are older than `REACTPY_SESSION_MAX_AGE`."""
+    from reactpy_django.config import REACTPY_SESSION_MAX_AGE
+
+    signer = signing.TimestampSigner(salt=SIGNING_SALT)
+    return urlsafe_b64decode(signer.unsign(value, max_age=REACTPY_SESSION_MAX_AGE))
+
+
+def get_params_codec() -> ParamsCodec:
+    """Returns the component parameter codec configured by `REACTPY_PARAMS_CODEC`."""
+    from reactpy_django.config import REACTPY_PARAMS_CODEC
+
+    return _load_params_codec(REACTPY_PARAMS_CODEC)
+
+
+@cache
+def _load_params_codec(dotted_path: str) -> ParamsCodec:
+    return import_dotted_path(dotted_path)()
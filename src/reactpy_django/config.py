@@ -19,11 +19,13 @@ if TYPE_CHECKING:
         AsyncPostprocessor,
         SyncPostprocessor,
     )
+    from reactpy_django.websocket.queues import EventQueuePolicy
 
 # Non-configurable values
 REACTPY_REGISTERED_COMPONENTS: dict[str, ComponentConstructor] = {}
 REACTPY_FAILED_COMPONENTS: set[str] = set()
 REACTPY_REGISTERED_IFRAME_VIEWS: dict[str, Callable | View] = {}
+REACTPY_PROCESS_COMPONENTS: set[str] = set()
 
 # Configurable through Django settings.py
 DJANGO_DEBUG = settings.DEBUG  # Snapshot of Django's DEBUG setting
@@ -54,6 +56,26 @@ REACTPY_DATABASE: str = getattr(
     "REACTPY_DATABASE",
     DEFAULT_DB_ALIAS,
 )
+REACTPY_SESSION_STORE: str = getattr(
+    settings,
+    "REACTPY_SESSION_STORE",
+    "reactpy_django.sessions.DatabaseSessionStore",
+)
+REACTPY_SESSION_TOUCH_INTERVAL: int | None = getattr(
+    settings,
+    "REACTPY_SESSION_TOUCH_INTERVAL",
+    10,
+)
+REACTPY_SESSION_BUCKET_SIZE: int = getattr(
+    settings,
+    "REACTPY_SESSION_BUCKET_SIZE",
+    86400,  # Default to 1 day
+)
+REACTPY_PARAMS_CODEC: str = getattr(
+    settings,
+    "REACTPY_PARAMS_CODEC",
+    "reactpy_django.codecs.FastParamsCodec",
+)
 _default_query_postprocessor = getattr(
     settings,
     "REACTPY_DEFAULT_QUERY_POSTPROCESSOR",
@@ -68,6 +90,26 @@ else:
         if (_default_query_postprocessor == "UNSET" or not isinstance(_default_query_postprocessor, str))
         else _default_query_postprocessor
     )
+REACTPY_QUERY_CACHE_MAX_ENTRIES: int = getattr(
+    settings,
+    "REACTPY_QUERY_CACHE_MAX_ENTRIES",
+    1000,
+)
+REACTPY_QUERY_CACHE_SHARED: bool = getattr(
+    settings,
+    "REACTPY_QUERY_CACHE_SHARED",
+    False,
+)
+REACTPY_REFETCH_CHANNEL_LAYER: str | None = getattr(
+    settings,
+    "REACTPY_REFETCH_CHANNEL_LAYER",
+    None,
+)
+REACTPY_REFETCH_INTERVAL: int = getattr(
+    settings,
+    "REACTPY_REFETCH_INTERVAL",
+    100,
+)
 REACTPY_AUTH_BACKEND: str | None = getattr(
     settings,
     "REACTPY_AUTH_BACKEND",
@@ -78,6 +120,51 @@ REACTPY_BACKHAUL_THREAD: bool = getattr(
     "REACTPY_BACKHAUL_THREAD",
     False,
 )
+REACTPY_BACKHAUL_THREAD_COUNT: int = getattr(
+    settings,
+    "REACTPY_BACKHAUL_THREAD_COUNT",
+    1,
+)
+REACTPY_PROCESS_POOL_SIZE: int | None = getattr(
+    settings,
+    "REACTPY_PROCESS_POOL_SIZE",
+    None,  # Default to the number of CPUs
+)
+REACTPY_EVENT_QUEUE_SIZE: int | None = getattr(
+    settings,
+    "REACTPY_EVENT_QUEUE_SIZE",
+    None,
+)
+REACTPY_EVENT_QUEUE_POLICY: EventQueuePolicy = getattr(
+    settings,
+    "REACTPY_EVENT_QUEUE_POLICY",
+    "coalesce",
+)
+REACTPY_BINARY_PROTOCOL: bool = getattr(
+    settings,
+    "REACTPY_BINARY_PROTOCOL",
+    False,
+)
+REACTPY_COMPRESSION_THRESHOLD: int | None = getattr(
+    settings,
+    "REACTPY_COMPRESSION_THRESHOLD",
+    None,
+)
+REACTPY_BATCH_INTERVAL: int | None = getattr(
+    settings,
+    "REACTPY_BATCH_INTERVAL",
+    None,
+)
+REACTPY_BATCH_MAX_MESSAGES: int = getattr(
+    settings,
+    "REACTPY_BATCH_MAX_MESSAGES",
+    50,
+)
+REACTPY_RESUME_GRACE_PERIOD: int | None = getattr(
+    settings,
+    "REACTPY_RESUME_GRACE_PERIOD",
+    None,
+)
 _default_hosts: list[str] | None = getattr(
     settings,
     "REACTPY_DEFAULT_HOSTS",
@@ -111,6 +198,16 @@ REACTPY_PRERENDER: bool = getattr(
     "REACTPY_PRERENDER",
     False,
 )
+REACTPY_INLINE_PARAMS: bool = getattr(
+    settings,
+    "REACTPY_INLINE_PARAMS",
+    False,
+)
+REACTPY_INLINE_PARAMS_MAX_SIZE: int = getattr(
+    settings,
+    "REACTPY_INLINE_PARAMS_MAX_SIZE",
+    1024,
+)
 REACTPY_AUTO_RELOGIN: bool = getattr(
     settings,
     "REACTPY_AUTO_RELOGIN",
@@ -136,6 +233,16 @@ REACTPY_CLEAN_USER_DATA: bool = getattr(
     "REACTPY_CLEAN_USER_DATA",
     True,
 )
+REACTPY_CLEAN_BATCH_SIZE: int = getattr(
+    settings,
+    "REACTPY_CLEAN_BATCH_SIZE",
+    1000,
+)
+REACTPY_CLEAN_TIME_BUDGET: float | None = getattr(
+    settings,
+    "REACTPY_CLEAN_TIME_BUDGET",
+    10,
+)
 REACTPY_DEFAULT_FORM_TEMPLATE: str | None = getattr(
     settings,
     "REACTPY_DEFAULT_FORM_TEMPLATE",
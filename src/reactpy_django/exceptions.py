@@ -23,3 +23,9 @@ class ViewDoesNotExistError(AttributeError): ...
 
 
 class DecoratorParamError(TypeError): ...
+
+
+class ProcessPoolExhaustedError(RuntimeError): ...
+
+
+class ParamsDecodeError(ValueError): ...
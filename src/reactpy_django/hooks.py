@@ -16,12 +16,15 @@ import orjson
 from channels import DEFAULT_CHANNEL_LAYER
 from channels import auth as channels_auth
 from channels.layers import InMemoryChannelLayer, get_channel_layer
-from reactpy import use_async_effect, use_callback, use_effect, use_memo, use_ref, use_state
+from reactpy import Ref, use_async_effect, use_callback, use_effect, use_memo, use_ref, use_state
 from reactpy import use_connection as _use_connection
 from reactpy import use_location as _use_location
 from reactpy import use_scope as _use_scope
 
 from reactpy_django.exceptions import UserNotFoundError
+from reactpy_django.live import LIVE_QUERIES, query_models
+from reactpy_django.query_cache import QUERY_CACHE, kwargs_match, normalize_kwargs, query_cache_key, query_name
+from reactpy_django.refetch import REFETCH_BUS
 from reactpy_django.types import (
     AsyncMessageReceiver,
     AsyncMessageSender,
@@ -29,6 +32,7 @@ from reactpy_django.types import (
     ConnectionType,
     FuncParams,
     Inferred,
+    Invalidation,
     Mutation,
     Query,
     SyncPostprocessor,
@@ -42,11 +46,16 @@ if TYPE_CHECKING:
 
     from channels_redis.core import RedisChannelLayer
     from django.contrib.auth.models import AbstractUser
+    from django.db.models import Model
     from reactpy.types import Location
 
 
 _logger = logging.getLogger(__name__)
-_REFETCH_CALLBACKS: defaultdict[Callable[..., Any], set[Callable[[], None]]] = defaultdict(set)
+_REFETCH_CALLBACKS: defaultdict[
+    Callable[..., Any], dict[Callable[[], None], tuple[Ref[dict[str, Any]], asyncio.AbstractEventLoop]]
+] = defaultdict(dict)
+"""The refetch callback of every mounted `use_query`, alongside its kwargs and the event loop it
+is rendered within."""
 
 
 def use_location() -> Location:
@@ -95,6 +104,9 @@ def use_query(
     thread_sensitive: bool = True,
     postprocessor: (AsyncPostprocessor | SyncPostprocessor | None) = django_query_postprocessor,
     postprocessor_kwargs: dict[str, Any] | None = None,
+    cache_ttl: float | None = None,
+    cache_stale_ttl: float = 0,
+    live: bool | Sequence[type[Model]] = False,
 ) -> Query[Inferred]:
     """This hook is used to execute functions in the background and return the result, \
         typically to read data the Django ORM.
@@ -116,6 +128,15 @@ def use_query(
             is used to prevent Django's lazy query execution and supports `many_to_many` \
             and `many_to_one` as `postprocessor_kwargs`.
         postprocessor_kwargs: Keyworded arguments passed into the `postprocessor` function.
+        cache_ttl: If set, the result of this query is cached for this many seconds, and \
+            is shared with every other `use_query` that has the same `query`, `kwargs`, \
+            and `postprocessor`. Identical queries that run at the same time are only \
+            executed once.
+        cache_stale_ttl: After `cache_ttl` has passed, continue to return the cached \
+            result for this many seconds while the query is re-executed in the background.
+        live: If `True`, the query is automatically refetched whenever the models within \
+            its result are saved, deleted, or have their many-to-many relations changed. \
+            Alternatively, provide the models that the query depends on.
 
     Returns:
          An object containing `loading`/`#!python error` states, your `data` (if the query \
@@ -127,28 +148,59 @@ def use_query(
     loading, set_loading = use_state(True)
     error, set_error = use_state(cast("Union[Exception, None]", None))
     query_ref = use_ref(query)
+    force_ref = use_ref(False)
+    coalesce_ref = use_ref(False)
+    executing_ref = use_ref(False)
+    rerun_ref = use_ref(False)
+    debounce_ref: Ref[asyncio.Future | None] = use_ref(None)
+    invalidate_ref = use_ref(False)
+    mounted_ref = use_ref(True)
     kwargs = kwargs or {}
+    kwargs_ref = use_ref(kwargs)
+    kwargs_ref.current = kwargs
     postprocessor_kwargs = postprocessor_kwargs or {}
 
     if query_ref.current is not query:
         msg = f"Query function changed from {query_ref.current} to {query}."
         raise ValueError(msg)
 
+    async def run_query() -> Inferred:
+        # Run the query
+        query_async = cast("Callable[..., Awaitable[Inferred]]", ensure_async(query, thread_sensitive=thread_sensitive))
+        new_data = await query_async(**kwargs)
+
+        # Run the postprocessor
+        if postprocessor:
+            async_postprocessor = cast(
+                "Callable[..., Awaitable[Any]]", ensure_async(postprocessor, thread_sensitive=thread_sensitive)
+            )
+            new_data = await async_postprocessor(new_data, **postprocessor_kwargs)
+
+        return new_data
+
     async def execute_query() -> None:
         """The main running function for `use_query`"""
+        force, force_ref.current = force_ref.current, False
+        coalesce, coalesce_ref.current = coalesce_ref.current, False
         try:
-            # Run the query
-            query_async = cast(
-                "Callable[..., Awaitable[Inferred]]", ensure_async(query, thread_sensitive=thread_sensitive)
+            key = (
+                query_cache_key(query, kwargs, postprocessor, postprocessor_kwargs)
+                if cache_ttl is not None or coalesce
+                else None
             )
-            new_data = await query_async(**kwargs)
-
-            # Run the postprocessor
-            if postprocessor:
-                async_postprocessor = cast(
-                    "Callable[..., Awaitable[Any]]", ensure_async(postprocessor, thread_sensitive=thread_sensitive)
+            if key is not None and cache_ttl is not None:
+                new_data = await QUERY_CACHE.get_or_execute(
+                    query_name(query),
+                    key,
+                    run_query,
+                    ttl=cache_ttl,
+                    stale_ttl=cache_stale_ttl,
+                    force=force,
                 )
-                new_data = await async_postprocessor(new_data, **postprocessor_kwargs)
+            elif key is not None:
+                new_data = await QUERY_CACHE.coalesce(key, run_query)
+            else:
+                new_data = await run_query()
 
         # Log any errors and set the error state
         except Exception as e:
@@ -159,6 +211,8 @@ def use_query(
 
         # Query was successful
         else:
+            if live and mounted_ref.current:
+                LIVE_QUERIES.subscribe(refetch_from_model_change, query_models(new_data) if live is True else live)
             set_data(new_data)
             set_loading(False)
             set_error(None)
@@ -170,40 +224,90 @@ def use_query(
         if not should_execute:
             return
 
-        # Execute the query
-        await execute_query()
+        # Execute the query, as well as any refetch that was requested while it was executing
+        executing_ref.current = True
+        try:
+            await execute_query()
+            while rerun_ref.current:
+                rerun_ref.current = False
+                await execute_query()
+        finally:
+            executing_ref.current = False
         set_should_execute(False)
 
-    @use_callback
-    def refetch() -> None:
-        """Callable provided to the user, used to re-execute the query"""
+    def request_execution() -> None:
+        if executing_ref.current:
+            rerun_ref.current = True
         set_should_execute(True)
         set_loading(True)
         set_error(None)
 
+    async def debounced_refetch() -> None:
+        from reactpy_django.config import REACTPY_REFETCH_INTERVAL
+
+        await asyncio.sleep(REACTPY_REFETCH_INTERVAL / 1000)
+        if invalidate_ref.current:
+            invalidate_ref.current = False
+            await QUERY_CACHE.ainvalidate(query_name(query))
+        coalesce_ref.current = True
+        request_execution()
+
+    @use_callback
+    def refetch_from_mutation() -> None:
+        """Re-execute the query, at most once per `REACTPY_REFETCH_INTERVAL`. Identical queries
+        that are refetched at the same time share a single execution."""
+        if not debounce_ref.current or debounce_ref.current.done():
+            debounce_ref.current = asyncio.ensure_future(debounced_refetch())
+
+    @use_callback(dependencies=[])
+    def refetch_from_model_change() -> None:
+        """Re-execute a live query after the models it depends on have changed. Unlike
+        mutations, model changes do not invalidate cached results by themselves."""
+        if cache_ttl is not None:
+            invalidate_ref.current = True
+        refetch_from_mutation()
+
+    @use_callback
+    def refetch() -> None:
+        """Callable provided to the user, used to re-execute the query"""
+        force_ref.current = True
+        request_execution()
+
     @use_effect(dependencies=[])
     def register_refetch_callback() -> Callable[[], None]:
         """Track the refetch callback so we can re-execute the query"""
         # By tracking callbacks globally, any usage of the query function will be re-run
         # if the user has told a mutation to refetch it.
-        _REFETCH_CALLBACKS[query].add(refetch)
-        return lambda: _REFETCH_CALLBACKS[query].remove(refetch)
+        # Their kwargs are also tracked, so that mutations can refetch specific queries.
+        # Their event loop is also tracked, since mutations may run within another backhaul thread.
+        _REFETCH_CALLBACKS[query][refetch_from_mutation] = (kwargs_ref, asyncio.get_running_loop())
+
+        def unregister() -> None:
+            _REFETCH_CALLBACKS[query].pop(refetch_from_mutation, None)
+            mounted_ref.current = False
+            LIVE_QUERIES.unsubscribe(refetch_from_model_change)
+
+        return unregister
 
     # Return Query user API
     return Query(data, loading, error, refetch)
 
 
 def use_mutation(
-    mutation: (Callable[FuncParams, bool | None] | Callable[FuncParams, Awaitable[bool | None]]),
+    mutation: (
+        Callable[FuncParams, bool | Invalidation | Sequence[Invalidation] | None]
+        | Callable[FuncParams, Awaitable[bool | Invalidation | Sequence[Invalidation] | None]]
+    ),
     *,
     thread_sensitive: bool = True,
-    refetch: Callable[..., Any] | Sequence[Callable[..., Any]] | None = None,
+    refetch: Callable[..., Any] | Invalidation | Sequence[Callable[..., Any] | Invalidation] | None = None,
 ) -> Mutation[FuncParams]:
     """This hook is used to modify data in the background, typically to create/update/delete \
     data from the Django ORM.
 
-    Mutation functions can `return False` to prevent executing your `refetch` function. All \
-    other returns are ignored. Mutation functions can be sync or async.
+    Mutation functions can `return False` to prevent executing your `refetch` function, or \
+    return `Invalidation`(s) to choose which queries to refetch. All other returns are \
+    ignored. Mutation functions can be sync or async.
 
     Args:
         mutation: A callable that performs Django ORM create, update, or delete \
@@ -217,7 +321,8 @@ def use_mutation(
         refetch:  A query function (the function you provide to your `use_query` \
             hook) or a sequence of query functions that need a `refetch` if the \
             mutation succeeds. This is useful for refreshing data after a mutation \
-            has been performed.
+            has been performed. To only refetch queries with specific `kwargs`, \
+            provide an `Invalidation(query, kwargs)` instead of a query function.
 
     Returns:
         An object containing `#!python loading`/`#!python error` states, and a \
@@ -248,10 +353,32 @@ def use_mutation(
 
             # `refetch` will execute unless explicitly told not to
             # or if `refetch` was not defined.
-            if should_refetch is not False and refetch:
-                for query in (refetch,) if callable(refetch) else refetch:
-                    for callback in _REFETCH_CALLBACKS.get(query) or ():
-                        callback()
+            # The mutation can return `Invalidation`s to override what gets refetched
+            invalidations = _invalidations(refetch)
+            if isinstance(should_refetch, Invalidation) or (
+                isinstance(should_refetch, (list, tuple))
+                and should_refetch
+                and all(isinstance(item, Invalidation) for item in should_refetch)
+            ):
+                invalidations = _invalidations(should_refetch)
+            if should_refetch is not False and invalidations:
+                published: list[tuple[str, dict[str, Any] | None]] = []
+                for invalidation in invalidations:
+                    name = query_name(invalidation.query)
+                    try:
+                        expected = normalize_kwargs(invalidation.kwargs) if invalidation.kwargs else None
+                    except TypeError:
+                        _logger.warning(
+                            "Refetching every use of query '%s', since its invalidation kwargs cannot be compared.",
+                            name,
+                        )
+                        expected = None
+                    await QUERY_CACHE.ainvalidate(name)
+                    _refetch(invalidation.query, expected)
+                    published.append((name, expected))
+
+                # Queries rendered by other processes also need to be refetched
+                REFETCH_BUS.publish(published)
 
     # Schedule the mutation to be run when needed
     def schedule_mutation(*exec_args: FuncParams.args, **exec_kwargs: FuncParams.kwargs) -> None:
@@ -277,6 +404,40 @@ def use_mutation(
     return Mutation(schedule_mutation, loading, error, reset)
 
 
+def _invalidations(
+    refetch: Callable[..., Any] | Invalidation | Sequence[Callable[..., Any] | Invalidation] | None,
+) -> list[Invalidation]:
+    if not refetch:
+        return []
+    queries = (refetch,) if callable(refetch) or isinstance(refetch, Invalidation) else refetch
+    return [query if isinstance(query, Invalidation) else Invalidation(query) for query in queries]
+
+
+def _refetch(query: Callable[..., Any], expected: dict[str, Any] | None = None) -> None:
+    """Refetch every `use_query` of a query function within this process. If `expected` (normalized)
+    kwargs are provided, only queries that were given all of these kwargs are refetched.
+    Queries with kwargs that cannot be compared are always refetched.
+
+    Each query is refetched within the event loop it is rendered within, which may belong to
+    another backhaul thread."""
+    try:
+        current_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        current_loop = None
+
+    for callback, (kwargs_ref, loop) in list(_REFETCH_CALLBACKS.get(query, {}).items()):
+        try:
+            matches = expected is None or kwargs_match(normalize_kwargs(kwargs_ref.current), expected)
+        except TypeError:
+            matches = True
+        if not matches:
+            continue
+        if loop is current_loop:
+            callback()
+        elif not loop.is_closed():
+            loop.call_soon_threadsafe(callback)
+
+
 def use_user() -> AbstractUser:
     """Get the current `User` object from either the WebSocket or HTTP request."""
     connection = use_connection()
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from channels.db import database_sync_to_async
+
+if TYPE_CHECKING:
+    from django.http import HttpRequest, HttpResponse
+
+_logger = logging.getLogger(__name__)
+
+
+class ComponentSessionMiddleware:
+    """Collects the parameters of every `{% component %}` tag rendered during a request,
+    and saves them all at once after the response has been rendered.
+
+    Without this middleware, each `{% component %}` tag that has args/kwargs saves its
+    parameters individually."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)  # type: ignore[return-value]
+
+        request._reactpy_component_params = {}  # type: ignore[attr-defined]
+        response = self.get_response(request)
+        self.flush(request)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        request._reactpy_component_params = {}  # type: ignore[attr-defined]
+        response = await self.get_response(request)
+        await database_sync_to_async(self.flush)(request)
+        return response
+
+    @staticmethod
+    def flush(request: HttpRequest) -> None:
+        """Save all component parameters collected during this request."""
+        from reactpy_django.sessions import get_session_store
+
+        component_params: dict[str, bytes] = request._reactpy_component_params  # type: ignore[attr-defined]
+        if not component_params:
+            return
+
+        try:
+            get_session_store().save_many(component_params)
+        except Exception:
+            _logger.exception("An unknown error has occurred while saving component parameters.")
+        component_params.clear()
@@ -0,0 +1,155 @@
+"""Refetches live `use_query` hooks whenever the Django models they depend on are changed."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.base import Model
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Collection, Iterable
+
+_logger = logging.getLogger(__name__)
+
+
+class LiveQueries:
+    """Tracks which models each live `use_query` depends on, and refetches them once Django's
+    `post_save`, `post_delete`, or `m2m_changed` signals are sent for those models.
+
+    Changes are applied after their transaction commits. They are also published to other
+    processes via `REACTPY_REFETCH_CHANNEL_LAYER`, but only for models that are watched by
+    the process that changed them."""
+
+    dispatch_uid = "reactpy_django.live"
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.watched: set[type[Model]] = set()
+        self.callbacks: defaultdict[type[Model], dict[Callable[[], None], asyncio.AbstractEventLoop]] = defaultdict(
+            dict
+        )
+        self.models_by_callback: dict[Callable[[], None], set[type[Model]]] = {}
+
+    def watch(self, *models: type[Model]) -> None:
+        """Start detecting changes to these models, even if no live queries within this process
+        depend on them. This allows processes that do not render components (such as task
+        queue workers) to refetch live queries within your other processes."""
+        with self.lock:
+            new_models = {model._meta.concrete_model for model in models} - self.watched
+            if not new_models:
+                return
+            if not self.watched:
+                post_save.connect(self._model_changed, dispatch_uid=self.dispatch_uid)
+                m2m_changed.connect(self._m2m_changed, dispatch_uid=self.dispatch_uid)
+            self.watched |= new_models
+
+        # Delete receivers prevent Django from performing fast deletes, so they are only
+        # connected to the models that are watched
+        for model in apps.get_models(include_auto_created=True):
+            if model._meta.concrete_model in new_models:
+                post_delete.connect(
+                    self._model_changed, sender=model, dispatch_uid=f"{self.dispatch_uid}:{model._meta.label_lower}"
+                )
+
+    def subscribe(self, callback: Callable[[], None], models: Iterable[type[Model]]) -> None:
+        """Run `callback` within the current event loop whenever any of these models change.
+        Subscribing the same callback again replaces its models."""
+        concrete_models = {model._meta.concrete_model for model in models}
+        loop = asyncio.get_running_loop()
+        with self.lock:
+            for model in self.models_by_callback.pop(callback, set()) - concrete_models:
+                self.callbacks[model].pop(callback, None)
+            for model in concrete_models:
+                self.callbacks[model][callback] = loop
+            self.models_by_callback[callback] = concrete_models
+        self.watch(*concrete_models)
+
+    def unsubscribe(self, callback: Callable[[], None]) -> None:
+        with self.lock:
+            for model in self.models_by_callback.pop(callback, set()):
+                self.callbacks[model].pop(callback, None)
+
+    def notify(self, models: Collection[type[Model]], publish: bool = True) -> None:
+        """Refetch every live query within this process that depends on these models. Unless
+        `publish` is `False`, live queries within other processes are also refetched."""
+        from reactpy_django.refetch import REFETCH_BUS
+
+        with self.lock:
+            subscribers = {
+                callback: loop for model in models for callback, loop in self.callbacks.get(model, {}).items()
+            }
+        for callback, loop in subscribers.items():
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(callback)
+        if publish:
+            REFETCH_BUS.publish_models([model._meta.label_lower for model in models])
+
+    def notify_labels(self, labels: Iterable[str]) -> None:
+        """Refetch live queries within this process, for changes that were published by
+        another process."""
+        models = set()
+        for label in labels:
+            try:
+                models.add(apps.get_model(label)._meta.concrete_model)
+            except LookupError:
+                _logger.warning("Ignoring changes to unknown model '%s'.", label)
+        self.notify(models, publish=False)
+
+    def _model_changed(self, sender: type[Model], using: str | None = None, **kwargs: Any) -> None:
+        self._changed({sender}, using)
+
+    def _m2m_changed(
+        self,
+        sender: type[Model],
+        instance: Model,
+        action: str,
+        model: type[Model],
+        using: str | None = None,
+        **kwargs: Any,
+    ) -> None:
+        if action in {"post_add", "post_remove", "post_clear"}:
+            self._changed({sender, type(instance), model}, using)
+
+    def _changed(self, models: set[type[Model]], using: str | None) -> None:
+        changed = {model._meta.concrete_model for model in models} & self.watched
+        if changed:
+            transaction.on_commit(partial(self.notify, changed), using=using)
+
+
+def query_models(data: Any) -> set[type[Model]]:
+    """Find the models of every `Model` and `QuerySet` within a query result, including
+    related instances that have already been fetched."""
+    models: set[type[Model]] = set()
+    seen: set[int] = set()
+    pending = [data]
+    while pending:
+        value = pending.pop()
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+
+        if isinstance(value, QuerySet):
+            models.add(value.model)
+            pending.extend(value._result_cache or ())
+        elif isinstance(value, Model):
+            models.add(type(value))
+            pending.extend(value._state.fields_cache.values())
+            pending.extend(getattr(value, "_prefetched_objects_cache", {}).values())
+        elif isinstance(value, dict):
+            pending.extend(value.values())
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            pending.extend(value)
+
+    return models
+
+
+LIVE_QUERIES = LiveQueries()
@@ -1,3 +1,5 @@
+import time
+import traceback
 from logging import getLogger
 
 from django.core.management.base import BaseCommand
@@ -15,10 +17,30 @@ class Command(BaseCommand):
         valid_args: set[CleaningArgs] = {"all", "sessions", "auth_tokens", "user_data"}
         cleaning_args: set[CleaningArgs] = {arg for arg in options if arg in valid_args and options[arg]} or {"all"}
 
-        clean(*cleaning_args, immediate=True, verbosity=verbosity)
+        if not options["daemon"]:
+            while not clean(*cleaning_args, immediate=True, verbosity=verbosity):
+                pass
+            if verbosity >= 1:
+                _logger.info("ReactPy data has been cleaned!")
+            return
 
+        # Continuously clean, for deployments that disable automatic cleaning within their web servers
+        interval = options["interval"]
+        if interval is None:
+            from reactpy_django.config import REACTPY_CLEAN_INTERVAL
+
+            interval = REACTPY_CLEAN_INTERVAL or 0
         if verbosity >= 1:
-            _logger.info("ReactPy data has been cleaned!")
+            _logger.info("Cleaning ReactPy data every %s seconds...", interval)
+        while True:
+            finished = True
+            try:
+                finished = clean(*cleaning_args, immediate=True, verbosity=verbosity)
+            except Exception:
+                _logger.error(f"ReactPy cleaning failed!\n{traceback.format_exc()}")
+
+            # Unfinished cleans are continued after a short pause
+            time.sleep(max(interval, 1) if finished else 1)
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -36,3 +58,14 @@ class Command(BaseCommand):
             action="store_true",
             help="Clean authentication tokens. This value can be combined with other cleaning options.",
         )
+        parser.add_argument(
+            "--daemon",
+            action="store_true",
+            help="Keep running, and repeat the clean every interval.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=None,
+            help="Seconds between each clean when using --daemon. Defaults to REACTPY_CLEAN_INTERVAL.",
+        )
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reactpy_django', '0007_authtoken'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='authtoken',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='componentsession',
+            name='last_accessed',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
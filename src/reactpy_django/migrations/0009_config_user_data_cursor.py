@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reactpy_django', '0008_index_expiration_timestamps'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='config',
+            name='user_data_cursor',
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
@@ -13,11 +13,13 @@ class ComponentSession(models.Model):
     """A model for storing component sessions.
 
     This is used to store component arguments provided within Django templates.
-    These arguments are retrieved within the layout renderer (WebSocket consumer)."""
+    These arguments are retrieved within the layout renderer (WebSocket consumer).
+
+    Sessions are content-addressed, meaning the `uuid` is derived from the `params`."""
 
     uuid = models.UUIDField(primary_key=True, editable=False, unique=True)
     params = models.BinaryField(editable=False)
-    last_accessed = models.DateTimeField(auto_now=True)
+    last_accessed = models.DateTimeField(auto_now=True, db_index=True)
 
 
 class AuthToken(models.Model):
@@ -30,7 +32,7 @@ class AuthToken(models.Model):
 
     value = models.UUIDField(primary_key=True, editable=False, unique=True)
     session_key = models.CharField(max_length=40, editable=False)
-    created_at = models.DateTimeField(auto_now_add=True, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True, editable=False, db_index=True)
 
     @property
     def expired(self) -> bool:
@@ -43,6 +45,8 @@ class Config(models.Model):
     """A singleton model for storing ReactPy configuration."""
 
     cleaned_at = models.DateTimeField(auto_now_add=True)
+    user_data_cursor = models.BigIntegerField(default=0)
+    """The primary key of the last `UserDataModel` checked for orphaned user data."""
 
     def save(self, *args, **kwargs):
         """Singleton save method."""
@@ -0,0 +1,269 @@
+"""A cache of `use_query` results, which is shared between every component that runs the same query."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import sys
+import time
+import traceback
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from decimal import Decimal
+from threading import Lock
+from typing import TYPE_CHECKING, Any
+
+import orjson
+from django.core.cache import caches
+from django.db.models.base import Model
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+_logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryCacheEntry:
+    """A cached query result."""
+
+    query_name: str
+    data: Any
+    created_at: float
+    fresh_until: float
+    stale_until: float
+
+
+class QueryCache:
+    """Caches the results of `use_query` within an in-process LRU, and optionally within
+    `REACTPY_CACHE` (`REACTPY_QUERY_CACHE_SHARED`) so that other processes can reuse them.
+
+    Results are fresh for `ttl` seconds. Afterwards, they are still returned for another
+    `stale_ttl` seconds while the query is re-executed in the background. Identical queries
+    that run at the same time share a single execution."""
+
+    key_prefix = "reactpy_django:query:"
+
+    def __init__(self):
+        self.entries: OrderedDict[str, QueryCacheEntry] = OrderedDict()
+        self.keys_by_query: dict[str, set[str]] = {}
+        self.executions: dict[tuple[int, str, str], asyncio.Task] = {}
+        self.invalidations: Counter[str] = Counter()
+        # The in-process LRU is shared by every backhaul thread
+        self.lock = Lock()
+
+    async def get_or_execute(
+        self,
+        query_name: str,
+        key: str,
+        execute: Callable[[], Awaitable[Any]],
+        ttl: float,
+        stale_ttl: float = 0,
+        force: bool = False,
+    ) -> Any:
+        """Return the cached result of a query, executing the query if needed."""
+        entry = None if force else await self.aget(query_name, key)
+        now = time.time()
+        if entry and now < entry.fresh_until:
+            return entry.data
+        if entry and now < entry.stale_until:
+            self.execute(query_name, key, execute, ttl, stale_ttl).add_done_callback(self._log_revalidation_error)
+            return entry.data
+
+        return await asyncio.shield(self.execute(query_name, key, execute, ttl, stale_ttl))
+
+    def execute(
+        self,
+        query_name: str,
+        key: str,
+        execute: Callable[[], Awaitable[Any]],
+        ttl: float,
+        stale_ttl: float,
+    ) -> asyncio.Task:
+        """Execute a query and cache its result, unless an identical query is already executing
+        within this event loop."""
+        return self._single_flight(("cached", key), lambda: self._execute(query_name, key, execute, ttl, stale_ttl))
+
+    async def coalesce(self, key: str, execute: Callable[[], Awaitable[Any]]) -> Any:
+        """Execute a query without caching its result. If an identical query is already executing
+        within this event loop, its result is shared instead."""
+        return await asyncio.shield(self._single_flight(("uncached", key), execute))
+
+    def _single_flight(self, key: tuple[str, str], execute: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        execution_key = (id(asyncio.get_running_loop()), *key)
+        if execution_key not in self.executions:
+            task = asyncio.ensure_future(execute())
+            self.executions[execution_key] = task
+            task.add_done_callback(lambda _: self.executions.pop(execution_key, None))
+
+        return self.executions[execution_key]
+
+    async def _execute(
+        self,
+        query_name: str,
+        key: str,
+        execute: Callable[[], Awaitable[Any]],
+        ttl: float,
+        stale_ttl: float,
+    ) -> Any:
+        invalidations = self.invalidations[query_name]
+        data = await execute()
+
+        # Results of executions that started before their query was invalidated are not cached
+        if invalidations != self.invalidations[query_name]:
+            return data
+        now = time.time()
+        await self.aset(key, QueryCacheEntry(query_name, data, now, now + ttl, now + ttl + stale_ttl))
+        return data
+
+    @staticmethod
+    def _log_revalidation_error(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception():
+            _logger.error("Failed to revalidate a cached query!", exc_info=task.exception())
+
+    async def aget(self, query_name: str, key: str) -> QueryCacheEntry | None:
+        from reactpy_django.config import REACTPY_CACHE, REACTPY_QUERY_CACHE_SHARED
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry:
+                self.entries.move_to_end(key)
+                return entry
+        if not REACTPY_QUERY_CACHE_SHARED:
+            return None
+
+        # Results that were cached before their query was invalidated are ignored
+        shared_key = self.shared_key(key)
+        invalidated_key = self.invalidated_key(query_name)
+        try:
+            cached = await caches[REACTPY_CACHE].aget_many([shared_key, invalidated_key])
+        except Exception:
+            await asyncio.to_thread(
+                _logger.error,
+                f"ReactPy has failed to read query '{query_name}' from the cache!\n{traceback.format_exc()}",
+            )
+            return None
+        entry = cached.get(shared_key)
+        if not entry or entry.created_at <= cached.get(invalidated_key, 0):
+            return None
+
+        self.remember(key, entry)
+        return entry
+
+    async def aset(self, key: str, entry: QueryCacheEntry) -> None:
+        from reactpy_django.config import REACTPY_CACHE, REACTPY_QUERY_CACHE_SHARED
+
+        self.remember(key, entry)
+        if not REACTPY_QUERY_CACHE_SHARED:
+            return
+
+        try:
+            await caches[REACTPY_CACHE].aset(
+                self.shared_key(key), entry, timeout=max(entry.stale_until - entry.created_at, 1)
+            )
+        except Exception:
+            await asyncio.to_thread(
+                _logger.error,
+                f"ReactPy has failed to store query '{entry.query_name}' within the cache!\n{traceback.format_exc()}",
+            )
+
+    async def ainvalidate(self, query_name: str, shared: bool = True) -> None:
+        """Forget all cached results of a query function. Unless `shared` is `False`, results
+        stored within `REACTPY_CACHE` are also forgotten by every process."""
+        from reactpy_django.config import REACTPY_CACHE, REACTPY_QUERY_CACHE_SHARED
+
+        with self.lock:
+            self.invalidations[query_name] += 1
+            for key in self.keys_by_query.pop(query_name, ()):
+                self.entries.pop(key, None)
+        if shared and REACTPY_QUERY_CACHE_SHARED:
+            await caches[REACTPY_CACHE].aset(self.invalidated_key(query_name), time.time(), timeout=None)
+
+    def remember(self, key: str, entry: QueryCacheEntry) -> None:
+        """Store an entry within the in-process LRU."""
+        from reactpy_django.config import REACTPY_QUERY_CACHE_MAX_ENTRIES
+
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            self.keys_by_query.setdefault(entry.query_name, set()).add(key)
+            while len(self.entries) > REACTPY_QUERY_CACHE_MAX_ENTRIES:
+                evicted_key, evicted = self.entries.popitem(last=False)
+                self.keys_by_query.get(evicted.query_name, set()).discard(evicted_key)
+
+    def shared_key(self, key: str) -> str:
+        return self.key_prefix + hashlib.sha256(key.encode()).hexdigest()
+
+    def invalidated_key(self, query_name: str) -> str:
+        return f"{self.key_prefix}invalidated:{hashlib.sha256(query_name.encode()).hexdigest()}"
+
+
+def query_name(query: Callable) -> str:
+    """Create a name that identifies a query function. Functions that cannot be imported via
+    their name (such as lambdas, nested functions, and methods) also include their identity, so
+    that different functions never share a name."""
+    module = getattr(query, "__module__", None)
+    qualname = getattr(query, "__qualname__", None)
+    if module and qualname and "<" not in qualname:
+        obj: Any = sys.modules.get(module)
+        for attribute in qualname.split("."):
+            obj = getattr(obj, attribute, None)
+        if obj is query:
+            return f"{module}.{qualname}"
+
+    return f"{module}.{qualname or type(query).__qualname__}:{id(query)}"
+
+
+def query_cache_key(
+    query: Callable, kwargs: dict[str, Any], postprocessor: Any, postprocessor_kwargs: dict
+) -> str | None:
+    """Create a key that identifies a query function, and all arguments it is executed with.
+    Returns `None` if these arguments cannot be converted into a key."""
+    try:
+        return orjson.dumps(
+            [
+                query_name(query),
+                kwargs,
+                query_name(postprocessor) if postprocessor else None,
+                postprocessor_kwargs,
+            ],
+            default=_key_default,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+        ).decode()
+    except TypeError as e:
+        _logger.warning(
+            "Query '%s' will not be cached, since its arguments cannot be used within a cache key. %s",
+            query_name(query),
+            e,
+        )
+        return None
+
+
+def normalize_kwargs(kwargs: dict[str, Any]) -> dict[str, Any]:
+    """Convert query kwargs into JSON-compatible values, so that they can be compared between
+    processes. Model instances are converted into a reference to their primary key.
+
+    Raises `TypeError` if any of these values cannot be converted."""
+    return orjson.loads(orjson.dumps(kwargs, default=_key_default, option=orjson.OPT_NON_STR_KEYS))
+
+
+def kwargs_match(kwargs: dict[str, Any], expected: dict[str, Any] | None) -> bool:
+    """Check whether normalized `kwargs` contain all of the `expected` (normalized) kwargs."""
+    return expected is None or all(key in kwargs and kwargs[key] == value for key, value in expected.items())
+
+
+def _key_default(value: Any) -> Any:
+    if isinstance(value, Model) and value.pk is not None:
+        return f"{value._meta.label_lower}:{value.pk}"
+    if isinstance(value, (set, frozenset)):
+        return sorted(orjson.dumps(item, default=_key_default, option=orjson.OPT_SORT_KEYS).decode() for item in value)
+    if isinstance(value, Decimal):
+        return str(value)
+
+    # Falling back to `repr` would be unsafe, since it can contain memory addresses, be
+    # truncated, or even execute a database query (`QuerySet`)
+    raise TypeError
+
+
+QUERY_CACHE = QueryCache()
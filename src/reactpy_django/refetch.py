@@ -0,0 +1,192 @@
+"""Publishes `use_mutation(refetch=...)` events to other processes via a Django Channels layer."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import traceback
+from typing import TYPE_CHECKING, Any
+from uuid import uuid4
+
+import orjson
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+
+    from channels.layers import BaseChannelLayer
+
+_logger = logging.getLogger(__name__)
+
+
+class RefetchBus:
+    """Sends the names of refetched query functions, as well as the labels of changed models
+    used by live queries, to every process subscribed to `REACTPY_REFETCH_CHANNEL_LAYER`,
+    which then refetch their own `use_query` hooks.
+
+    Refetches are collected for `REACTPY_REFETCH_INTERVAL` milliseconds before being sent, and
+    again before being applied, so a burst of mutations only refetches each query once."""
+
+    group = "reactpy_django.refetch"
+    retry_delay = 5.0
+
+    def __init__(self):
+        self.origin = uuid4().hex
+        self.outgoing: set[tuple[str, str | None]] = set()
+        self.incoming: set[tuple[str, str | None]] = set()
+        self.outgoing_models: set[str] = set()
+        self.incoming_models: set[str] = set()
+        self.publish_task: asyncio.Task | None = None
+        self.apply_task: asyncio.Task | None = None
+        self.listener: asyncio.Task | None = None
+
+    def publish(self, invalidations: Collection[tuple[str, dict[str, Any] | None]]) -> None:
+        """Refetch query functions within every other process. Each invalidation is the name of a
+        query function, and the (normalized) kwargs that its `use_query` hooks must match."""
+        from reactpy_django.config import REACTPY_REFETCH_CHANNEL_LAYER
+
+        if REACTPY_REFETCH_CHANNEL_LAYER is None:
+            return
+
+        self.outgoing.update(
+            (query_name, None if expected is None else orjson.dumps(expected, option=orjson.OPT_SORT_KEYS).decode())
+            for query_name, expected in invalidations
+        )
+        if self.outgoing and not self.publish_task:
+            self.publish_task = asyncio.create_task(self._publish_later())
+
+    def publish_models(self, labels: Collection[str]) -> None:
+        """Refetch live queries that depend on these models within every other process. This
+        is safe to call from any thread."""
+        from reactpy_django.config import REACTPY_REFETCH_CHANNEL_LAYER
+
+        if REACTPY_REFETCH_CHANNEL_LAYER is None or not labels:
+            return
+
+        # Changes made within a thread are handed over to the event loop that is listening for
+        # refetches. Processes without one (such as WSGI servers) send them immediately.
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            if self.listener and not self.listener.done():
+                self.listener.get_loop().call_soon_threadsafe(self.publish_models, labels)
+            else:
+                async_to_sync(self._send)([], sorted(labels))
+            return
+
+        self.outgoing_models.update(labels)
+        if not self.publish_task:
+            self.publish_task = asyncio.create_task(self._publish_later())
+
+    def start(self) -> None:
+        """Start receiving refetches from other processes within the current event loop, if
+        not already receiving them."""
+        from reactpy_django.config import REACTPY_REFETCH_CHANNEL_LAYER
+
+        if REACTPY_REFETCH_CHANNEL_LAYER is None:
+            return
+
+        loop = asyncio.get_running_loop()
+        if self.listener and not self.listener.done() and self.listener.get_loop() is loop:
+            return
+        self.listener = loop.create_task(self._listen(REACTPY_REFETCH_CHANNEL_LAYER))
+
+    async def _publish_later(self) -> None:
+        from reactpy_django.config import REACTPY_REFETCH_INTERVAL
+
+        await asyncio.sleep(REACTPY_REFETCH_INTERVAL / 1000)
+        invalidations, self.outgoing = self.outgoing, set()
+        labels, self.outgoing_models = self.outgoing_models, set()
+        self.publish_task = None
+        await self._send([list(item) for item in invalidations], sorted(labels))
+
+    async def _send(self, queries: list[list[str | None]], models: list[str]) -> None:
+        from reactpy_django.config import REACTPY_REFETCH_CHANNEL_LAYER
+
+        try:
+            await get_channel_layer(REACTPY_REFETCH_CHANNEL_LAYER).group_send(  # type: ignore[union-attr]
+                self.group,
+                {"type": "refetch", "origin": self.origin, "queries": queries, "models": models},
+            )
+        except Exception:
+            await asyncio.to_thread(
+                _logger.error,
+                f"ReactPy has failed to publish query refetches!\n{traceback.format_exc()}",
+            )
+
+    async def _listen(self, layer_name: str) -> None:
+        channel_layer = get_channel_layer(layer_name)
+        if not channel_layer:
+            _logger.error("Channel layer '%s' is not available, so queries will not be refetched.", layer_name)
+            return
+
+        # Keep listening, even if the channel layer's backend is temporarily unavailable
+        while True:
+            try:
+                await self._receive(channel_layer)
+            except Exception:
+                await asyncio.to_thread(
+                    _logger.error,
+                    f"ReactPy has failed to receive query refetches, retrying in {self.retry_delay} seconds!\n"
+                    f"{traceback.format_exc()}",
+                )
+                await asyncio.sleep(self.retry_delay)
+
+    async def _receive(self, channel_layer: BaseChannelLayer) -> None:
+        channel_name = await channel_layer.new_channel()
+        await channel_layer.group_add(self.group, channel_name)
+        renewal = asyncio.create_task(self._renew_membership(channel_layer, channel_name))
+        try:
+            while True:
+                message = await channel_layer.receive(channel_name)
+                if message.get("origin") == self.origin:
+                    continue
+                self.incoming.update((query_name, expected) for query_name, expected in message.get("queries", ()))
+                self.incoming_models.update(message.get("models", ()))
+                if not self.apply_task:
+                    self.apply_task = asyncio.create_task(self._apply_later())
+        finally:
+            renewal.cancel()
+            with contextlib.suppress(Exception):
+                await channel_layer.group_discard(self.group, channel_name)
+
+    async def _renew_membership(self, channel_layer: BaseChannelLayer, channel_name: str) -> None:
+        """Some channel layers (such as `channels_redis`) forget group members after `group_expiry`
+        seconds, so this process periodically re-joins the group."""
+        interval = getattr(channel_layer, "group_expiry", 86400) / 2
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await channel_layer.group_add(self.group, channel_name)
+            except Exception:
+                await asyncio.to_thread(
+                    _logger.error,
+                    f"ReactPy has failed to renew its query refetch subscription!\n{traceback.format_exc()}",
+                )
+
+    async def _apply_later(self) -> None:
+        from reactpy_django.config import REACTPY_REFETCH_INTERVAL
+        from reactpy_django.hooks import _REFETCH_CALLBACKS, _refetch
+        from reactpy_django.live import LIVE_QUERIES
+        from reactpy_django.query_cache import QUERY_CACHE, query_name
+
+        await asyncio.sleep(REACTPY_REFETCH_INTERVAL / 1000)
+        invalidations, self.incoming = self.incoming, set()
+        labels, self.incoming_models = self.incoming_models, set()
+        self.apply_task = None
+        if labels:
+            LIVE_QUERIES.notify_labels(labels)
+
+        # The process that published these refetches has already invalidated any shared cache
+        for name in {name for name, _ in invalidations}:
+            await QUERY_CACHE.ainvalidate(name, shared=False)
+        # Each query is refetched within its own event loop, rather than within this listener's loop
+        queries = {query_name(query): query for query in list(_REFETCH_CALLBACKS)}
+        for name, expected in invalidations:
+            if name in queries:
+                _refetch(queries[name], None if expected is None else orjson.loads(expected))
+
+
+REFETCH_BUS = RefetchBus()
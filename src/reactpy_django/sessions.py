@@ -0,0 +1,525 @@
+"""Storage backends for component sessions, which carry the args/kwargs of a component
+from the HTTP stack (template tag) to the WebSocket stack (consumer)."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import traceback
+from collections import Counter
+from datetime import timedelta
+from functools import cache
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from django.apps.registry import Apps
+from django.core.cache import caches
+from django.db import DatabaseError, connections, models, router
+from django.utils import timezone
+
+from reactpy_django.utils import import_dotted_path
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Mapping
+
+_logger = logging.getLogger(__name__)
+BUCKET_TABLE_PREFIX = "reactpy_django_componentsession_"
+SESSION_TOUCH_STATS: Counter[str] = Counter()
+"""Process-wide counters of `requested`, `skipped`, and `written` session touches, and the
+number of `flushes` (bulk updates) performed."""
+
+
+class ComponentSessionStore:
+    """Base class for component session stores. Sessions are stored as serialized bytes,
+    and must expire after `REACTPY_SESSION_MAX_AGE` seconds without being accessed."""
+
+    uses_database: bool = False
+    """Whether this store keeps sessions within `REACTPY_DATABASE`. If so, expired sessions
+    are deleted by ReactPy's periodic cleaning."""
+
+    def save(self, uuid: str, params: bytes) -> None:
+        """Store a session. This is called while rendering a template."""
+        raise NotImplementedError
+
+    def save_many(self, sessions: Mapping[str, bytes]) -> None:
+        """Store many sessions at once, such as all sessions collected while rendering a page."""
+        for uuid, params in sessions.items():
+            self.save(uuid, params)
+
+    async def aload_many(self, uuids: Collection[str]) -> dict[str, bytes]:
+        """Fetch many unexpired sessions at once. Missing sessions are omitted from the result."""
+        raise NotImplementedError
+
+    async def atouch_many(self, uuids: Collection[str]) -> None:
+        """Reset the expiration timer of many sessions at once."""
+        raise NotImplementedError
+
+
+class DatabaseSessionStore(ComponentSessionStore):
+    """Stores sessions within the `ComponentSession` model."""
+
+    uses_database = True
+
+    def save(self, uuid: str, params: bytes) -> None:
+        self.save_many({uuid: params})
+
+    def save_many(self, sessions: Mapping[str, bytes]) -> None:
+        from reactpy_django.models import ComponentSession
+
+        component_sessions = [ComponentSession(uuid=uuid, params=params) for uuid, params in sessions.items()]
+        for component_session in component_sessions:
+            component_session.clean_fields()
+        _upsert_sessions(ComponentSession, component_sessions)
+
+    async def aload_many(self, uuids: Collection[str]) -> dict[str, bytes]:
+        from reactpy_django.config import REACTPY_SESSION_MAX_AGE
+        from reactpy_django.models import ComponentSession
+
+        if not uuids:
+            return {}
+
+        query = ComponentSession.objects.filter(
+            uuid__in=uuids,
+            last_accessed__gt=timezone.now() - timedelta(seconds=REACTPY_SESSION_MAX_AGE),
+        ).values_list("uuid", "params")
+        return {str(uuid): bytes(params) async for uuid, params in query}
+
+    async def atouch_many(self, uuids: Collection[str]) -> None:
+        from reactpy_django.models import ComponentSession
+
+        if uuids:
+            await ComponentSession.objects.filter(uuid__in=uuids).aupdate(last_accessed=timezone.now())
+
+
+def _upsert_sessions(model: type[models.Model], sessions: list[models.Model]) -> None:
+    """Insert sessions into a table. Sessions are content-addressed, so existing sessions only
+    need their expiration reset."""
+    db = router.db_for_write(model)
+    features = connections[db].features
+    if features.supports_update_conflicts_with_target:
+        model.objects.using(db).bulk_create(
+            sessions,
+            update_conflicts=True,
+            unique_fields=["uuid"],
+            update_fields=["last_accessed"],
+        )
+        return
+
+    # Databases that can't upsert by `uuid` (such as MySQL) reset the expiration of existing
+    # sessions separately, before inserting any new sessions
+    existing = model.objects.using(db).filter(uuid__in=[session.uuid for session in sessions])
+    existing_uuids = {str(uuid) for uuid in existing.values_list("uuid", flat=True)}
+    if existing_uuids:
+        existing.update(last_accessed=timezone.now())
+    model.objects.using(db).bulk_create(
+        [session for session in sessions if str(session.uuid) not in existing_uuids],
+        ignore_conflicts=features.supports_ignore_conflicts,
+    )
+
+
+class CacheSessionStore(ComponentSessionStore):
+    """Stores sessions within `REACTPY_CACHE`. Sessions are expired by the cache itself."""
+
+    key_prefix = "reactpy_django:component_session:"
+
+    def save(self, uuid: str, params: bytes) -> None:
+        from reactpy_django.config import REACTPY_CACHE, REACTPY_SESSION_MAX_AGE
+
+        caches[REACTPY_CACHE].set(self.key_prefix + str(uuid), params, timeout=REACTPY_SESSION_MAX_AGE)
+
+    def save_many(self, sessions: Mapping[str, bytes]) -> None:
+        from reactpy_django.config import REACTPY_CACHE, REACTPY_SESSION_MAX_AGE
+
+        caches[REACTPY_CACHE].set_many(
+            {self.key_prefix + str(uuid): params for uuid, params in sessions.items()},
+            timeout=REACTPY_SESSION_MAX_AGE,
+        )
+
+    async def aload_many(self, uuids: Collection[str]) -> dict[str, bytes]:
+        from reactpy_django.config import REACTPY_CACHE
+
+        if not uuids:
+            return {}
+
+        cached = await caches[REACTPY_CACHE].aget_many([self.key_prefix + uuid for uuid in uuids])
+        return {key.removeprefix(self.key_prefix): params for key, params in cached.items()}
+
+    async def atouch_many(self, uuids: Collection[str]) -> None:
+        from reactpy_django.config import REACTPY_CACHE, REACTPY_SESSION_MAX_AGE
+
+        for uuid in uuids:
+            await caches[REACTPY_CACHE].atouch(self.key_prefix + uuid, timeout=REACTPY_SESSION_MAX_AGE)
+
+
+class HybridSessionStore(ComponentSessionStore):
+    """Writes sessions to both `REACTPY_CACHE` and `REACTPY_DATABASE`. Sessions are read from
+    the cache whenever possible, and the database is only queried for cache misses."""
+
+    uses_database = True
+
+    def __init__(self):
+        self.cache = CacheSessionStore()
+        self.database = DatabaseSessionStore()
+
+    def save(self, uuid: str, params: bytes) -> None:
+        self.database.save(uuid, params)
+        self.cache.save(uuid, params)
+
+    def save_many(self, sessions: Mapping[str, bytes]) -> None:
+        self.database.save_many(sessions)
+        self.cache.save_many(sessions)
+
+    async def aload_many(self, uuids: Collection[str]) -> dict[str, bytes]:
+        from reactpy_django.config import REACTPY_CACHE, REACTPY_SESSION_MAX_AGE
+
+        loaded = await self.cache.aload_many(uuids)
+        missing = [uuid for uuid in uuids if uuid not in loaded]
+        if missing:
+            from_database = await self.database.aload_many(missing)
+            if from_database:
+                await caches[REACTPY_CACHE].aset_many(
+                    {self.cache.key_prefix + uuid: params for uuid, params in from_database.items()},
+                    timeout=REACTPY_SESSION_MAX_AGE,
+                )
+            loaded |= from_database
+
+        return loaded
+
+    async def atouch_many(self, uuids: Collection[str]) -> None:
+        await self.database.atouch_many(uuids)
+        await self.cache.atouch_many(uuids)
+
+
+class BucketedSessionStore(ComponentSessionStore):
+    """Stores sessions within `REACTPY_DATABASE`, using a separate table for every
+    `REACTPY_SESSION_BUCKET_SIZE` seconds. Sessions are written to the newest table, and
+    touching a session moves it into the newest table.
+
+    Once every session within a table has expired, ReactPy's periodic cleaning drops the whole
+    table rather than deleting its sessions one row at a time.
+
+    Tables are created ahead of time by ReactPy's periodic cleaning and `manage.py migrate`,
+    never while rendering a template. If the newest table does not exist yet, sessions are
+    stored within the `ComponentSession` model instead."""
+
+    uses_database = True
+    missing_bucket_ttl: float = 10.0
+    """Seconds to remember that a table does not exist, before checking the database again."""
+
+    def __init__(self):
+        self.bucket_models: dict[int, type[models.Model]] = {}
+        self.known_buckets: set[int] = set()
+        self.missing_buckets: set[int] = set()
+        self.missing_until: dict[int, float] = {}
+        self.fallback = DatabaseSessionStore()
+        # Buckets are used by request threads and backhaul threads at the same time
+        self.lock = Lock()
+
+    def save(self, uuid: str, params: bytes) -> None:
+        self.save_many({uuid: params})
+
+    def save_many(self, sessions: Mapping[str, bytes]) -> None:
+        bucket = self.current_bucket()
+        if not self.bucket_exists(bucket):
+            with self.lock:
+                warn = bucket not in self.missing_buckets
+                self.missing_buckets.add(bucket)
+            if warn:
+                _logger.warning(
+                    "Component session table '%s%s' does not exist, so sessions are being stored within the "
+                    "ComponentSession model instead. Run `manage.py clean_reactpy --sessions` to create it.",
+                    BUCKET_TABLE_PREFIX,
+                    bucket,
+                )
+            self.fallback.save_many(sessions)
+            return
+
+        model = self.bucket_model(bucket)
+        _upsert_sessions(
+            model, [model(uuid=uuid, params=params, last_accessed=timezone.now()) for uuid, params in sessions.items()]
+        )
+
+    async def aload_many(self, uuids: Collection[str]) -> dict[str, bytes]:
+        from channels.db import database_sync_to_async
+
+        if not uuids:
+            return {}
+
+        return await database_sync_to_async(self.load_many)(uuids)
+
+    async def atouch_many(self, uuids: Collection[str]) -> None:
+        from channels.db import database_sync_to_async
+
+        if uuids:
+            await database_sync_to_async(self.touch_many)(uuids)
+
+    def load_many(self, uuids: Collection[str]) -> dict[str, bytes]:
+        """Fetch many unexpired sessions at once, checking the newest tables first."""
+        from reactpy_django.config import REACTPY_SESSION_MAX_AGE
+        from reactpy_django.models import ComponentSession
+
+        expiration_date = timezone.now() - timedelta(seconds=REACTPY_SESSION_MAX_AGE)
+        loaded: dict[str, bytes] = {}
+        missing = {str(uuid) for uuid in uuids}
+        for bucket in self.unexpired_buckets():
+            query = (
+                self
+                .bucket_model(bucket)
+                .objects.filter(uuid__in=missing, last_accessed__gt=expiration_date)
+                .values_list("uuid", "params")
+            )
+            for uuid, params in query:
+                loaded[str(uuid)] = bytes(params)
+                missing.discard(str(uuid))
+            if not missing:
+                break
+
+        # Sessions that were saved before their table was created
+        if missing:
+            query = ComponentSession.objects.filter(uuid__in=missing, last_accessed__gt=expiration_date).values_list(
+                "uuid", "params"
+            )
+            loaded.update((str(uuid), bytes(params)) for uuid, params in query)
+
+        return loaded
+
+    def touch_many(self, uuids: Collection[str]) -> None:
+        """Reset the expiration of many sessions by moving them into the newest table."""
+        self.save_many(self.load_many(uuids))
+
+    def drop_expired_buckets(self) -> int:
+        """Drop every table that only contains expired sessions. Returns the number of tables dropped."""
+        from reactpy_django.config import REACTPY_SESSION_BUCKET_SIZE, REACTPY_SESSION_MAX_AGE
+
+        oldest_unexpired = self.bucket_at(time.time() - REACTPY_SESSION_MAX_AGE - REACTPY_SESSION_BUCKET_SIZE)
+        dropped = 0
+        for bucket in sorted(self.discover_buckets()):
+            if bucket >= oldest_unexpired:
+                break
+            model = self.bucket_model(bucket)
+            try:
+                with connections[router.db_for_write(model)].schema_editor() as editor:
+                    editor.delete_model(model)
+            except DatabaseError:
+                _logger.exception("Failed to drop expired component session table '%s'!", model._meta.db_table)
+                continue
+            with self.lock:
+                self.known_buckets.discard(bucket)
+            dropped += 1
+
+        return dropped
+
+    def create_buckets(self) -> int:
+        """Create the tables of the current bucket, and every bucket until after the next clean up
+        is expected. Returns the number of tables created."""
+        from reactpy_django.config import REACTPY_CLEAN_INTERVAL, REACTPY_SESSION_BUCKET_SIZE
+
+        # Tables are created for two clean intervals, in case a clean up is missed
+        lookahead = 2 * (REACTPY_CLEAN_INTERVAL or REACTPY_SESSION_BUCKET_SIZE)
+        known_buckets = self.discover_buckets()
+        created = 0
+        for bucket in range(self.current_bucket(), self.bucket_at(time.time() + lookahead) + 1):
+            if bucket not in known_buckets:
+                self.create_bucket(bucket)
+                created += 1
+
+        return created
+
+    def current_bucket(self) -> int:
+        return self.bucket_at(time.time())
+
+    @staticmethod
+    def bucket_at(timestamp: float) -> int:
+        from reactpy_django.config import REACTPY_SESSION_BUCKET_SIZE
+
+        return int(timestamp // REACTPY_SESSION_BUCKET_SIZE)
+
+    def unexpired_buckets(self) -> list[int]:
+        """Tables that may contain unexpired sessions, newest first."""
+        from reactpy_django.config import REACTPY_SESSION_MAX_AGE
+
+        # Tables created by other processes are discovered once the newest table is unknown
+        current = self.current_bucket()
+        self.bucket_exists(current)
+        oldest = self.bucket_at(time.time() - REACTPY_SESSION_MAX_AGE)
+        with self.lock:
+            return sorted((bucket for bucket in self.known_buckets if oldest <= bucket <= current), reverse=True)
+
+    def discover_buckets(self) -> set[int]:
+        """Find every table that exists within the database, including ones created by other processes."""
+        model = self.bucket_model(self.current_bucket())
+        with connections[router.db_for_read(model)].cursor() as cursor:
+            table_names = connections[router.db_for_read(model)].introspection.table_names(cursor)
+        known_buckets = {
+            int(name.removeprefix(BUCKET_TABLE_PREFIX))
+            for name in table_names
+            if name.startswith(BUCKET_TABLE_PREFIX) and name.removeprefix(BUCKET_TABLE_PREFIX).isdigit()
+        }
+        with self.lock:
+            self.known_buckets = known_buckets
+            self.missing_until = {
+                bucket: until for bucket, until in self.missing_until.items() if bucket not in known_buckets
+            }
+        return known_buckets
+
+    def bucket_exists(self, bucket: int) -> bool:
+        """Whether a bucket's table exists. Missing tables are remembered for `missing_bucket_ttl`
+        seconds, so that the database is not introspected every time a template is rendered."""
+        now = time.monotonic()
+        with self.lock:
+            if bucket in self.known_buckets:
+                return True
+            if self.missing_until.get(bucket, 0) > now:
+                return False
+
+        if bucket in self.discover_buckets():
+            return True
+        with self.lock:
+            self.missing_until[bucket] = now + self.missing_bucket_ttl
+        return False
+
+    def ensure_bucket(self, bucket: int) -> None:
+        """Create the table for a bucket, if it does not already exist."""
+        if not self.bucket_exists(bucket):
+            self.create_bucket(bucket)
+
+    def create_bucket(self, bucket: int) -> None:
+        """Create the table for a bucket. This is a schema change, so it is only performed by
+        ReactPy's cleaning and `manage.py migrate`."""
+        model = self.bucket_model(bucket)
+        try:
+            with connections[router.db_for_write(model)].schema_editor() as editor:
+                editor.create_model(model)
+        except DatabaseError:
+            # Another process may have created this table first
+            if bucket not in self.discover_buckets():
+                raise
+        with self.lock:
+            self.known_buckets.add(bucket)
+            self.missing_buckets.discard(bucket)
+            self.missing_until.pop(bucket, None)
+
+    def bucket_model(self, bucket: int) -> type[models.Model]:
+        """Returns an unmanaged model for a bucket's table. These models are kept out of Django's
+        app registry, but use the `reactpy_django` app label so the `Router` sends them to
+        `REACTPY_DATABASE`."""
+        with self.lock:
+            if bucket in self.bucket_models:
+                return self.bucket_models[bucket]
+
+            meta = type(
+                "Meta",
+                (),
+                {
+                    "app_label": "reactpy_django",
+                    "apps": Apps(installed_apps=()),
+                    "db_table": f"{BUCKET_TABLE_PREFIX}{bucket}",
+                    "managed": False,
+                },
+            )
+            self.bucket_models[bucket] = type(
+                f"ComponentSessionBucket{bucket}",
+                (models.Model,),
+                {
+                    "__module__": __name__,
+                    "Meta": meta,
+                    "uuid": models.UUIDField(primary_key=True, editable=False, unique=True),
+                    "params": models.BinaryField(editable=False),
+                    "last_accessed": models.DateTimeField(),
+                },
+            )
+
+        return self.bucket_models[bucket]
+
+
+class SessionToucher:
+    """Coalesces requests to reset the expiration of component sessions into periodic bulk
+    updates. Sessions that were already touched within the last 1% of
+    `REACTPY_SESSION_MAX_AGE` are skipped, since their expiration barely changes."""
+
+    def __init__(self):
+        self.pending: set[str] = set()
+        self.recently_touched: dict[str, float] = {}
+        # Each event loop (such as each backhaul thread) schedules its own flush, since a task
+        # within another loop may never run if that loop is stopped or closed
+        self.flush_tasks: dict[asyncio.AbstractEventLoop, asyncio.Task] = {}
+
+    async def touch(self, keys: Collection[str]) -> None:
+        """Reset the expiration of sessions, within the next `REACTPY_SESSION_TOUCH_INTERVAL` seconds."""
+        from reactpy_django.config import REACTPY_SESSION_MAX_AGE, REACTPY_SESSION_TOUCH_INTERVAL
+
+        now = time.monotonic()
+        skip_after = now - REACTPY_SESSION_MAX_AGE * 0.01
+        for key in keys:
+            SESSION_TOUCH_STATS["requested"] += 1
+            if key in self.pending or self.recently_touched.get(key, skip_after) > skip_after:
+                SESSION_TOUCH_STATS["skipped"] += 1
+            else:
+                self.pending.add(key)
+
+        if not REACTPY_SESSION_TOUCH_INTERVAL:
+            await self.flush()
+        elif self.pending:
+            loop = asyncio.get_running_loop()
+            flush_task = self.flush_tasks.get(loop)
+            if not flush_task or flush_task.done():
+                self.flush_tasks = {
+                    other_loop: task for other_loop, task in self.flush_tasks.items() if not other_loop.is_closed()
+                }
+                self.flush_tasks[loop] = loop.create_task(self._delayed_flush(REACTPY_SESSION_TOUCH_INTERVAL))
+
+    async def flush(self) -> None:
+        """Immediately reset the expiration of all pending sessions."""
+        from reactpy_django.config import REACTPY_SESSION_MAX_AGE
+
+        keys, self.pending = self.pending, set()
+        if not keys:
+            return
+
+        try:
+            await get_session_store().atouch_many(keys)
+        except Exception:
+            await asyncio.to_thread(
+                _logger.error,
+                f"ReactPy has failed to save component sessions!\n{traceback.format_exc()}",
+            )
+            return
+
+        now = time.monotonic()
+        SESSION_TOUCH_STATS["written"] += len(keys)
+        SESSION_TOUCH_STATS["flushes"] += 1
+        self.recently_touched.update(dict.fromkeys(keys, now))
+
+        # Forget sessions that are no longer considered recent
+        skip_after = now - REACTPY_SESSION_MAX_AGE * 0.01
+        self.recently_touched = {key: at for key, at in self.recently_touched.items() if at > skip_after}
+
+    async def _delayed_flush(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self.flush_tasks.pop(asyncio.get_running_loop(), None)
+        await self.flush()
+
+
+SESSION_TOUCHER = SessionToucher()
+
+
+def get_session_store() -> ComponentSessionStore:
+    """Returns the component session store configured by `REACTPY_SESSION_STORE`."""
+    from reactpy_django.config import REACTPY_SESSION_STORE
+
+    return _load_session_store(REACTPY_SESSION_STORE)
+
+
+@cache
+def _load_session_store(dotted_path: str) -> ComponentSessionStore:
+    return import_dotted_path(dotted_path)()
+
+
+def create_session_buckets(using: str, **_kwargs) -> None:
+    """`post_migrate` receiver that creates the upcoming tables of a `BucketedSessionStore`."""
+    store = get_session_store()
+    if isinstance(store, BucketedSessionStore) and using == router.db_for_write(
+        store.bucket_model(store.current_bucket())
+    ):
+        store.create_buckets()
@@ -1,77 +1,165 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+import traceback
+from collections import Counter
 from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Literal
 
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.db import router
 from django.utils import timezone
 
 _logger = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
     from reactpy_django.models import Config
 
 CLEAN_NEEDED_BY: datetime = datetime(year=1, month=1, day=1, tzinfo=timezone.now().tzinfo)
+CLEAN_SCHEDULER: asyncio.Task | None = None
+CLEAN_STATS: Counter[str] = Counter()
+"""Process-wide counters of the rows deleted by each cleaning task (such as `component_sessions`),
+the number of delete `batches` performed, the number of dropped `session_buckets` tables, and the
+number of `incomplete` cleans that ran out of time."""
+CLEAN_NEEDED_BY_CACHE_KEY = "reactpy_django:clean_needed_by"
+CLEAN_LOCK_CACHE_KEY = "reactpy_django:clean_lock"
+CLEAN_LOCK_TIMEOUT = 1800
 CleaningArgs = Literal["all", "sessions", "auth_tokens", "user_data"]
 
 
-def clean(*args: CleaningArgs, immediate: bool = False, verbosity: int = 1):
+def clean(*args: CleaningArgs, immediate: bool = False, verbosity: int = 1) -> bool:
+    """Perform a clean up, if one is needed. Returns `False` if the clean up ran out of time
+    (`REACTPY_CLEAN_TIME_BUDGET`) and must be continued by another call."""
+    from reactpy_django.config import REACTPY_CACHE, REACTPY_CLEAN_TIME_BUDGET
+
+    if immediate:
+        return _clean(*args, immediate=True, verbosity=verbosity)
+    if not clean_is_needed():
+        return True
+
+    # Only one process (across all servers sharing `REACTPY_CACHE`) can claim this clean.
+    # The lock expires on its own, in case the claiming process dies while cleaning.
+    lock_timeout = (REACTPY_CLEAN_TIME_BUDGET or CLEAN_LOCK_TIMEOUT) * 2
+    if not caches[REACTPY_CACHE].add(CLEAN_LOCK_CACHE_KEY, True, timeout=lock_timeout):
+        return True
+    try:
+        return _clean(*args, verbosity=verbosity)
+    finally:
+        caches[REACTPY_CACHE].delete(CLEAN_LOCK_CACHE_KEY)
+
+
+def _clean(*args: CleaningArgs, immediate: bool = False, verbosity: int = 1) -> bool:
     from reactpy_django.config import (
         REACTPY_CLEAN_AUTH_TOKENS,
+        REACTPY_CLEAN_INTERVAL,
         REACTPY_CLEAN_SESSIONS,
+        REACTPY_CLEAN_TIME_BUDGET,
         REACTPY_CLEAN_USER_DATA,
     )
     from reactpy_django.models import Config
+    from reactpy_django.sessions import get_session_store
+
+    global CLEAN_NEEDED_BY
 
+    # Claim this clean by atomically moving the timestamp forward. If another process has
+    # cleaned in the meantime, the timestamp will have changed and nothing is claimed.
     config = Config.load()
-    if immediate or clean_is_needed(config):
-        config.cleaned_at = timezone.now()
-        config.save()
-
-        # If no args are provided, use the default settings.
-        sessions = REACTPY_CLEAN_SESSIONS
-        auth_tokens = REACTPY_CLEAN_AUTH_TOKENS
-        user_data = REACTPY_CLEAN_USER_DATA
-
-        if args:
-            sessions = any(value in args for value in ("sessions", "all"))
-            auth_tokens = any(value in args for value in ("auth_tokens", "all"))
-            user_data = any(value in args for value in ("user_data", "all"))
-
-        if sessions:
-            clean_component_sessions(verbosity)
-        if auth_tokens:
-            clean_auth_tokens(verbosity)
-        if user_data:
-            clean_user_data(verbosity)
-
-
-def clean_component_sessions(verbosity: int = 1):
-    """Deletes expired component sessions from the database.
-    As a performance optimization, this is only run once every REACTPY_SESSION_MAX_AGE seconds.
-    """
+    now = timezone.now()
+    if not immediate:
+        if REACTPY_CLEAN_INTERVAL is None:
+            return True
+        CLEAN_NEEDED_BY = config.cleaned_at + timedelta(seconds=REACTPY_CLEAN_INTERVAL)
+        if now < CLEAN_NEEDED_BY:
+            _share_clean_needed_by()
+            return True
+        if not Config.objects.filter(pk=config.pk, cleaned_at=config.cleaned_at).update(cleaned_at=now):
+            return True
+    else:
+        Config.objects.filter(pk=config.pk).update(cleaned_at=now)
+    if REACTPY_CLEAN_INTERVAL is not None:
+        CLEAN_NEEDED_BY = now + timedelta(seconds=REACTPY_CLEAN_INTERVAL)
+        _share_clean_needed_by()
+
+    # If no args are provided, use the default settings.
+    sessions = REACTPY_CLEAN_SESSIONS
+    auth_tokens = REACTPY_CLEAN_AUTH_TOKENS
+    user_data = REACTPY_CLEAN_USER_DATA
+
+    if args:
+        sessions = any(value in args for value in ("sessions", "all"))
+        auth_tokens = any(value in args for value in ("auth_tokens", "all"))
+        user_data = any(value in args for value in ("user_data", "all"))
+
+    deadline = None if REACTPY_CLEAN_TIME_BUDGET is None else time.monotonic() + REACTPY_CLEAN_TIME_BUDGET
+    finished = True
+
+    # Sessions that are not stored in the database are expired by their store
+    if sessions and get_session_store().uses_database:
+        finished = clean_component_sessions(verbosity, deadline) and finished
+    if auth_tokens:
+        finished = clean_auth_tokens(verbosity, deadline) and finished
+    if user_data:
+        finished = clean_user_data(verbosity, deadline) and finished
+
+    # Make the next clean due immediately, so that it can continue where this one left off
+    if not finished:
+        CLEAN_STATS["incomplete"] += 1
+        if REACTPY_CLEAN_INTERVAL is not None:
+            Config.objects.filter(pk=config.pk, cleaned_at=now).update(
+                cleaned_at=now - timedelta(seconds=REACTPY_CLEAN_INTERVAL)
+            )
+            CLEAN_NEEDED_BY = now
+            _share_clean_needed_by()
+
+    return finished
+
+
+def clean_component_sessions(verbosity: int = 1, deadline: float | None = None) -> bool:
+    """Deletes expired component sessions from the database. Returns `False` if the `deadline`
+    (a `time.monotonic` timestamp) was reached before all expired sessions were deleted.
+
+    When using the `BucketedSessionStore`, tables of expired sessions are also dropped."""
 
     from reactpy_django.config import DJANGO_DEBUG, REACTPY_SESSION_MAX_AGE
     from reactpy_django.models import ComponentSession
+    from reactpy_django.sessions import BucketedSessionStore, get_session_store
 
     if verbosity >= 2:
         _logger.info("Cleaning ReactPy component sessions...")
 
     start_time = timezone.now()
-    expiration_date = timezone.now() - timedelta(seconds=REACTPY_SESSION_MAX_AGE)
-    session_objects = ComponentSession.objects.filter(last_accessed__lte=expiration_date)
 
-    if verbosity >= 2:
-        _logger.info("Deleting %d expired component sessions...", session_objects.count())
+    # Bucketed sessions are expired by dropping whole tables, and upcoming tables are created
+    # here so that templates never need to create them while rendering
+    store = get_session_store()
+    if isinstance(store, BucketedSessionStore):
+        dropped = store.drop_expired_buckets()
+        created = store.create_buckets()
+        CLEAN_STATS["session_buckets"] += dropped
+        if verbosity >= 2:
+            _logger.info(
+                "Dropped %d expired and created %d upcoming ReactPy component session tables.", dropped, created
+            )
 
-    session_objects.delete()
+    expiration_date = timezone.now() - timedelta(seconds=REACTPY_SESSION_MAX_AGE)
+    session_objects = ComponentSession.objects.filter(last_accessed__lte=expiration_date)
+    finished = delete_in_batches(session_objects, "component_sessions", deadline, verbosity)
 
     if DJANGO_DEBUG or verbosity >= 2:
         inspect_clean_duration(start_time, "component sessions", verbosity)
 
+    return finished
+
 
-def clean_auth_tokens(verbosity: int = 1):
+def clean_auth_tokens(verbosity: int = 1, deadline: float | None = None) -> bool:
+    """Deletes expired auth tokens from the database. Returns `False` if the `deadline`
+    (a `time.monotonic` timestamp) was reached before all expired tokens were deleted."""
     from reactpy_django.config import DJANGO_DEBUG, REACTPY_AUTH_TOKEN_MAX_AGE
     from reactpy_django.models import AuthToken
 
@@ -80,54 +168,136 @@ def clean_auth_tokens(verbosity: int = 1):
     start_time = timezone.now()
     expiration_date = timezone.now() - timedelta(seconds=REACTPY_AUTH_TOKEN_MAX_AGE)
     synchronizer_objects = AuthToken.objects.filter(created_at__lte=expiration_date)
-
-    if verbosity >= 2:
-        _logger.info("Deleting %d expired auth token objects...", synchronizer_objects.count())
-
-    synchronizer_objects.delete()
+    finished = delete_in_batches(synchronizer_objects, "auth_tokens", deadline, verbosity)
 
     if DJANGO_DEBUG or verbosity >= 2:
         inspect_clean_duration(start_time, "auth tokens", verbosity)
 
+    return finished
+
+
+def delete_in_batches(queryset: QuerySet, task_name: str, deadline: float | None = None, verbosity: int = 1) -> bool:
+    """Delete the rows of a queryset in batches of `REACTPY_CLEAN_BATCH_SIZE` primary keys. Each
+    batch is a short, separate `DELETE` statement, which keeps locks brief for live traffic.
+
+    Rows are deleted without collecting cascades or sending signals, so this must only be used
+    on models that nothing else references. Returns `False` if the `deadline` (a `time.monotonic`
+    timestamp) was reached before all rows were deleted."""
+    from reactpy_django.config import REACTPY_CLEAN_BATCH_SIZE
+
+    model = queryset.model
+    pk_name = model._meta.pk.name  # type: ignore
+    using = router.db_for_write(model)
+    deleted = 0
+
+    while True:
+        pks = list(queryset.order_by().values_list(pk_name, flat=True)[:REACTPY_CLEAN_BATCH_SIZE])
+        if pks:
+            batch = model._default_manager.filter(pk__in=pks)
+            count = batch._raw_delete(using)  # type: ignore[attr-defined]
+            deleted += count
+            CLEAN_STATS[task_name] += count
+            CLEAN_STATS["batches"] += 1
 
-def clean_user_data(verbosity: int = 1):
+        if len(pks) < REACTPY_CLEAN_BATCH_SIZE:
+            finished = True
+            break
+        if deadline is not None and time.monotonic() >= deadline:
+            finished = False
+            break
+
+    if verbosity >= 2:
+        _logger.info(
+            "Deleted %d ReactPy %s%s.",
+            deleted,
+            task_name.replace("_", " "),
+            "" if finished else " (more remain, and will be deleted during the next clean)",
+        )
+
+    return finished
+
+
+def clean_user_data(verbosity: int = 1, deadline: float | None = None) -> bool:
     """Delete any user data that is not associated with an existing `User`.
     This is a safety measure to ensure that we don't have any orphaned data in the database.
 
     Our `UserDataModel` is supposed to automatically get deleted on every `User` delete signal.
     However, we can't use Django to enforce this relationship since ReactPy can be configured to
     use any database.
+
+    User data is checked in batches of `REACTPY_CLEAN_BATCH_SIZE`, in primary key order. Progress
+    is stored within `Config.user_data_cursor`, so that a clean which reaches its `deadline` (a
+    `time.monotonic` timestamp) can be resumed by the next clean. Returns `False` in that case.
     """
-    from reactpy_django.config import DJANGO_DEBUG
-    from reactpy_django.models import UserDataModel
+    from reactpy_django.config import DJANGO_DEBUG, REACTPY_CLEAN_BATCH_SIZE
+    from reactpy_django.models import Config, UserDataModel
 
     if verbosity >= 2:
         _logger.info("Cleaning ReactPy user data...")
 
     start_time = timezone.now()
-    user_model = get_user_model()
-    all_users = user_model.objects.all()
-    all_user_pks = all_users.values_list(user_model._meta.pk.name, flat=True)  # type: ignore
-
-    # Django doesn't support using QuerySets as an argument with cross-database relations.
-    if user_model.objects.db != UserDataModel.objects.db:
-        all_user_pks = list(all_user_pks)
-
-    user_data_objects = UserDataModel.objects.exclude(user_pk__in=all_user_pks)
+    config = Config.load()
+    cursor = config.user_data_cursor
+    deleted = 0
+
+    while True:
+        user_data = list(
+            UserDataModel.objects
+            .filter(pk__gt=cursor)
+            .order_by("pk")
+            .values_list("pk", "user_pk")[:REACTPY_CLEAN_BATCH_SIZE]
+        )
+        existing_user_pks = _existing_user_pks({user_pk for _, user_pk in user_data})
+        orphaned = [pk for pk, user_pk in user_data if user_pk not in existing_user_pks]
+        if orphaned:
+            deleted += UserDataModel.objects.filter(pk__in=orphaned)._raw_delete(  # type: ignore[attr-defined]
+                router.db_for_write(UserDataModel)
+            )
+
+        if len(user_data) < REACTPY_CLEAN_BATCH_SIZE:
+            cursor, finished = 0, True
+            break
+        cursor = user_data[-1][0]
+        if deadline is not None and time.monotonic() >= deadline:
+            finished = False
+            break
+
+    Config.objects.filter(pk=config.pk).update(user_data_cursor=cursor)
+    CLEAN_STATS["user_data"] += deleted
 
     if verbosity >= 2:
-        _logger.info("Deleting %d user data objects not associated with an existing user...", user_data_objects.count())
-
-    user_data_objects.delete()
+        _logger.info("Deleted %d user data objects not associated with an existing user.", deleted)
 
     if DJANGO_DEBUG or verbosity >= 2:
         inspect_clean_duration(start_time, "user data", verbosity)
 
+    return finished
+
+
+def _existing_user_pks(user_pks: set[str]) -> set[str]:
+    """Returns which of the given (stringified) primary keys belong to an existing `User`."""
+    user_model = get_user_model()
+    pk_field = user_model._meta.pk
+
+    # User data with a primary key that is not valid for the user model can't belong to any user
+    valid_pks = []
+    for user_pk in user_pks:
+        try:
+            valid_pks.append(pk_field.to_python(user_pk))  # type: ignore
+        except ValidationError:
+            pass
+
+    if not valid_pks:
+        return set()
+
+    existing = user_model._default_manager.filter(pk__in=valid_pks).values_list("pk", flat=True)
+    return {str(pk) for pk in existing}
+
 
 def clean_is_needed(config: Config | None = None) -> bool:
     """Check if a clean is needed. This function avoids unnecessary database reads by caching the
-    CLEAN_NEEDED_BY date."""
-    from reactpy_django.config import REACTPY_CLEAN_INTERVAL
+    CLEAN_NEEDED_BY date, both within this process and within `REACTPY_CACHE`."""
+    from reactpy_django.config import REACTPY_CACHE, REACTPY_CLEAN_INTERVAL
     from reactpy_django.models import Config
 
     global CLEAN_NEEDED_BY
@@ -135,13 +305,70 @@ def clean_is_needed(config: Config | None = None) -> bool:
     if REACTPY_CLEAN_INTERVAL is None:
         return False
 
-    if timezone.now() >= CLEAN_NEEDED_BY:
-        config = config or Config.load()
-        CLEAN_NEEDED_BY = config.cleaned_at + timedelta(seconds=REACTPY_CLEAN_INTERVAL)
+    now = timezone.now()
+    if now >= CLEAN_NEEDED_BY:
+        # Another process may have already cleaned, in which case the database doesn't need to be read
+        shared: datetime | None = caches[REACTPY_CACHE].get(CLEAN_NEEDED_BY_CACHE_KEY)
+        if shared and now < shared:
+            CLEAN_NEEDED_BY = shared
+        else:
+            config = config or Config.load()
+            CLEAN_NEEDED_BY = config.cleaned_at + timedelta(seconds=REACTPY_CLEAN_INTERVAL)
+            _share_clean_needed_by()
 
     return timezone.now() >= CLEAN_NEEDED_BY
 
 
+def _share_clean_needed_by() -> None:
+    """Store CLEAN_NEEDED_BY within `REACTPY_CACHE`, until it is no longer in the future. If a
+    clean is already due, any previously shared value is removed so it can't postpone the clean."""
+    from reactpy_django.config import REACTPY_CACHE
+
+    timeout = (CLEAN_NEEDED_BY - timezone.now()).total_seconds()
+    if timeout > 0:
+        caches[REACTPY_CACHE].set(CLEAN_NEEDED_BY_CACHE_KEY, CLEAN_NEEDED_BY, timeout=timeout)
+    else:
+        caches[REACTPY_CACHE].delete(CLEAN_NEEDED_BY_CACHE_KEY)
+
+
+def start_clean_scheduler() -> None:
+    """Start running automatic clean up operations in the background of the current event loop,
+    if they are not already running. Clean ups are performed outside of the request/response cycle,
+    so they do not affect the latency of any WebSocket connection."""
+    from reactpy_django.config import REACTPY_CLEAN_INTERVAL
+
+    global CLEAN_SCHEDULER
+
+    if REACTPY_CLEAN_INTERVAL is None:
+        return
+
+    loop = asyncio.get_running_loop()
+    if CLEAN_SCHEDULER and not CLEAN_SCHEDULER.done() and CLEAN_SCHEDULER.get_loop() is loop:
+        return
+    CLEAN_SCHEDULER = loop.create_task(_clean_periodically())
+
+
+async def _clean_periodically() -> None:
+    from channels.db import database_sync_to_async
+
+    from reactpy_django.config import REACTPY_CLEAN_INTERVAL
+
+    while REACTPY_CLEAN_INTERVAL is not None:
+        try:
+            # Clean ups can take up to `REACTPY_CLEAN_TIME_BUDGET`, so they must not block the
+            # thread that is shared by every thread-sensitive view and database query
+            await database_sync_to_async(clean, thread_sensitive=False)()
+        except Exception:
+            await asyncio.to_thread(
+                _logger.error,
+                f"ReactPy cleaning failed!\n{traceback.format_exc()}",
+            )
+
+        # Sleep until the next clean is due. Other processes may have cleaned in the meantime,
+        # which `clean` will detect once it wakes up.
+        await asyncio.sleep(max((CLEAN_NEEDED_BY - timezone.now()).total_seconds(), 1))
+
+
 def inspect_clean_duration(start_time: datetime, task_name: str, verbosity: int):
     clean_duration = timezone.now() - start_time
 
@@ -54,6 +54,7 @@ def component(
     host: str | None = None,
     prerender: str = str(reactpy_config.REACTPY_PRERENDER),
     offline: str = "",
+    inline_params: str = str(reactpy_config.REACTPY_INLINE_PARAMS),
     **kwargs,
 ):
     """This tag is used to embed an existing ReactPy component into your HTML template.
@@ -72,6 +73,8 @@ def component(
         prerender: Configures whether to pre-render this component, which \
             enables SEO compatibility and reduces perceived latency.
         offline: The dotted path to the component to render when the client is offline.
+        inline_params: Configures whether to embed small args/kwargs within the webpage \
+            (signed to prevent tampering), rather than storing them server-side.
         **kwargs: The keyword arguments to provide to the component.
 
     Example ::
@@ -95,6 +98,8 @@ def component(
     uuid = str(uuid4())
     class_ = kwargs.pop("class", "")
     has_args = bool(args or kwargs)
+    params_key = ""
+    signed_params = ""
     user_component: ComponentConstructor | None = None
     prerender_html = ""
     offline_html = ""
@@ -128,7 +133,7 @@ def component(
     # Store args & kwargs in the database (fetched by our websocket later)
     if has_args:
         try:
-            save_component_params(args, kwargs, uuid)
+            params_key, signed_params = save_component_params(args, kwargs, request, str_to_bool(inline_params))
         except Exception as e:
             _logger.exception(
                 "An unknown error has occurred while saving component parameters for '%s'.",
@@ -180,6 +185,8 @@ def component(
         "reactpy_dotted_path": dotted_path,
         "reactpy_component_uuid": uuid,
         "reactpy_has_args": int(has_args),
+        "reactpy_params_key": params_key,
+        "reactpy_inline_params": signed_params,
         "reactpy_resolved_web_modules_path": f"/{RESOLVED_WEB_MODULES_PATH.strip('/')}/",
         "reactpy_reconnect_interval": reactpy_config.REACTPY_RECONNECT_INTERVAL,
         "reactpy_reconnect_max_interval": reactpy_config.REACTPY_RECONNECT_MAX_INTERVAL,
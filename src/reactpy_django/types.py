@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -54,6 +54,15 @@ class Mutation(Generic[FuncParams]):
         self.execute(*args, **kwargs)
 
 
+@dataclass
+class Invalidation:
+    """Used by `use_mutation` to only refetch the `use_query` hooks of a `query` function that
+    were given all of the provided `kwargs`."""
+
+    query: Callable[..., Any]
+    kwargs: dict[str, Any] = field(default_factory=dict)
+
+
 @dataclass
 class FormEventData:
     """State of a form provided to Form custom events."""
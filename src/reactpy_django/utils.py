@@ -10,22 +10,23 @@ import os
 import re
 from asyncio import iscoroutinefunction
 from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from fnmatch import fnmatch
-from functools import wraps
+from functools import lru_cache, wraps
 from importlib import import_module
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable
 from uuid import UUID, uuid4
 
-import dill
 from channels.db import database_sync_to_async
 from django.contrib.staticfiles.finders import find
 from django.core.cache import caches
-from django.db.models import ManyToManyField, ManyToOneRel, prefetch_related_objects
+from django.db.models import ManyToManyField, ManyToOneRel, Prefetch, prefetch_related_objects
 from django.db.models.base import Model
 from django.db.models.query import QuerySet
 from django.http import HttpRequest, HttpResponse
 from django.template import engines
+from django.utils.crypto import salted_hmac
 from django.utils.encoding import smart_str
 from reactpy import reactpy_to_string as _reactpy_to_string
 from reactpy.core.hooks import ConnectionContext
@@ -87,15 +88,19 @@ async def render_view(
     return response
 
 
-def register_component(component: ComponentConstructor | str):
+def register_component(component: ComponentConstructor | str, *, process: bool = False):
     """Adds a component to the list of known registered components.
 
     Args:
         component: The component to register. Can be a component function or dotted path to a component.
 
+    Kwargs:
+        process: Whether this component should be rendered within a worker process. This is \
+            useful for components that perform CPU-heavy work while rendering.
     """
     from reactpy_django.config import (
         REACTPY_FAILED_COMPONENTS,
+        REACTPY_PROCESS_COMPONENTS,
         REACTPY_REGISTERED_COMPONENTS,
     )
 
@@ -107,6 +112,9 @@ def register_component(component: ComponentConstructor | str):
         msg = f"Error while fetching '{dotted_path}'. {(str(e).capitalize())}."
         raise ComponentDoesNotExistError(msg) from e
 
+    if process:
+        REACTPY_PROCESS_COMPONENTS.add(dotted_path)
+
 
 def register_iframe(view: Callable | View | str):
     """Registers a view to be used as an iframe component.
@@ -260,10 +268,13 @@ def generate_obj_name(obj: Any) -> str:
 
 
 def django_query_postprocessor(
-    data: QuerySet | Model, many_to_many: bool = True, many_to_one: bool = True
+    data: QuerySet | Model, many_to_many: bool = True, many_to_one: bool = True, max_depth: int = 5
 ) -> QuerySet | Model:
     """Recursively fetch all fields within a `Model` or `QuerySet` to ensure they are not performed lazily.
 
+    The model's relationships are inspected once to build a query plan, which fetches related
+    objects in bulk via `select_related` and `prefetch_related` rather than once per instance.
+
     Behavior can be modified through `postprocessor_kwargs` within your `use_query` hook.
 
     Args:
@@ -272,6 +283,8 @@ def django_query_postprocessor(
     Keyword Args:
         many_to_many: Whether or not to recursively fetch `ManyToManyField` relationships.
         many_to_one: Whether or not to recursively fetch `ForeignKey` relationships.
+        max_depth: The maximum number of nested `ManyToManyField`/`ForeignKey` relationships \
+            to fetch.
 
     Returns:
         The `Model` or `QuerySet` with all fields fetched.
@@ -279,34 +292,37 @@ def django_query_postprocessor(
 
     # `QuerySet`, which is an iterable containing `Model`/`QuerySet` objects.
     if isinstance(data, QuerySet):
-        for model in data:
-            django_query_postprocessor(
-                model,
-                many_to_many=many_to_many,
-                many_to_one=many_to_one,
-            )
+        # `values()` and `values_list()` do not contain any lazy fields
+        if data._fields is not None:
+            data._fetch_all()  # type: ignore[attr-defined]
+            return data
+
+        plan = _query_plan(data.model, many_to_many, many_to_one, max_depth)
+        existing = {getattr(lookup, "prefetch_to", lookup) for lookup in data._prefetch_related_lookups}
+        prefetches = [prefetch for prefetch in plan.prefetches() if prefetch.prefetch_to not in existing]
+
+        # Querysets that were already evaluated, or cannot be modified, are prefetched in place
+        if data._result_cache is not None or data.query.combinator:  # type: ignore[attr-defined]
+            prefetch_related_objects(list(data), *plan.select, *plan.generic, *prefetches)
+            return data
+
+        if data.query.deferred_loading[0]:
+            data = data.defer(None)
+        if data.query.select_related is True:
+            data = data.prefetch_related(*plan.select)
+        elif plan.select:
+            data = data.select_related(*plan.select)
+        data = data.prefetch_related(*plan.generic, *prefetches)
+        data._fetch_all()  # type: ignore[attr-defined]
 
     # `Model` instances
     elif isinstance(data, Model):
-        prefetch_fields: list[str] = []
-        for field in data._meta.get_fields():
-            # Force the query to execute
-            getattr(data, field.name, None)
-
-            if many_to_one and type(field) is ManyToOneRel:
-                prefetch_fields.append(field.related_name or f"{field.name}_set")
-
-            elif many_to_many and isinstance(field, ManyToManyField):
-                prefetch_fields.append(field.name)
-
-        if prefetch_fields:
-            prefetch_related_objects([data], *prefetch_fields)
-            for field_str in prefetch_fields:
-                django_query_postprocessor(
-                    getattr(data, field_str).get_queryset(),
-                    many_to_many=many_to_many,
-                    many_to_one=many_to_one,
-                )
+        deferred_fields = data.get_deferred_fields()
+        if deferred_fields:
+            data.refresh_from_db(fields=deferred_fields)
+
+        plan = _query_plan(type(data), many_to_many, many_to_one, max_depth)
+        prefetch_related_objects([data], *plan.select, *plan.generic, *plan.prefetches())
 
     # Unrecognized type
     else:
@@ -322,6 +338,67 @@ def django_query_postprocessor(
     return data
 
 
+@dataclass(frozen=True)
+class _QueryPlan:
+    """The related fields of a model that `django_query_postprocessor` fetches in bulk.
+    Single-valued relationships are fetched via `select_related`, generic foreign keys via
+    `prefetch_related`, and multi-valued relationships via `prefetch_related` with a nested plan."""
+
+    select: tuple[str, ...]
+    generic: tuple[str, ...]
+    nested: tuple[tuple[str, type[Model], _QueryPlan], ...]
+
+    def prefetches(self, prefix: str = "") -> list[Prefetch]:
+        """Create the `Prefetch` objects of this plan. These are created on each use, since
+        `Prefetch` objects contain querysets."""
+        prefetches = []
+        for name, model, plan in self.nested:
+            queryset = model._default_manager.all()
+            if plan.select:
+                queryset = queryset.select_related(*plan.select)
+            prefetches.append(Prefetch(f"{prefix}{name}", queryset=queryset.prefetch_related(*plan.generic)))
+            prefetches.extend(plan.prefetches(f"{prefix}{name}__"))
+        return prefetches
+
+
+@lru_cache(maxsize=512)
+def _query_plan(
+    model: type[Model], many_to_many: bool, many_to_one: bool, max_depth: int, exclude: str | None = None
+) -> _QueryPlan:
+    select: list[str] = []
+    generic: list[str] = []
+    nested: list[tuple[str, type[Model], _QueryPlan]] = []
+    for field in model._meta.get_fields():
+        if field.name == exclude or not field.is_relation:
+            continue
+
+        # Foreign keys, and both sides of one-to-one relationships
+        if field.many_to_one or field.one_to_one:
+            if field.related_model is None:
+                generic.append(field.name)
+            elif field.concrete:
+                select.append(field.name)
+            elif field.auto_created and field.get_accessor_name():  # type: ignore[union-attr]
+                select.append(field.get_accessor_name())  # type: ignore[union-attr]
+
+        # Reverse foreign keys. The foreign key pointing back to this model is already populated.
+        elif many_to_one and type(field) is ManyToOneRel and max_depth > 0 and field.get_accessor_name():
+            nested.append((
+                field.get_accessor_name(),  # type: ignore[arg-type]
+                field.related_model,  # type: ignore[arg-type]
+                _query_plan(field.related_model, many_to_many, many_to_one, max_depth - 1, field.field.name),  # type: ignore[arg-type]
+            ))
+
+        elif many_to_many and isinstance(field, ManyToManyField) and max_depth > 0:
+            nested.append((
+                field.name,
+                field.related_model,  # type: ignore[arg-type]
+                _query_plan(field.related_model, many_to_many, many_to_one, max_depth - 1),  # type: ignore[arg-type]
+            ))
+
+    return _QueryPlan(tuple(select), tuple(generic), tuple(nested))
+
+
 def validate_component_args(func, *args, **kwargs):
     """
     Validate whether a set of args/kwargs would work on the given component.
@@ -437,17 +514,44 @@ def reactpy_to_string(vdom_or_component: Any, request: HttpRequest | None = None
     raise ValueError(msg)
 
 
-def save_component_params(args, kwargs, uuid) -> None:
-    """Saves the component parameters to the database.
-    This is used within our template tag in order to propogate
-    the parameters between the HTTP and WebSocket stack."""
-    from reactpy_django import models
+def save_component_params(args, kwargs, request: HttpRequest | None = None, inline: bool = False) -> tuple[str, str]:
+    """Saves the component parameters to the component session store, and returns the key
+    they were saved under. This is used within our template tag in order to propogate
+    the parameters between the HTTP and WebSocket stack.
+
+    Parameters are content-addressed, so identical parameters are only stored once no
+    matter how many times they are rendered.
+
+    If `inline` is set and the parameters are within `REACTPY_INLINE_PARAMS_MAX_SIZE`, they
+    are not stored at all. Instead, a signed copy of the parameters is returned alongside
+    the key, which is meant to be embedded within the webpage.
+
+    If `ComponentSessionMiddleware` is installed, the parameters are instead
+    collected on the request and saved alongside all others once the response
+    has been rendered."""
+    from reactpy_django.codecs import get_params_codec, sign_params
+    from reactpy_django.config import REACTPY_INLINE_PARAMS_MAX_SIZE
+    from reactpy_django.sessions import get_session_store
     from reactpy_django.types import ComponentParams
 
-    params = ComponentParams(args, kwargs)
-    model = models.ComponentSession(uuid=uuid, params=dill.dumps(params))
-    model.full_clean()
-    model.save()
+    params = get_params_codec().encode(ComponentParams(args, kwargs))
+    key = params_key(params)
+    if inline and len(params) <= REACTPY_INLINE_PARAMS_MAX_SIZE:
+        return key, sign_params(params)
+
+    pending: dict[str, bytes] | None = getattr(request, "_reactpy_component_params", None)
+    if pending is not None:
+        pending[key] = params
+    else:
+        get_session_store().save(key, params)
+
+    return key, ""
+
+
+def params_key(params: bytes) -> str:
+    """Returns the content-addressed key of serialized component parameters. The key is
+    signed with Django's `SECRET_KEY`, so clients cannot derive keys for arbitrary parameters."""
+    return str(UUID(bytes=salted_hmac("reactpy_django.component_params", params, algorithm="sha256").digest()[:16]))
 
 
 def validate_host(host: str) -> None:
@@ -0,0 +1,110 @@
+"""Dedicated rendering threads used when `REACTPY_BACKHAUL_THREAD` is enabled.
+
+Each backhaul thread runs its own asyncio event loop (a "shard"). WebSocket connections are
+assigned to the least-loaded shard, so that a slow render only stalls the connections that
+share its shard."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from threading import Lock, Thread
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Coroutine
+    from concurrent.futures import Future
+
+_logger = logging.getLogger(__name__)
+LAG_SAMPLE_INTERVAL = 0.5  # Seconds between event loop lag measurements
+BACKHAUL_SHARDS: list[BackhaulShard] = []
+_SHARDS_LOCK = Lock()
+
+
+class BackhaulShard:
+    """An asyncio event loop running within its own daemon thread."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.loop = asyncio.new_event_loop()
+        self.thread = Thread(target=self._run_loop, daemon=True, name=f"ReactPyBackhaul-{index}")
+        self.connections = 0
+        self.queue_depth = 0
+        self.loop_lag = 0.0
+        self._lock = Lock()
+
+    def start(self) -> None:
+        """Start this shard's thread, if it is not already running."""
+        with self._lock:
+            if not self.thread.is_alive():
+                _logger.debug("Starting ReactPy backhaul thread %s.", self.index)
+                self.thread.start()
+
+    def submit(self, coroutine: Coroutine[Any, Any, Any]) -> Future:
+        """Schedule a coroutine to run within this shard's event loop."""
+        self.start()
+        with self._lock:
+            self.queue_depth += 1
+
+        async def _dequeue():
+            with self._lock:
+                self.queue_depth -= 1
+            return await coroutine
+
+        return asyncio.run_coroutine_threadsafe(_dequeue(), self.loop)
+
+    def stats(self) -> dict[str, Any]:
+        """Load metrics for this shard."""
+        return {
+            "index": self.index,
+            "alive": self.thread.is_alive(),
+            "connections": self.connections,
+            "queue_depth": self.queue_depth,
+            "loop_lag": self.loop_lag,
+        }
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.create_task(self._measure_loop_lag())
+        self.loop.run_forever()
+
+    async def _measure_loop_lag(self) -> None:
+        """Periodically measure how late this event loop is at waking up from a sleep."""
+        while True:
+            start_time = self.loop.time()
+            await asyncio.sleep(LAG_SAMPLE_INTERVAL)
+            self.loop_lag = max(self.loop.time() - start_time - LAG_SAMPLE_INTERVAL, 0.0)
+
+
+def acquire_backhaul_shard() -> BackhaulShard:
+    """Assign a connection to the least-loaded backhaul shard."""
+    from reactpy_django.config import REACTPY_BACKHAUL_THREAD_COUNT
+
+    with _SHARDS_LOCK:
+        while len(BACKHAUL_SHARDS) < REACTPY_BACKHAUL_THREAD_COUNT:
+            BACKHAUL_SHARDS.append(BackhaulShard(len(BACKHAUL_SHARDS)))
+
+        shard = min(BACKHAUL_SHARDS, key=lambda shard: (shard.connections, shard.queue_depth, shard.loop_lag))
+        shard.connections += 1
+
+    return shard
+
+
+def first_backhaul_shard() -> BackhaulShard:
+    """Get the first backhaul shard, without assigning a connection to it."""
+    with _SHARDS_LOCK:
+        if not BACKHAUL_SHARDS:
+            BACKHAUL_SHARDS.append(BackhaulShard(0))
+        return BACKHAUL_SHARDS[0]
+
+
+def release_backhaul_shard(shard: BackhaulShard) -> None:
+    """Remove a connection from a backhaul shard's load."""
+    with _SHARDS_LOCK:
+        shard.connections = max(shard.connections - 1, 0)
+
+
+def backhaul_stats() -> list[dict[str, Any]]:
+    """Load metrics for every backhaul shard within this process."""
+    with _SHARDS_LOCK:
+        return [shard.stats() for shard in BACKHAUL_SHARDS]
@@ -5,43 +5,56 @@ from __future__ import annotations
 import asyncio
 import contextlib
 import copy
+import functools
 import logging
 import traceback
-from datetime import timedelta
-from threading import Thread
+import warnings
+import zlib
 from typing import TYPE_CHECKING, Any, cast
 from urllib.parse import parse_qs
+from uuid import UUID, uuid4
 
-import dill
 import orjson
 from channels.auth import login
+from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
-from django.utils import timezone
+from django.core import signing
 from reactpy.core.hooks import ConnectionContext
 from reactpy.core.layout import Layout
 from reactpy.core.serve import serve_layout
 from reactpy.types import Connection, Location
 
-from reactpy_django.tasks import clean
+from reactpy_django.codecs import get_params_codec, unsign_params
+from reactpy_django.exceptions import ProcessPoolExhaustedError
+from reactpy_django.refetch import REFETCH_BUS
+from reactpy_django.sessions import SESSION_TOUCHER, get_session_store
+from reactpy_django.tasks import start_clean_scheduler
 from reactpy_django.utils import ensure_async
+from reactpy_django.websocket.backhaul import (
+    BackhaulShard,
+    acquire_backhaul_shard,
+    first_backhaul_shard,
+    release_backhaul_shard,
+)
+from reactpy_django.websocket.process import serve_layout_in_process
+from reactpy_django.websocket.queues import ComponentEventQueue
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
 
 if TYPE_CHECKING:
-    from collections.abc import MutableMapping, Sequence
+    from collections.abc import Mapping, MutableMapping, Sequence
 
-    from reactpy_django import models
     from reactpy_django.types import ComponentParams
 
 _logger = logging.getLogger(__name__)
-BACKHAUL_LOOP = asyncio.new_event_loop()
-
-
-def start_backhaul_loop():
-    """Starts the asyncio event loop that will perform component rendering tasks."""
-    asyncio.set_event_loop(BACKHAUL_LOOP)
-    BACKHAUL_LOOP.run_forever()
-
-
-BACKHAUL_THREAD = Thread(target=start_backhaul_loop, daemon=True, name="ReactPyBackhaul")
+MSGPACK_SUBPROTOCOL = "reactpy.msgpack"
+THREADED_COMPRESSION_SIZE = 64 * 1024
+"""Messages of at least this many bytes are compressed within a thread, to avoid blocking the event loop."""
+PARKED_CONSUMERS: dict[str, ReactpyAsyncWebsocketConsumer] = {}
+"""Disconnected consumers whose components are being kept alive until the client reconnects."""
 
 
 class ReactpyAsyncWebsocketConsumer(AsyncJsonWebsocketConsumer):
@@ -56,9 +69,21 @@ class ReactpyAsyncWebsocketConsumer(AsyncJsonWebsocketConsumer):
 
         # Shared state across all components on this WebSocket
         self.threaded: bool = False
-        self.component_queues: dict[str, asyncio.Queue] = {}
-        self.component_sessions: dict[str, models.ComponentSession | None] = {}
+        self.binary: bool = False
+        self.compression_threshold: int = 0
+        self.backhaul: BackhaulShard | None = None
+        self.component_queues: dict[str, ComponentEventQueue] = {}
+        self.component_sessions: dict[str, str] = {}
         self.component_tasks: dict[str, asyncio.Task] = {}
+        self.batch_interval: float = 0
+        self.batch_max_messages: int = 0
+        self.batch_buffer: list[dict[str, Any]] = []
+        self.batch_flush_task: asyncio.Task | None = None
+        self.resume_token: str = uuid4().hex
+        self.resumed_by: ReactpyAsyncWebsocketConsumer | None = None
+        self.parked: bool = False
+        self.parked_messages: list[dict[str, Any]] = []
+        self.park_expiry_task: asyncio.Task | None = None
 
     async def connect(self) -> None:
         """The browser has connected."""
@@ -66,9 +91,29 @@ class ReactpyAsyncWebsocketConsumer(AsyncJsonWebsocketConsumer):
             REACTPY_AUTH_BACKEND,
             REACTPY_AUTO_RELOGIN,
             REACTPY_BACKHAUL_THREAD,
+            REACTPY_BATCH_INTERVAL,
+            REACTPY_BATCH_MAX_MESSAGES,
+            REACTPY_BINARY_PROTOCOL,
+            REACTPY_COMPRESSION_THRESHOLD,
+            REACTPY_RESUME_GRACE_PERIOD,
         )
 
-        await super().connect()
+        # Use the binary protocol if it is enabled, and the client has requested it
+        self.binary = bool(
+            REACTPY_BINARY_PROTOCOL and msgpack and MSGPACK_SUBPROTOCOL in self.scope.get("subprotocols", [])
+        )
+        await self.accept(MSGPACK_SUBPROTOCOL if self.binary else None)
+
+        # Automatic clean up operations are performed in the background of this event loop
+        start_clean_scheduler()
+
+        # Listen for queries that need to be refetched due to mutations within other processes
+        REFETCH_BUS.start()
+
+        # Compress large messages, if the client has told us it can decompress them
+        query_string = parse_qs(self.scope["query_string"].decode())
+        if REACTPY_COMPRESSION_THRESHOLD is not None and "deflate" in query_string.get("compression", []):
+            self.compression_threshold = max(REACTPY_COMPRESSION_THRESHOLD, 1)
 
         # Automatically re-login the user, if needed
         user = self.scope.get("user")
@@ -90,14 +135,44 @@ class ReactpyAsyncWebsocketConsumer(AsyncJsonWebsocketConsumer):
 
         # Each component gets its own rendering task when a "mount-component" message is received.
         self.threaded = REACTPY_BACKHAUL_THREAD
+        self.batch_interval = (REACTPY_BATCH_INTERVAL or 0) / 1000
+        self.batch_max_messages = REACTPY_BATCH_MAX_MESSAGES
         self.scope["reactpy"] = {"id": id(self)}  # type: ignore[typeddict-unknown-key]
 
+        # Take over the components of a previous connection, if the client is resuming one
+        parked = None
+        if REACTPY_RESUME_GRACE_PERIOD:
+            parked = PARKED_CONSUMERS.pop(query_string.get("resume", [""])[0], None)
+            if parked and self._user_pk() != parked._user_pk():
+                if parked.park_expiry_task:
+                    parked.park_expiry_task.cancel()
+                await parked._close_components()
+                parked = None
+            await self.send_json({"type": "resume-token", "token": self.resume_token})
+
+        if parked:
+            await self._resume(parked)
+        elif self.threaded:
+            self.backhaul = acquire_backhaul_shard()
+
     async def disconnect(self, code: int) -> None:
         """The browser has disconnected."""
-        from reactpy_django.config import REACTPY_CLEAN_INTERVAL
+        from reactpy_django.config import REACTPY_RESUME_GRACE_PERIOD
 
+        # Keep the components alive for a while, in case the client reconnects
+        if REACTPY_RESUME_GRACE_PERIOD and self.component_tasks:
+            await self._run_in_render_loop(self._park())
+            PARKED_CONSUMERS[self.resume_token] = self
+            self.park_expiry_task = asyncio.create_task(self._expire_park(REACTPY_RESUME_GRACE_PERIOD))
+        else:
+            await self._close_components()
+
+        await super().disconnect(code)
+
+    async def _close_components(self) -> None:
+        """Stop all components running on this connection, and save their sessions."""
         # Cancel all running component rendering tasks
-        if self.threaded:
+        if self.backhaul:
             # Schedule cancellation within the backhaul event loop, where
             # the real asyncio.Task objects live. Clear the dict there
             # too to avoid a cross-thread race with component_tasks.
@@ -107,73 +182,91 @@ class ReactpyAsyncWebsocketConsumer(AsyncJsonWebsocketConsumer):
                     if isinstance(task, asyncio.Task):
                         task.cancel()
                 self.component_tasks.clear()
+                self._cancel_batch_flush()
+                self.batch_buffer.clear()
 
-            asyncio.run_coroutine_threadsafe(_cancel_threaded(), BACKHAUL_LOOP)
+            self.backhaul.submit(_cancel_threaded())
+            release_backhaul_shard(self.backhaul)
         else:
             for task in self.component_tasks.values():
                 task.cancel()
             self.component_tasks.clear()
+            self._cancel_batch_flush()
+            self.batch_buffer.clear()
 
-        # Save all component sessions
-        for session in self.component_sessions.values():
-            if session:
-                try:
-                    await session.asave()
-                except Exception:
-                    await asyncio.to_thread(
-                        _logger.error,
-                        f"ReactPy has failed to save component session!\n{traceback.format_exc()}",
-                    )
+        # Refresh the expiration of all component sessions
+        await SESSION_TOUCHER.touch(set(self.component_sessions.values()))
         self.component_sessions.clear()
         self.component_queues.clear()
 
-        # Queue a cleanup, if needed
-        if REACTPY_CLEAN_INTERVAL is not None:
-            try:
-                await ensure_async(clean)()
-            except Exception:
-                await asyncio.to_thread(
-                    _logger.error,
-                    f"ReactPy cleaning failed!\n{traceback.format_exc()}",
-                )
-
-        await super().disconnect(code)
+    async def _park(self) -> None:
+        """Hold on to outgoing messages until the client resumes this connection.
+        Must be run within the rendering event loop."""
+        self.parked = True
+        self._cancel_batch_flush()
+        self.parked_messages.extend(self.batch_buffer)
+        self.batch_buffer.clear()
+
+    async def _expire_park(self, delay: float) -> None:
+        """Stop this connection's components if the client does not resume in time."""
+        await asyncio.sleep(delay)
+        if PARKED_CONSUMERS.pop(self.resume_token, None):
+            await self._close_components()
+
+    async def _resume(self, parked: ReactpyAsyncWebsocketConsumer) -> None:
+        """Adopt the components of a parked connection, and replay any messages the client missed."""
+        if parked.park_expiry_task:
+            parked.park_expiry_task.cancel()
+        self.backhaul = parked.backhaul
+        self.component_queues = parked.component_queues
+        self.component_sessions = parked.component_sessions
+        self.component_tasks = parked.component_tasks
+
+        # Components send messages via the consumer that created them, so redirect the
+        # parked consumer to this one. This is done within the rendering event loop to
+        # guarantee that replayed messages are sent before any new messages.
+        async def _redirect():
+            parked.resumed_by = self
+            parked.parked = False
+            messages, parked.parked_messages = parked.parked_messages, []
+            for message in messages:
+                await self.send_component_message(message)
+
+        await self._run_in_render_loop(_redirect())
+
+    async def _run_in_render_loop(self, coroutine: Any) -> Any:
+        """Run a coroutine within the event loop that renders this connection's components."""
+        if self.backhaul:
+            return await asyncio.wrap_future(self.backhaul.submit(coroutine))
+        return await coroutine
+
+    def _user_pk(self) -> Any:
+        return getattr(self.scope.get("user"), "pk", None)
 
     async def receive_json(self, content: Any, **_) -> None:
         """Receive a message from the browser.
 
-        Handles two message types:
+        Handles three message types:
         - ``mount-component``: Start a new component rendering task.
+        - ``mount-components``: Start rendering tasks for a batch of components.
         - ``layout-event`` (rootId present): Route the event to the
           specific component's event queue.
         """
-        if content.get("type") == "mount-component":
-            if self.threaded:
-                if not BACKHAUL_THREAD.is_alive():
-                    await asyncio.to_thread(_logger.debug, "Starting ReactPy backhaul thread.")
-                    BACKHAUL_THREAD.start()
-
+        if content.get("type") in {"mount-component", "mount-components"}:
+            mounts = content["components"] if content["type"] == "mount-components" else [content]
+            if self.backhaul:
                 # Schedule within the backhaul loop so we store an asyncio.Task,
                 # allowing proper task.cancel() (unlike concurrent.futures.Future).
-                async def _threaded_run():
-                    task = asyncio.create_task(self._run_component(content))
-                    self.component_tasks[content["rootId"]] = task
-                    try:
-                        await task
-                    finally:
-                        self.component_tasks.pop(content["rootId"], None)
-
-                asyncio.run_coroutine_threadsafe(_threaded_run(), BACKHAUL_LOOP)
+                self.backhaul.submit(self._mount_components(mounts))
             else:
-                task = asyncio.create_task(self._run_component(content))
-                self.component_tasks[content["rootId"]] = task
+                await self._mount_components(mounts)
         elif content.get("rootId"):
             root_id = content["rootId"]
             if root_id in self.component_queues:
-                if self.threaded:
-                    asyncio.run_coroutine_threadsafe(self.component_queues[root_id].put(content), BACKHAUL_LOOP)
+                if self.backhaul:
+                    self.backhaul.submit(self._queue_event(root_id, content))
                 else:
-                    await self.component_queues[root_id].put(content)
+                    await self._queue_event(root_id, content)
 
     @classmethod
     async def decode_json(cls, text_data):
@@ -183,25 +276,178 @@ class ReactpyAsyncWebsocketConsumer(AsyncJsonWebsocketConsumer):
     async def encode_json(cls, content):
         return orjson.dumps(content).decode()
 
-    async def _run_component(self, content: dict[str, Any]) -> None:
+    async def send_json(self, content, close=False):
+        """Encode the given content and send it to the client. If the client negotiated
+        the binary protocol, this content is sent as a MessagePack frame. Messages larger than
+        `REACTPY_COMPRESSION_THRESHOLD` are sent as zlib compressed binary frames."""
+        data: bytes = msgpack.packb(content) if self.binary else orjson.dumps(content)  # type: ignore[union-attr]
+
+        if self.compression_threshold and len(data) >= self.compression_threshold:
+            if len(data) >= THREADED_COMPRESSION_SIZE:
+                # zlib releases the GIL while compressing, so other components keep rendering
+                compressed = await asyncio.to_thread(zlib.compress, data)
+            else:
+                compressed = zlib.compress(data)
+            await self.send(bytes_data=compressed, close=close)
+        elif self.binary:
+            await self.send(bytes_data=data, close=close)
+        else:
+            await self.send(text_data=data.decode(), close=close)
+
+    async def send_component_message(self, message: dict[str, Any]) -> None:
+        """Send a message on behalf of a component.
+
+        When ``REACTPY_BATCH_INTERVAL`` is configured, messages from every component on this
+        WebSocket are buffered and sent together as a single ``layout-batch`` frame."""
+        if self.resumed_by:
+            await self.resumed_by.send_component_message(message)
+            return
+        if self.parked:
+            self.parked_messages.append(message)
+            return
+
+        if not self.batch_interval:
+            await self.send_json(message)
+            return
+
+        self.batch_buffer.append(message)
+        if len(self.batch_buffer) >= self.batch_max_messages:
+            await self.flush_batch()
+        elif not self.batch_flush_task:
+            self.batch_flush_task = asyncio.create_task(self._delayed_flush_batch())
+
+    async def flush_batch(self) -> None:
+        """Immediately send all buffered component messages."""
+        self._cancel_batch_flush()
+        messages, self.batch_buffer = self.batch_buffer, []
+        if len(messages) == 1:
+            await self.send_json(messages[0])
+        elif messages:
+            await self.send_json({"type": "layout-batch", "messages": messages})
+
+    async def _delayed_flush_batch(self) -> None:
+        await asyncio.sleep(self.batch_interval)
+        self.batch_flush_task = None
+        await self.flush_batch()
+
+    def _cancel_batch_flush(self) -> None:
+        if self.batch_flush_task:
+            self.batch_flush_task.cancel()
+            self.batch_flush_task = None
+
+    async def _queue_event(self, root_id: str, content: dict[str, Any]) -> None:
+        """Add a client event to a component's event queue, and notify the client if it was rejected."""
+        queue = self.component_queues.get(root_id)
+        if queue and not queue.offer(content):
+            await self.send_json({"type": "event-rejected", "rootId": root_id, "target": content.get("target")})
+
+    async def _mount_components(self, mounts: list[dict[str, Any]]) -> None:
+        """Start a rendering task for each component. The parameters of every component
+        are fetched from the database together, rather than once per component."""
+        # Skip malformed mounts, and components that are still running from a resumed connection
+        valid_mounts = [mount for mount in mounts if isinstance(mount, dict) and isinstance(mount.get("rootId"), str)]
+        if len(valid_mounts) != len(mounts):
+            await asyncio.to_thread(_logger.warning, "Ignoring malformed component mount messages.")
+        mounts = [mount for mount in valid_mounts if mount["rootId"] not in self.component_tasks]
+        params = await self._load_component_params(mounts)
+
+        for mount in mounts:
+            root_id = mount["rootId"]
+            task = asyncio.create_task(self._run_component(mount, params))
+            self.component_tasks[root_id] = task
+            task.add_done_callback(functools.partial(self._forget_component_task, root_id))
+
+    @staticmethod
+    def _params_key(content: dict[str, Any]) -> str:
+        """The key a component's parameters are stored under. Clients that predate
+        content-addressed parameters use the component's UUID."""
+        return content.get("paramsKey") or content.get("componentUuid", content["rootId"])
+
+    def _forget_component_task(self, root_id: str, task: asyncio.Task) -> None:
+        if self.component_tasks.get(root_id) is task:
+            del self.component_tasks[root_id]
+
+    async def _load_component_params(self, mounts: list[dict[str, Any]]) -> dict[str, ComponentParams]:
+        """Fetch and decode the parameters of many components at once. Parameters are either
+        verified from the signed copy embedded within the mount message, or fetched from the
+        component session store."""
+        mounts = [mount for mount in mounts if mount.get("hasArgs")]
+
+        # Keys are provided by the client, so any that could not have been generated by the server
+        # are skipped. These components will fail to mount without affecting the others.
+        keys: set[str] = set()
+        for mount in mounts:
+            if mount.get("inlineParams"):
+                continue
+            key = self._params_key(mount)
+            if _is_params_key(key):
+                keys.add(key)
+            else:
+                await asyncio.to_thread(
+                    _logger.warning,
+                    f"Invalid parameters key {key!r} for component '{mount.get('dottedPath')}'.",
+                )
+        try:
+            payloads = await get_session_store().aload_many(keys)
+        except Exception:
+            await asyncio.to_thread(
+                _logger.error,
+                f"Failed to load the parameters of {len(keys)} component(s) from the component session store!\n"
+                f"{traceback.format_exc()}",
+            )
+            payloads = {}
+        for mount in mounts:
+            if mount.get("inlineParams"):
+                try:
+                    payloads[self._params_key(mount)] = unsign_params(mount["inlineParams"])
+                except signing.BadSignature:
+                    await asyncio.to_thread(
+                        _logger.warning,
+                        f"Invalid or expired inline parameters for component '{mount.get('dottedPath')}'.",
+                    )
+        if not payloads:
+            return {}
+
+        # Decoding may need to fetch model instances, so it is performed within a thread
+        try:
+            return await database_sync_to_async(get_params_codec().decode_many)(payloads)
+        except Exception:
+            await asyncio.to_thread(
+                _logger.error,
+                f"Failed to decode the parameters of {len(payloads)} component(s)!\n{traceback.format_exc()}",
+            )
+            return {}
+
+    async def _run_component(
+        self,
+        content: dict[str, Any],
+        params: Mapping[str, ComponentParams] | None = None,
+    ) -> None:
         """Construct a component and run its ``serve_layout`` loop.
 
         Each component gets its own event queue, isolated scope, and runs
         independently within the shared WebSocket connection. Layout updates
         are tagged with a ``rootId`` so the client can route them to the
         correct component.
+
+        The component's parameters are taken from ``params`` if they were
+        already loaded by ``_mount_components``, otherwise they are fetched
+        from the component session store.
         """
         from reactpy_django import models
         from reactpy_django.auth.components import auth_manager, root_manager
         from reactpy_django.config import (
+            REACTPY_EVENT_QUEUE_POLICY,
+            REACTPY_EVENT_QUEUE_SIZE,
+            REACTPY_PROCESS_COMPONENTS,
             REACTPY_REGISTERED_COMPONENTS,
-            REACTPY_SESSION_MAX_AGE,
         )
 
         root_id: str = content["rootId"]
         dotted_path: str = content["dottedPath"]
         uuid: str = content.get("componentUuid", root_id)
         has_args: bool = content.get("hasArgs", False)
+        params_key = self._params_key(content)
 
         # Maintain backward compatibility for user code that checks
         # ws.carrier.dotted_path. This is inherently racy when multiple
@@ -213,7 +459,6 @@ class ReactpyAsyncWebsocketConsumer(AsyncJsonWebsocketConsumer):
         # component tasks from overwriting each other's scope["reactpy"] entries.
         scope = copy.copy(self.scope)
         scope["reactpy"] = {"id": uuid}  # type: ignore[typeddict-unknown-key]
-        now = timezone.now()
         component_session_args: Sequence[Any] = ()
         component_session_kwargs: MutableMapping[str, Any] = {}
 
@@ -242,23 +487,23 @@ class ReactpyAsyncWebsocketConsumer(AsyncJsonWebsocketConsumer):
             return
 
         # Construct the component. This may require fetching the component's
-        # args/kwargs from the database.
+        # args/kwargs from the component session store.
         try:
             if has_args:
-                component_session = await models.ComponentSession.objects.aget(
-                    uuid=uuid,
-                    last_accessed__gt=now - timedelta(seconds=REACTPY_SESSION_MAX_AGE),
-                )
-                params: ComponentParams = dill.loads(component_session.params)
-                component_session_args = params.args
-                component_session_kwargs = params.kwargs
-                self.component_sessions[root_id] = component_session
+                if params is None:
+                    params = await self._load_component_params([content])
+                if params_key not in params:
+                    raise models.ComponentSession.DoesNotExist
+                component_session_args = params[params_key].args
+                component_session_kwargs = params[params_key].kwargs
+                if not content.get("inlineParams"):
+                    self.component_sessions[root_id] = params_key
 
             root_component = root_component_constructor(*component_session_args, **component_session_kwargs)
         except models.ComponentSession.DoesNotExist:
             await asyncio.to_thread(
                 _logger.warning,
-                f"Component session for '{dotted_path}:{uuid}' not found. The "
+                f"Component session for '{dotted_path}:{params_key}' not found. The "
                 "session may have already expired beyond REACTPY_SESSION_MAX_AGE. "
                 "If you are using a custom `host`, you may have forgotten to provide "
                 "args/kwargs.",
@@ -274,32 +519,74 @@ class ReactpyAsyncWebsocketConsumer(AsyncJsonWebsocketConsumer):
             return
 
         # Create a dedicated event queue for this component
-        recv_queue: asyncio.Queue = asyncio.Queue()
+        recv_queue = ComponentEventQueue(REACTPY_EVENT_QUEUE_SIZE, REACTPY_EVENT_QUEUE_POLICY)
         self.component_queues[root_id] = recv_queue
 
         # Wrap outgoing messages with the rootId so the client can route them
         async def send_wrapper(message: Any) -> None:
             message["rootId"] = root_id
-            await self.send_json(message)
+            await self.send_component_message(message)
 
         # Start the ReactPy component rendering loop
         with contextlib.suppress(Exception):
-            await serve_layout(
-                Layout(
-                    ConnectionContext(
-                        auth_manager(),
-                        root_manager(root_component),
-                        value=connection,
+            rendered_in_process = False
+            if dotted_path in REACTPY_PROCESS_COMPONENTS:
+                try:
+                    await serve_layout_in_process(
+                        dotted_path,
+                        component_session_args,
+                        component_session_kwargs,
+                        scope,
+                        connection.location,
+                        send_wrapper,
+                        recv_queue,
                     )
-                ),
-                send_wrapper,
-                recv_queue.get,
-            )
+                    rendered_in_process = True
+                except ProcessPoolExhaustedError:
+                    await asyncio.to_thread(
+                        _logger.warning,
+                        f"Rendering '{dotted_path}' within the server process, since all worker processes are in "
+                        "use. Consider increasing REACTPY_PROCESS_POOL_SIZE.",
+                    )
+            if not rendered_in_process:
+                await serve_layout(
+                    Layout(
+                        ConnectionContext(
+                            auth_manager(),
+                            root_manager(root_component),
+                            value=connection,
+                        )
+                    ),
+                    send_wrapper,
+                    recv_queue.get,
+                )
 
         # Cleanup after the component rendering loop finishes.
-        # In threaded mode _threaded_run already cleaned up component_tasks;
-        # in direct mode we do it here.
+        # The component's task is removed from component_tasks by _forget_component_task.
         self.component_queues.pop(root_id, None)
         self.component_sessions.pop(root_id, None)
-        if not self.threaded:
-            self.component_tasks.pop(root_id, None)
+
+
+def _is_params_key(key: Any) -> bool:
+    """Check whether a client-provided parameters key is a UUID, as generated by the server."""
+    try:
+        UUID(key)
+    except (TypeError, ValueError, AttributeError):
+        return False
+    return True
+
+
+def __getattr__(name: str) -> Any:
+    # Deprecated aliases, from before backhaul rendering was sharded across multiple threads
+    if name in {"BACKHAUL_LOOP", "BACKHAUL_THREAD"}:
+        warnings.warn(
+            f"'reactpy_django.websocket.consumer.{name}' is deprecated, since components are now rendered "
+            "across multiple backhaul threads. Use 'reactpy_django.websocket.backhaul.BACKHAUL_SHARDS' instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        shard = first_backhaul_shard()
+        return shard.loop if name == "BACKHAUL_LOOP" else shard.thread
+
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
@@ -0,0 +1,221 @@
+"""Renders CPU-heavy root components within a pool of worker processes.
+
+Only serialized layout messages cross the process boundary. The WebSocket consumer keeps
+ownership of the connection, and simply relays `layout-event` messages into the worker
+and `layout-update` messages out of it."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from threading import Lock
+from typing import TYPE_CHECKING, Any
+
+import dill
+
+from reactpy_django.exceptions import ProcessPoolExhaustedError
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Mapping, Sequence
+    from multiprocessing.managers import SyncManager
+    from queue import Queue
+
+    from reactpy.types import Location
+
+_PROCESS_POOL: ProcessPoolExecutor | None = None
+_PROCESS_MANAGER: SyncManager | None = None
+_RELAY_EXECUTOR: ThreadPoolExecutor | None = None
+_PROCESS_POOL_LOCK = Lock()
+_BUSY_WORKERS = 0
+_SCOPE_KEYS = (
+    "type",
+    "asgi",
+    "http_version",
+    "scheme",
+    "path",
+    "raw_path",
+    "query_string",
+    "root_path",
+    "headers",
+    "client",
+    "server",
+    "subprotocols",
+)
+
+
+class _StopRendering(Exception):
+    """Raised within a worker process to stop its rendering loop."""
+
+
+def get_process_pool_size() -> int:
+    """The maximum number of worker processes, which is also the maximum number of components
+    that can be rendered within worker processes at once."""
+    from reactpy_django.config import REACTPY_PROCESS_POOL_SIZE
+
+    return REACTPY_PROCESS_POOL_SIZE or os.cpu_count() or 1
+
+
+def get_process_pool() -> tuple[ProcessPoolExecutor, SyncManager, ThreadPoolExecutor]:
+    """Lazily create the process pool, alongside the manager that provides its message queues
+    and the threads that relay messages to and from its workers."""
+    global _PROCESS_POOL, _PROCESS_MANAGER, _RELAY_EXECUTOR
+
+    with _PROCESS_POOL_LOCK:
+        if _PROCESS_POOL is None or _PROCESS_MANAGER is None or _RELAY_EXECUTOR is None:
+            pool_size = get_process_pool_size()
+            context = multiprocessing.get_context("spawn")
+            _PROCESS_MANAGER = context.Manager()
+            _PROCESS_POOL = ProcessPoolExecutor(
+                max_workers=pool_size,
+                mp_context=context,
+                initializer=_setup_worker,
+                initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", ""), list(sys.path)),
+            )
+
+            # Each component blocks one thread while waiting for updates, and briefly uses
+            # another to send events. These threads are kept separate from the event loop's
+            # default executor, so that mounted components can never exhaust it.
+            _RELAY_EXECUTOR = ThreadPoolExecutor(max_workers=pool_size * 2, thread_name_prefix="ReactPyProcessRelay")
+
+    return _PROCESS_POOL, _PROCESS_MANAGER, _RELAY_EXECUTOR
+
+
+async def serve_layout_in_process(
+    dotted_path: str,
+    args: Sequence,
+    kwargs: Mapping[str, Any],
+    scope: Mapping[str, Any],
+    location: Location,
+    send: Callable[[Any], Awaitable[None]],
+    recv_queue: asyncio.Queue,
+) -> None:
+    """Render a root component within a worker process until this coroutine is cancelled.
+
+    Each component occupies a worker process for as long as it is mounted. Raises
+    `ProcessPoolExhaustedError` if every worker process is already in use, rather than
+    waiting for a worker to become available."""
+    pool, manager, relay_executor = get_process_pool()
+    loop = asyncio.get_running_loop()
+    _acquire_worker()
+    try:
+        worker_recv: Queue = manager.Queue()
+        worker_send: Queue = manager.Queue()
+        future = loop.run_in_executor(
+            pool,
+            _serve_layout_worker,
+            dotted_path,
+            dill.dumps((args, kwargs)),
+            {key: scope[key] for key in _SCOPE_KEYS if key in scope} | {"reactpy": {"id": scope["reactpy"]["id"]}},
+            (location.path, location.query_string),
+            worker_recv,
+            worker_send,
+        )
+    except BaseException:
+        _release_worker()
+        raise
+
+    # The worker is only available again once it has actually stopped rendering
+    future.add_done_callback(lambda _: _release_worker())
+
+    async def relay_events():
+        while True:
+            event = await recv_queue.get()
+            await loop.run_in_executor(relay_executor, worker_recv.put, event)
+
+    async def relay_updates():
+        while True:
+            message = await loop.run_in_executor(relay_executor, worker_send.get)
+            if message is None:
+                return
+            await send(message)
+
+    event_relay = asyncio.create_task(relay_events())
+    try:
+        await relay_updates()
+        await future
+    finally:
+        event_relay.cancel()
+        with contextlib.suppress(Exception):
+            await loop.run_in_executor(relay_executor, worker_recv.put, None)
+
+
+def _acquire_worker() -> None:
+    global _BUSY_WORKERS
+
+    with _PROCESS_POOL_LOCK:
+        pool_size = get_process_pool_size()
+        if _BUSY_WORKERS >= pool_size:
+            msg = f"All {pool_size} ReactPy worker processes are in use."
+            raise ProcessPoolExhaustedError(msg)
+        _BUSY_WORKERS += 1
+
+
+def _release_worker() -> None:
+    global _BUSY_WORKERS
+
+    with _PROCESS_POOL_LOCK:
+        _BUSY_WORKERS -= 1
+
+
+def _setup_worker(settings_module: str, python_path: list[str]) -> None:
+    """Configure Django within a freshly spawned worker process."""
+    import django
+
+    for path in python_path:
+        if path not in sys.path:
+            sys.path.append(path)
+    if settings_module:
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    django.setup()
+
+
+def _serve_layout_worker(
+    dotted_path: str,
+    params: bytes,
+    scope: dict[str, Any],
+    location: tuple[str, str],
+    worker_recv: Queue,
+    worker_send: Queue,
+) -> None:
+    """Entry point of the worker process. Runs a `serve_layout` loop until told to stop."""
+    from reactpy.core.hooks import ConnectionContext
+    from reactpy.core.layout import Layout
+    from reactpy.core.serve import serve_layout
+    from reactpy.types import Connection, Location
+
+    from reactpy_django.auth.components import root_manager
+    from reactpy_django.utils import import_dotted_path
+
+    args, kwargs = dill.loads(params)
+    root_component = import_dotted_path(dotted_path)(*args, **kwargs)
+
+    async def send(message: Any) -> None:
+        await asyncio.to_thread(worker_send.put, message)
+
+    async def recv() -> Any:
+        event = await asyncio.to_thread(worker_recv.get)
+        if event is None:
+            raise _StopRendering
+        return event
+
+    async def render() -> None:
+        with contextlib.suppress(Exception):
+            await serve_layout(
+                Layout(
+                    ConnectionContext(
+                        root_manager(root_component),
+                        value=Connection(scope=scope, location=Location(*location), carrier=None),
+                    )
+                ),
+                send,
+                recv,
+            )
+
+    try:
+        asyncio.run(render())
+    finally:
+        worker_send.put(None)
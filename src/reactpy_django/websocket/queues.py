@@ -0,0 +1,49 @@
+"""Event queues used to deliver client events to each root component."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from typing import Any, Literal
+
+EventQueuePolicy = Literal["drop-oldest", "coalesce", "reject"]
+EVENT_QUEUE_STATS: Counter[str] = Counter()
+"""Process-wide counters of `dropped`, `coalesced`, and `rejected` client events."""
+
+
+class ComponentEventQueue(asyncio.Queue):
+    """An `asyncio.Queue` that applies a back-pressure policy once it contains `max_events`.
+
+    Policies:
+        - `drop-oldest`: Discard the oldest queued event to make room for the new event.
+        - `coalesce`: Replace a queued event that has the same `type` and `target` as the \
+            new event. If there is no such event, the oldest queued event is discarded.
+        - `reject`: Discard the new event.
+    """
+
+    def __init__(self, max_events: int | None = None, policy: EventQueuePolicy = "coalesce"):
+        super().__init__()
+        self.max_events = max_events
+        self.policy = policy
+
+    def offer(self, event: dict[str, Any]) -> bool:
+        """Add an event to the queue. Returns `False` if the event was rejected."""
+        if self.max_events and self.qsize() >= self.max_events:
+            if self.policy == "reject":
+                EVENT_QUEUE_STATS["rejected"] += 1
+                return False
+
+            if self.policy == "coalesce":
+                for index, queued_event in enumerate(self._queue):  # type: ignore[attr-defined]
+                    if queued_event.get("type") == event.get("type") and queued_event.get("target") == event.get(
+                        "target"
+                    ):
+                        self._queue[index] = event  # type: ignore[attr-defined]
+                        EVENT_QUEUE_STATS["coalesced"] += 1
+                        return True
+
+            self.get_nowait()
+            EVENT_QUEUE_STATS["dropped"] += 1
+
+        self.put_nowait(event)
+        return True
@@ -0,0 +1,40 @@
+"""
+Development script that compares the size and speed of each component parameter codec.
+Must be run from within the `tests` directory.
+"""
+
+import os
+import sys
+import timeit
+from pathlib import Path
+
+import django
+
+sys.path.insert(0, str(Path.cwd()))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "test_app.settings_single_db")
+django.setup()
+
+from reactpy_django.codecs import DillParamsCodec, FastParamsCodec
+from reactpy_django.types import ComponentParams
+
+ITERATIONS = 10_000
+CASES = {
+    "string": ComponentParams(("hello world",), {}),
+    "scalars": ComponentParams((1, 2.5, True), {"name": "example", "count": 42, "value": None}),
+    "nested": ComponentParams((), {"rows": [{"id": index, "label": f"Row {index}"} for index in range(100)]}),
+    "fallback": ComponentParams(((1, 2),), {"tags": {"a", "b"}}),
+}
+CODECS = {"dill": DillParamsCodec(), "fast": FastParamsCodec()}
+
+
+if __name__ == "__main__":
+    print(f"{'case':<10}{'codec':<8}{'bytes':>8}{'encode (µs)':>14}{'decode (µs)':>14}")
+    for case_name, params in CASES.items():
+        for codec_name, codec in CODECS.items():
+            data = codec.encode(params)
+            encode_time = timeit.timeit(lambda: codec.encode(params), number=ITERATIONS)  # noqa: B023
+            decode_time = timeit.timeit(lambda: codec.decode(data), number=ITERATIONS)  # noqa: B023
+            print(
+                f"{case_name:<10}{codec_name:<8}{len(data):>8}"
+                f"{encode_time / ITERATIONS * 1e6:>14.2f}{decode_time / ITERATIONS * 1e6:>14.2f}"
+            )
@@ -39,6 +39,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "reactpy_django.http.middleware.ComponentSessionMiddleware",
 ]
 ROOT_URLCONF = "test_app.urls"
 TEMPLATES = [
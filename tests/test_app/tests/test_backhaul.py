@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from reactpy_django.websocket import backhaul
+
+
+@pytest.fixture
+def isolated_shards(monkeypatch):
+    from reactpy_django import config
+
+    monkeypatch.setattr(backhaul, "BACKHAUL_SHARDS", [])
+    monkeypatch.setattr(config, "REACTPY_BACKHAUL_THREAD_COUNT", 2)
+    return backhaul.BACKHAUL_SHARDS
+
+
+def test_connections_are_spread_across_shards(isolated_shards):
+    first = backhaul.acquire_backhaul_shard()
+    second = backhaul.acquire_backhaul_shard()
+
+    assert len(isolated_shards) == 2
+    assert first is not second
+
+    # Releasing a connection makes its shard the least-loaded again
+    backhaul.release_backhaul_shard(first)
+    assert backhaul.acquire_backhaul_shard() is first
+    assert [stats["connections"] for stats in backhaul.backhaul_stats()] == [1, 1]
+
+
+def test_submit_runs_within_shard_loop(isolated_shards):
+    shard = backhaul.acquire_backhaul_shard()
+
+    async def get_loop():
+        return asyncio.get_running_loop()
+
+    assert shard.submit(get_loop()).result(timeout=5) is shard.loop
+    assert shard.stats()["alive"] is True
+    assert shard.stats()["queue_depth"] == 0
+
+
+def test_deprecated_aliases(isolated_shards):
+    from reactpy_django.websocket import consumer
+
+    with pytest.deprecated_call():
+        loop = consumer.BACKHAUL_LOOP
+    with pytest.deprecated_call():
+        thread = consumer.BACKHAUL_THREAD
+
+    # The aliases refer to the first shard, without assigning a connection to it
+    assert loop is isolated_shards[0].loop
+    assert thread is isolated_shards[0].thread
+    assert isolated_shards[0].connections == 0
+    assert backhaul.acquire_backhaul_shard() is isolated_shards[0]
@@ -0,0 +1,93 @@
+from unittest import mock
+from uuid import uuid4
+
+import pytest
+from django.template import Context
+from django.template.base import FilterExpression, Parser
+from django.test import TransactionTestCase
+from django.utils.safestring import SafeString
+
+from reactpy_django import config
+from reactpy_django.codecs import FAST_PATH_PREFIX, DillParamsCodec, FastParamsCodec
+from reactpy_django.exceptions import ParamsDecodeError
+from reactpy_django.types import ComponentParams
+
+
+def test_fast_path_round_trip():
+    codec = FastParamsCodec()
+    params = ComponentParams(("hello", 1), {"values": [1.5, None, True], "nested": {"key": "value"}})
+
+    data = codec.encode(params)
+    assert data.startswith(FAST_PATH_PREFIX)
+    assert codec.decode(data) == params
+
+
+def test_unsupported_values_fall_back_to_dill():
+    codec = FastParamsCodec()
+    for params in (
+        ComponentParams((), {"value": (1, 2)}),
+        ComponentParams((), {"value": {1, 2}}),
+        ComponentParams((), {"value": 2**64}),
+        ComponentParams((), {1: "non-string key"}),
+    ):
+        data = codec.encode(params)
+        assert not data.startswith(FAST_PATH_PREFIX)
+        assert codec.decode(data) == params
+
+    # JSON cannot represent NaN or infinity
+    assert not codec.encode(ComponentParams((float("nan"),), {})).startswith(FAST_PATH_PREFIX)
+
+
+def test_template_values_use_fast_path():
+    # Template tag arguments are resolved as `SafeString` when they are string literals
+    value = FilterExpression('"home"', Parser([])).resolve(Context())
+    assert isinstance(value, SafeString)
+
+    codec = FastParamsCodec()
+    data = codec.encode(ComponentParams((value,), {"value": value}))
+    assert data.startswith(FAST_PATH_PREFIX)
+    assert codec.decode(data) == ComponentParams(("home",), {"value": "home"})
+
+
+def test_decodes_dill_payloads():
+    params = ComponentParams(("hello",), {"value": (1, 2)})
+    assert FastParamsCodec().decode(DillParamsCodec().encode(params)) == params
+
+
+class ModelReferenceTests(TransactionTestCase):
+    databases = ("default", config.REACTPY_DATABASE)
+
+    def test_model_references(self):
+        from django.contrib.auth.models import User
+
+        codec = FastParamsCodec()
+        users = [User.objects.create_user(username=str(uuid4())) for _ in range(3)]
+        payloads = {
+            str(index): codec.encode(ComponentParams((user,), {"user": user})) for index, user in enumerate(users)
+        }
+        assert all(data.startswith(FAST_PATH_PREFIX) for data in payloads.values())
+
+        # All referenced instances are fetched with a single query
+        with self.assertNumQueries(1):
+            decoded = codec.decode_many(payloads)
+
+        for index, user in enumerate(users):
+            assert decoded[str(index)].args == (user,)
+            assert decoded[str(index)].kwargs == {"user": user}
+
+        # Sessions that reference deleted instances are omitted
+        users[0].delete()
+        assert "0" not in codec.decode_many(payloads)
+        with pytest.raises(ParamsDecodeError):
+            codec.decode(payloads["0"])
+
+    def test_model_references_ignore_default_manager(self):
+        from django.contrib.auth.models import User
+
+        codec = FastParamsCodec()
+        user = User.objects.create_user(username=str(uuid4()))
+        data = codec.encode(ComponentParams((user,), {}))
+
+        # Instances are fetched even if the model's default manager would filter them out
+        with mock.patch.object(User, "objects", User.objects.none()):
+            assert codec.decode(data).args == (user,)
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import asyncio
+import zlib
+from unittest import mock
+
+import msgpack
+import orjson
+
+from reactpy_django import config
+from reactpy_django.websocket.consumer import (
+    MSGPACK_SUBPROTOCOL,
+    THREADED_COMPRESSION_SIZE,
+    ReactpyAsyncWebsocketConsumer,
+)
+
+from .utils import RecordingConsumer
+
+
+class _FrameConsumer(ReactpyAsyncWebsocketConsumer):
+    """Records the WebSocket frames that would be sent to the client."""
+
+    def __init__(self, subprotocols: list[str] | None = None):
+        super().__init__()
+        self.scope = {"user": None, "query_string": b"", "subprotocols": subprotocols or []}
+        self.subprotocol: str | None = None
+        self.frames: list = []
+
+    async def accept(self, subprotocol=None, headers=None):
+        self.subprotocol = subprotocol
+
+    async def send(self, text_data=None, bytes_data=None, close=False):
+        self.frames.append(text_data if bytes_data is None else bytes_data)
+
+    async def connect_with(self, **settings) -> None:
+        settings = {"REACTPY_BACKHAUL_THREAD": False, "REACTPY_RESUME_GRACE_PERIOD": None} | settings
+        with (
+            mock.patch.multiple(config, **settings),
+            mock.patch("reactpy_django.websocket.consumer.start_clean_scheduler"),
+            mock.patch("reactpy_django.websocket.consumer.REFETCH_BUS"),
+        ):
+            await self.connect()
+
+
+def _update(root_id: str) -> dict:
+    return {"type": "layout-update", "rootId": root_id, "path": "", "model": {"tagName": "p"}}
+
+
+def test_messages_are_sent_immediately_without_batching():
+    async def run():
+        consumer = RecordingConsumer()
+        await consumer.send_component_message(_update("a"))
+        await consumer.send_component_message(_update("b"))
+        assert consumer.sent == [_update("a"), _update("b")]
+        assert consumer.batch_flush_task is None
+
+    asyncio.run(run())
+
+
+def test_messages_are_batched_until_timeout():
+    async def run():
+        consumer = RecordingConsumer(batch_interval=0.05, batch_max_messages=100)
+        await consumer.send_component_message(_update("a"))
+        await consumer.send_component_message(_update("b"))
+        assert consumer.sent == []
+
+        await asyncio.sleep(0.2)
+        assert consumer.sent == [{"type": "layout-batch", "messages": [_update("a"), _update("b")]}]
+        assert consumer.batch_buffer == []
+        assert consumer.batch_flush_task is None
+
+    asyncio.run(run())
+
+
+def test_batch_is_flushed_once_full():
+    async def run():
+        consumer = RecordingConsumer(batch_interval=60, batch_max_messages=3)
+        for root_id in "abc":
+            await consumer.send_component_message(_update(root_id))
+
+        # The batch was sent without waiting for the interval, and the pending flush was cancelled
+        assert consumer.sent == [{"type": "layout-batch", "messages": [_update("a"), _update("b"), _update("c")]}]
+        assert consumer.batch_flush_task is None
+
+        await consumer.send_component_message(_update("d"))
+        assert len(consumer.sent) == 1
+        await consumer.flush_batch()
+        assert len(consumer.sent) == 2
+
+    asyncio.run(run())
+
+
+def test_single_message_batch_is_not_wrapped():
+    async def run():
+        consumer = RecordingConsumer(batch_interval=0.05, batch_max_messages=100)
+        await consumer.send_component_message(_update("a"))
+        await asyncio.sleep(0.2)
+        assert consumer.sent == [_update("a")]
+
+        # Flushing an empty buffer sends nothing
+        await consumer.flush_batch()
+        assert consumer.sent == [_update("a")]
+
+    asyncio.run(run())
+
+
+def test_msgpack_subprotocol_negotiation():
+    async def run():
+        # The binary protocol is used when it is enabled and the client offers it
+        consumer = _FrameConsumer(subprotocols=[MSGPACK_SUBPROTOCOL])
+        await consumer.connect_with(REACTPY_BINARY_PROTOCOL=True)
+        assert consumer.binary
+        assert consumer.subprotocol == MSGPACK_SUBPROTOCOL
+
+        # Otherwise, plain JSON is used
+        consumer = _FrameConsumer(subprotocols=[MSGPACK_SUBPROTOCOL])
+        await consumer.connect_with(REACTPY_BINARY_PROTOCOL=False)
+        assert not consumer.binary
+        assert consumer.subprotocol is None
+
+        consumer = _FrameConsumer()
+        await consumer.connect_with(REACTPY_BINARY_PROTOCOL=True)
+        assert not consumer.binary
+        assert consumer.subprotocol is None
+
+    asyncio.run(run())
+
+
+def test_send_json_frames():
+    async def run():
+        consumer = _FrameConsumer()
+        await consumer.send_json(_update("a"))
+        assert consumer.frames == [orjson.dumps(_update("a")).decode()]
+
+        consumer.binary = True
+        await consumer.send_json(_update("b"))
+        assert isinstance(consumer.frames[-1], bytes)
+        assert msgpack.unpackb(consumer.frames[-1]) == _update("b")
+
+    asyncio.run(run())
+
+
+def test_compression_negotiation():
+    async def run():
+        consumer = _FrameConsumer()
+        consumer.scope["query_string"] = b"compression=deflate"
+        await consumer.connect_with(REACTPY_COMPRESSION_THRESHOLD=0)
+        assert consumer.compression_threshold == 1
+
+        # Clients that do not support compression never receive compressed frames
+        consumer = _FrameConsumer()
+        await consumer.connect_with(REACTPY_COMPRESSION_THRESHOLD=0)
+        assert consumer.compression_threshold == 0
+
+    asyncio.run(run())
+
+
+def test_compressed_frames_round_trip():
+    async def run():
+        small = _update("a")
+        large = {"type": "layout-update", "rootId": "b", "model": {"children": ["x" * 1000]}}
+        huge = {"type": "layout-update", "rootId": "c", "model": {"children": ["y" * THREADED_COMPRESSION_SIZE]}}
+
+        consumer = _FrameConsumer()
+        consumer.compression_threshold = 500
+        await consumer.send_json(small)
+        await consumer.send_json(large)
+        with mock.patch("asyncio.to_thread", wraps=asyncio.to_thread) as to_thread:
+            await consumer.send_json(huge)
+            to_thread.assert_called_once()
+
+        # Messages below the threshold are sent as-is
+        assert consumer.frames[0] == orjson.dumps(small).decode()
+        assert orjson.loads(zlib.decompress(consumer.frames[1])) == large
+        assert orjson.loads(zlib.decompress(consumer.frames[2])) == huge
+        assert len(consumer.frames[2]) < THREADED_COMPRESSION_SIZE
+
+        consumer.binary = True
+        await consumer.send_json(large)
+        assert msgpack.unpackb(zlib.decompress(consumer.frames[3])) == large
+
+    asyncio.run(run())
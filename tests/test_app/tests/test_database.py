@@ -4,6 +4,7 @@ from typing import Any
 from uuid import uuid4
 
 import dill
+from django.db import connections, router
 from django.test import TransactionTestCase
 
 from reactpy_django import tasks
@@ -58,6 +59,467 @@ class RoutedDatabaseTests(TransactionTestCase):
             config.REACTPY_SESSION_MAX_AGE = initial_session_max_age
             config.REACTPY_CLEAN_USER_DATA = initial_clean_user_data
 
+    def test_clean_is_only_performed_once(self):
+        from datetime import timedelta
+
+        from django.core.cache import caches
+        from django.utils import timezone
+
+        from reactpy_django import config
+        from reactpy_django.models import Config
+
+        db = next(iter(self.databases))
+        initial_clean_interval = config.REACTPY_CLEAN_INTERVAL
+        config.REACTPY_CLEAN_INTERVAL = 60
+
+        try:
+            tasks.clean(immediate=True)
+            cleaned_at = Config.load().cleaned_at
+
+            # A stale `CLEAN_NEEDED_BY` (such as after another process has cleaned) is re-checked
+            # via the cache, without any database queries
+            tasks.CLEAN_NEEDED_BY = timezone.now() - timedelta(days=1)
+            with self.assertNumQueries(0, using=db):
+                tasks.clean()
+            assert tasks.CLEAN_NEEDED_BY == cleaned_at + timedelta(seconds=60)
+
+            # Without the cache, it is re-checked via the database
+            caches[config.REACTPY_CACHE].delete(tasks.CLEAN_NEEDED_BY_CACHE_KEY)
+            tasks.CLEAN_NEEDED_BY = timezone.now() - timedelta(days=1)
+            tasks.clean()
+            assert Config.load().cleaned_at == cleaned_at
+            assert tasks.CLEAN_NEEDED_BY == cleaned_at + timedelta(seconds=60)
+
+            # Only one process can claim an overdue clean
+            overdue = timezone.now() - timedelta(days=1)
+            Config.objects.filter(pk=1).update(cleaned_at=overdue)
+            caches[config.REACTPY_CACHE].delete(tasks.CLEAN_NEEDED_BY_CACHE_KEY)
+            caches[config.REACTPY_CACHE].add(tasks.CLEAN_LOCK_CACHE_KEY, True)
+            tasks.CLEAN_NEEDED_BY = overdue
+            tasks.clean()
+            assert Config.load().cleaned_at == overdue
+
+            caches[config.REACTPY_CACHE].delete(tasks.CLEAN_LOCK_CACHE_KEY)
+            tasks.clean()
+            claimed_at = Config.load().cleaned_at
+            assert claimed_at > overdue
+
+            # Even without the cache, the database prevents the same clean from being claimed twice
+            caches[config.REACTPY_CACHE].delete(tasks.CLEAN_NEEDED_BY_CACHE_KEY)
+            tasks.CLEAN_NEEDED_BY = overdue
+            tasks.clean()
+            assert Config.load().cleaned_at == claimed_at
+        finally:
+            config.REACTPY_CLEAN_INTERVAL = initial_clean_interval
+
+    def test_clean_in_batches(self):
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from reactpy_django import config
+
+        db = next(iter(self.databases))
+        initial_batch_size = config.REACTPY_CLEAN_BATCH_SIZE
+        config.REACTPY_CLEAN_BATCH_SIZE = 2
+
+        try:
+            for value in range(5):
+                self._save_params_to_db(value)
+            expired = timezone.now() - timedelta(seconds=config.REACTPY_SESSION_MAX_AGE + 1)
+            ComponentSession.objects.update(last_accessed=expired)
+            fresh_params = self._save_params_to_db("fresh")
+
+            # The deadline has already passed, so only one batch is deleted
+            assert not tasks.clean_component_sessions(deadline=0)
+            assert ComponentSession.objects.count() == 4
+
+            # Deleting the rest takes two batches, since the last batch is not full
+            batches = tasks.CLEAN_STATS["batches"]
+            assert tasks.clean_component_sessions()
+            assert tasks.CLEAN_STATS["batches"] == batches + 2
+            assert ComponentSession.objects.count() == 1
+            assert dill.loads(ComponentSession.objects.using(db).first().params) == fresh_params
+        finally:
+            config.REACTPY_CLEAN_BATCH_SIZE = initial_batch_size
+
+    def test_unfinished_clean_continues(self):
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from reactpy_django import config
+
+        initial_settings = (
+            config.REACTPY_CLEAN_INTERVAL,
+            config.REACTPY_CLEAN_BATCH_SIZE,
+            config.REACTPY_CLEAN_TIME_BUDGET,
+        )
+        config.REACTPY_CLEAN_INTERVAL = 60
+        config.REACTPY_CLEAN_BATCH_SIZE = 2
+        config.REACTPY_CLEAN_TIME_BUDGET = 0
+
+        try:
+            for value in range(5):
+                self._save_params_to_db(value)
+            expired = timezone.now() - timedelta(seconds=config.REACTPY_SESSION_MAX_AGE + 1)
+            ComponentSession.objects.update(last_accessed=expired)
+
+            # The time budget is exhausted after the first batch, so the next clean is due immediately,
+            # even though this clean had previously shared its next due date via the cache
+            assert not tasks.clean(immediate=True)
+            assert tasks.clean_is_needed()
+        finally:
+            (
+                config.REACTPY_CLEAN_INTERVAL,
+                config.REACTPY_CLEAN_BATCH_SIZE,
+                config.REACTPY_CLEAN_TIME_BUDGET,
+            ) = initial_settings
+
+    def test_clean_scheduler(self):
+        import asyncio
+
+        async def start_twice():
+            tasks.start_clean_scheduler()
+            scheduler = tasks.CLEAN_SCHEDULER
+            tasks.start_clean_scheduler()
+            assert tasks.CLEAN_SCHEDULER is scheduler
+            scheduler.cancel()
+
+        asyncio.run(start_twice())
+
+        # A new event loop gets its own scheduler
+        previous = tasks.CLEAN_SCHEDULER
+        asyncio.run(start_twice())
+        assert tasks.CLEAN_SCHEDULER is not previous
+
+    def test_clean_scheduler_does_not_block_sync_code(self):
+        import asyncio
+        import threading
+        from unittest import mock
+
+        from asgiref.sync import sync_to_async
+
+        cleaning = threading.Event()
+        finish_clean = threading.Event()
+
+        def slow_clean():
+            cleaning.set()
+            finish_clean.wait(timeout=10)
+            return True
+
+        async def run():
+            with mock.patch.object(tasks, "clean", slow_clean):
+                tasks.start_clean_scheduler()
+                await asyncio.to_thread(cleaning.wait, 5)
+
+                # Thread-sensitive code keeps running while a clean is in progress
+                assert await asyncio.wait_for(sync_to_async(lambda: "available")(), timeout=5) == "available"
+                finish_clean.set()
+                tasks.CLEAN_SCHEDULER.cancel()
+
+        asyncio.run(run())
+
+    def test_load_component_params(self):
+        from asgiref.sync import async_to_sync
+
+        from reactpy_django.websocket.consumer import ReactpyAsyncWebsocketConsumer
+
+        db = next(iter(self.databases))
+        saved: dict[str, ComponentParams] = {}
+        for value in range(5):
+            uuid = str(uuid4())
+            saved[uuid] = ComponentParams((value,), {"test_value": value})
+            ComponentSession(uuid, params=dill.dumps(saved[uuid])).save(using=db)
+        missing_uuid = str(uuid4())
+
+        # Every component's parameters are fetched with a single query
+        consumer = ReactpyAsyncWebsocketConsumer()
+        with self.assertNumQueries(1, using=db):
+            loaded = async_to_sync(consumer._load_component_params)([
+                {"rootId": uuid, "componentUuid": uuid, "hasArgs": True} for uuid in (*saved, missing_uuid)
+            ])
+
+        assert missing_uuid not in loaded
+        assert loaded == saved
+
+    def test_load_component_params_with_invalid_keys(self):
+        import asyncio
+        from unittest import mock
+
+        from asgiref.sync import async_to_sync
+
+        from reactpy_django.websocket.consumer import ReactpyAsyncWebsocketConsumer
+
+        db = next(iter(self.databases))
+        uuid = str(uuid4())
+        saved = ComponentParams((1,), {"test_value": 1})
+        ComponentSession(uuid, params=dill.dumps(saved)).save(using=db)
+        mounts = [
+            {"rootId": "valid", "dottedPath": "missing.component", "componentUuid": uuid, "hasArgs": True},
+            {"rootId": "invalid", "dottedPath": "missing.component", "componentUuid": "not-a-uuid", "hasArgs": True},
+            {"rootId": "wrong-type", "dottedPath": "missing.component", "paramsKey": ["not-a-uuid"], "hasArgs": True},
+        ]
+
+        # Invalid keys only prevent their own component from loading
+        consumer = ReactpyAsyncWebsocketConsumer()
+        consumer.scope = {"type": "websocket", "query_string": b""}
+        assert async_to_sync(consumer._load_component_params)(mounts) == {uuid: saved}
+
+        # Failures of the session store are logged, rather than closing the WebSocket
+        with mock.patch("reactpy_django.websocket.consumer.get_session_store") as get_session_store:
+            get_session_store.return_value.aload_many.side_effect = RuntimeError("Store is unavailable")
+            with self.assertLogs("reactpy_django.websocket.consumer", "ERROR"):
+                assert async_to_sync(consumer._load_component_params)(mounts) == {}
+
+            async def mount():
+                await consumer._mount_components([*mounts, {"missing": "rootId"}])
+                assert set(consumer.component_tasks) == {"valid", "invalid", "wrong-type"}
+                await asyncio.gather(*consumer.component_tasks.values())
+
+            async_to_sync(mount)()
+
+    def test_session_stores(self):
+        from asgiref.sync import async_to_sync
+
+        from reactpy_django.sessions import (
+            BucketedSessionStore,
+            CacheSessionStore,
+            DatabaseSessionStore,
+            HybridSessionStore,
+        )
+
+        db = next(iter(self.databases))
+        for store in (DatabaseSessionStore(), CacheSessionStore(), HybridSessionStore(), BucketedSessionStore()):
+            uuid = str(uuid4())
+            store.save(uuid, b"params")
+            assert async_to_sync(store.aload_many)([uuid, str(uuid4())]) == {uuid: b"params"}
+            async_to_sync(store.atouch_many)([uuid])
+
+        # The hybrid store only queries the database for sessions that are missing from the cache
+        store = HybridSessionStore()
+        cached_uuid, uncached_uuid = str(uuid4()), str(uuid4())
+        store.save(cached_uuid, b"cached")
+        store.database.save(uncached_uuid, b"uncached")
+        with self.assertNumQueries(0, using=db):
+            assert async_to_sync(store.aload_many)([cached_uuid]) == {cached_uuid: b"cached"}
+        with self.assertNumQueries(1, using=db):
+            assert async_to_sync(store.aload_many)([cached_uuid, uncached_uuid]) == {
+                cached_uuid: b"cached",
+                uncached_uuid: b"uncached",
+            }
+        assert async_to_sync(store.cache.aload_many)([uncached_uuid]) == {uncached_uuid: b"uncached"}
+
+    def test_database_session_store_without_upserts(self):
+        from datetime import timedelta
+        from unittest import mock
+
+        from django.db import connections
+        from django.utils import timezone
+
+        from reactpy_django.sessions import DatabaseSessionStore
+
+        db = next(iter(self.databases))
+        store = DatabaseSessionStore()
+        existing_uuid, new_uuid = str(uuid4()), str(uuid4())
+        store.save(existing_uuid, b"existing")
+        expired = timezone.now() - timedelta(days=1)
+        ComponentSession.objects.using(db).update(last_accessed=expired)
+
+        # Databases that can't upsert (such as MySQL) update existing sessions, then insert new sessions
+        features = connections[db].features
+        for ignore_conflicts in (True, False):
+            with (
+                mock.patch.object(features, "supports_update_conflicts_with_target", False),
+                mock.patch.object(features, "supports_ignore_conflicts", ignore_conflicts),
+            ):
+                store.save_many({existing_uuid: b"existing", new_uuid: b"new"})
+
+        sessions = {str(session.uuid): session for session in ComponentSession.objects.using(db).all()}
+        assert set(sessions) == {existing_uuid, new_uuid}
+        assert sessions[existing_uuid].last_accessed > expired
+        assert bytes(sessions[new_uuid].params) == b"new"
+
+    def test_bucketed_session_store(self):
+        from datetime import timedelta
+
+        from asgiref.sync import async_to_sync
+        from django.utils import timezone
+
+        from reactpy_django.sessions import BucketedSessionStore
+
+        store = BucketedSessionStore()
+        current = store.current_bucket()
+        store.create_buckets()
+        previous_uuid, expired_uuid = str(uuid4()), str(uuid4())
+        for bucket, uuid, last_accessed in (
+            (current - 1, previous_uuid, timezone.now() - timedelta(hours=1)),
+            (current - 100, expired_uuid, timezone.now() - timedelta(days=100)),
+        ):
+            store.ensure_bucket(bucket)
+            store.bucket_model(bucket).objects.create(uuid=uuid, params=b"params", last_accessed=last_accessed)
+
+        try:
+            # Sessions are found within older tables, as long as they have not expired
+            assert async_to_sync(store.aload_many)([previous_uuid, expired_uuid]) == {previous_uuid: b"params"}
+
+            # Touching a session moves it into the newest table
+            async_to_sync(store.atouch_many)([previous_uuid])
+            assert store.bucket_model(current).objects.filter(uuid=previous_uuid).exists()
+
+            # Tables that only contain expired sessions are dropped
+            assert store.drop_expired_buckets() == 1
+            assert current - 100 not in BucketedSessionStore().discover_buckets()
+            assert async_to_sync(store.aload_many)([previous_uuid]) == {previous_uuid: b"params"}
+        finally:
+            for bucket in store.discover_buckets():
+                with connections[router.db_for_write(store.bucket_model(bucket))].schema_editor() as editor:
+                    editor.delete_model(store.bucket_model(bucket))
+
+    def test_bucketed_session_store_creates_tables_ahead_of_time(self):
+        from unittest import mock
+
+        from asgiref.sync import async_to_sync
+
+        from reactpy_django.sessions import BucketedSessionStore
+
+        store = BucketedSessionStore()
+        current = store.current_bucket()
+        uuid, later_uuid = str(uuid4()), str(uuid4())
+        try:
+            # Without a table for the current bucket, sessions are stored within the ComponentSession
+            # model rather than creating a table while rendering
+            store.save(uuid, b"params")
+            assert current not in store.discover_buckets()
+            assert ComponentSession.objects.filter(uuid=uuid).exists()
+            assert async_to_sync(store.aload_many)([uuid]) == {uuid: b"params"}
+
+            # Cleaning creates the tables ahead of time
+            with mock.patch("reactpy_django.sessions.get_session_store", return_value=store):
+                tasks.clean_component_sessions()
+            assert {current, current + 1} <= store.known_buckets
+            store.save(later_uuid, b"params")
+            assert store.bucket_model(current).objects.filter(uuid=later_uuid).exists()
+            assert async_to_sync(store.aload_many)([uuid, later_uuid]) == {uuid: b"params", later_uuid: b"params"}
+        finally:
+            for bucket in store.discover_buckets():
+                with connections[router.db_for_write(store.bucket_model(bucket))].schema_editor() as editor:
+                    editor.delete_model(store.bucket_model(bucket))
+
+    def test_bucketed_session_store_remembers_missing_tables(self):
+        from unittest import mock
+
+        from reactpy_django.sessions import BucketedSessionStore
+
+        store = BucketedSessionStore()
+        current = store.current_bucket()
+
+        # Rendering many templates without a table for the current bucket only checks the database once
+        with mock.patch.object(store, "discover_buckets", wraps=store.discover_buckets) as discover_buckets:
+            for _ in range(5):
+                store.save(str(uuid4()), b"params")
+                store.load_many([str(uuid4())])
+            assert discover_buckets.call_count == 1
+
+            # The database is checked again once the missing table has been remembered for long enough
+            store.missing_until[current] = 0
+            store.save(str(uuid4()), b"params")
+            assert discover_buckets.call_count == 2
+        assert ComponentSession.objects.count() == 6
+
+    def test_bucketed_session_store_without_upserts(self):
+        from datetime import timedelta
+        from unittest import mock
+
+        from django.utils import timezone
+
+        from reactpy_django.sessions import BucketedSessionStore
+
+        store = BucketedSessionStore()
+        current = store.current_bucket()
+        store.create_buckets()
+        model = store.bucket_model(current)
+        existing_uuid, new_uuid = str(uuid4()), str(uuid4())
+        expired = timezone.now() - timedelta(days=1)
+        try:
+            model.objects.create(uuid=existing_uuid, params=b"existing", last_accessed=expired)
+
+            # Databases that can't upsert (such as MySQL) update existing sessions, then insert new sessions
+            features = connections[router.db_for_write(model)].features
+            with mock.patch.object(features, "supports_update_conflicts_with_target", False):
+                store.save_many({existing_uuid: b"existing", new_uuid: b"new"})
+
+            sessions = {str(session.uuid): session for session in model.objects.all()}
+            assert set(sessions) == {existing_uuid, new_uuid}
+            assert sessions[existing_uuid].last_accessed > expired
+            assert bytes(sessions[new_uuid].params) == b"new"
+        finally:
+            for bucket in store.discover_buckets():
+                with connections[router.db_for_write(store.bucket_model(bucket))].schema_editor() as editor:
+                    editor.delete_model(store.bucket_model(bucket))
+
+    def test_component_session_middleware(self):
+        from django.db import connections
+        from django.http import HttpResponse
+        from django.test import RequestFactory
+        from django.test.utils import CaptureQueriesContext
+
+        from reactpy_django.http.middleware import ComponentSessionMiddleware
+        from reactpy_django.utils import save_component_params
+
+        db = next(iter(self.databases))
+        keys: list[str] = []
+
+        def get_response(request):
+            keys.extend(save_component_params((value,), {}, request)[0] for value in range(10))
+            return HttpResponse()
+
+        # Every component's parameters are saved with a single query
+        with CaptureQueriesContext(connections[db]) as queries:
+            ComponentSessionMiddleware(get_response)(RequestFactory().get("/"))
+        assert [query["sql"].startswith("INSERT") for query in queries].count(True) == 1
+
+        assert ComponentSession.objects.filter(uuid__in=keys).count() == len(keys)
+
+    def test_component_params_are_deduplicated(self):
+        from reactpy_django.utils import save_component_params
+
+        initial_count = ComponentSession.objects.count()
+        first_key, _ = save_component_params(("home",), {"value": 1})
+        assert save_component_params(("home",), {"value": 1})[0] == first_key
+        assert save_component_params(("home",), {"value": 2})[0] != first_key
+        assert ComponentSession.objects.count() == initial_count + 2
+
+    def test_inline_component_params(self):
+        from asgiref.sync import async_to_sync
+
+        from reactpy_django.utils import save_component_params
+        from reactpy_django.websocket.consumer import ReactpyAsyncWebsocketConsumer
+
+        db = next(iter(self.databases))
+        initial_count = ComponentSession.objects.count()
+        small_key, small_params = save_component_params(("small",), {}, inline=True)
+        large_key, large_params = save_component_params(("large" * 1000,), {}, inline=True)
+
+        # Only parameters above REACTPY_INLINE_PARAMS_MAX_SIZE are stored
+        assert small_params
+        assert not large_params
+        assert ComponentSession.objects.count() == initial_count + 1
+
+        mounts = [
+            {"rootId": "small", "hasArgs": True, "paramsKey": small_key, "inlineParams": small_params},
+            {"rootId": "large", "hasArgs": True, "paramsKey": large_key},
+            {"rootId": "tampered", "hasArgs": True, "paramsKey": "tampered", "inlineParams": "x" + small_params},
+        ]
+        consumer = ReactpyAsyncWebsocketConsumer()
+        with self.assertNumQueries(1, using=db):
+            loaded = async_to_sync(consumer._load_component_params)(mounts)
+
+        assert loaded == {
+            small_key: ComponentParams(("small",), {}),
+            large_key: ComponentParams(("large" * 1000,), {}),
+        }
+
     def _save_params_to_db(self, value: Any) -> ComponentParams:
         db = next(iter(self.databases))
         param_data = ComponentParams((value,), {"test_value": value})
@@ -107,3 +569,32 @@ class MultiDatabaseTests(TransactionTestCase):
 
         # Make sure one user data object remains
         assert UserDataModel.objects.count() == 1
+
+    def test_user_data_cleanup_resumes(self):
+        from django.contrib.auth.models import User
+
+        from reactpy_django import config
+        from reactpy_django.models import Config
+
+        initial_batch_size = config.REACTPY_CLEAN_BATCH_SIZE
+        config.REACTPY_CLEAN_BATCH_SIZE = 2
+
+        try:
+            user = User.objects.create_user(username=str(uuid4()), password=str(uuid4()))
+            UserDataModel(user_pk=user.pk).save()
+            orphans = [UserDataModel.objects.create(user_pk=str(uuid4())) for _ in range(2)]
+            UserDataModel.objects.create(user_pk="999999999")
+            initial_count = UserDataModel.objects.count()
+
+            # The deadline has already passed, so only the first batch is checked
+            assert not tasks.clean_user_data(deadline=0)
+            assert UserDataModel.objects.count() == initial_count - 1
+            assert Config.load().user_data_cursor == orphans[0].pk
+
+            # The next clean resumes after the first batch, then starts over once finished
+            assert tasks.clean_user_data()
+            assert UserDataModel.objects.count() == initial_count - 3
+            assert list(UserDataModel.objects.values_list("user_pk", flat=True)) == [str(user.pk)]
+            assert Config.load().user_data_cursor == 0
+        finally:
+            config.REACTPY_CLEAN_BATCH_SIZE = initial_batch_size
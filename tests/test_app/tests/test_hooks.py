@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import asyncio
+from threading import current_thread
+
+import pytest
+from reactpy import Ref, component, html
+from reactpy.core.layout import Layout
+
+from reactpy_django.hooks import _REFETCH_CALLBACKS, _refetch, use_mutation, use_query
+from reactpy_django.query_cache import normalize_kwargs
+from reactpy_django.types import Invalidation
+from reactpy_django.websocket.backhaul import BackhaulShard
+
+EXECUTIONS: list[int] = []
+
+
+async def shared_query():
+    EXECUTIONS.append(1)
+    await asyncio.sleep(0.01)
+    return len(EXECUTIONS)
+
+
+def example_mutation():
+    return True
+
+
+async def filtered_query(value: int):
+    EXECUTIONS.append(value)
+    return value
+
+
+def targeted_mutation():
+    return Invalidation(filtered_query, {"value": 1})
+
+
+def test_refetches_are_coalesced():
+    mutations = []
+
+    @component
+    def child():
+        query = use_query(shared_query, postprocessor=None)
+        return html.p(str(query.data))
+
+    @component
+    def parent():
+        mutations.append(use_mutation(example_mutation, refetch=shared_query))
+        return html.div([child(key=str(index)) for index in range(5)])
+
+    async def render():
+        async with Layout(parent()) as layout:
+            render_task = asyncio.create_task(_render_forever(layout))
+            await asyncio.sleep(0.2)
+            assert len(EXECUTIONS) == 5
+
+            # A burst of mutations causes each query to be refetched once, and identical
+            # queries share a single execution
+            mutations[-1]()
+            mutations[-1]()
+            await asyncio.sleep(0.5)
+            assert len(EXECUTIONS) == 6
+            render_task.cancel()
+
+    EXECUTIONS.clear()
+    asyncio.run(render())
+
+
+def test_targeted_invalidation():
+    mutations = []
+
+    @component
+    def child(value: int):
+        query = use_query(filtered_query, {"value": value}, postprocessor=None)
+        return html.p(str(query.data))
+
+    @component
+    def parent():
+        mutations.append(use_mutation(targeted_mutation, refetch=filtered_query))
+        return html.div([child(value, key=str(value)) for value in range(3)])
+
+    async def render():
+        async with Layout(parent()) as layout:
+            render_task = asyncio.create_task(_render_forever(layout))
+            await asyncio.sleep(0.2)
+            assert sorted(EXECUTIONS) == [0, 1, 2]
+
+            # Invalidations returned by the mutation replace `refetch`, and only refetch
+            # queries with matching kwargs
+            mutations[-1]()
+            await asyncio.sleep(0.5)
+            assert sorted(EXECUTIONS) == [0, 1, 1, 2]
+            render_task.cancel()
+
+    EXECUTIONS.clear()
+    asyncio.run(render())
+
+
+def test_refetch_with_unkeyable_kwargs():
+    refetched = []
+    kwargs = {
+        lambda: refetched.append("matching"): Ref({"value": 1}),
+        lambda: refetched.append("other"): Ref({"value": 2}),
+        lambda: refetched.append("unkeyable"): Ref({"value": object()}),
+    }
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        _REFETCH_CALLBACKS[filtered_query].update({callback: (ref, loop) for callback, ref in kwargs.items()})
+
+        # Kwargs without a stable representation cannot be compared, rather than being compared via `repr`
+        with pytest.raises(TypeError):
+            normalize_kwargs({"value": object()})
+
+        # Queries with kwargs that cannot be compared are refetched, just in case they match
+        _refetch(filtered_query, normalize_kwargs({"value": 1}))
+        assert sorted(refetched) == ["matching", "unkeyable"]
+
+    try:
+        asyncio.run(run())
+    finally:
+        for callback in kwargs:
+            _REFETCH_CALLBACKS[filtered_query].pop(callback)
+
+
+def test_refetch_within_each_query_loop():
+    shards = [BackhaulShard(index) for index in range(2)]
+    refetched: dict[str, list[str]] = {}
+
+    def register(name: str):
+        async def subscribe():
+            def callback():
+                refetched.setdefault(name, []).append(current_thread().name)
+
+            _REFETCH_CALLBACKS[shared_query][callback] = (Ref({}), asyncio.get_running_loop())
+            return callback
+
+        return subscribe()
+
+    callbacks = [shard.submit(register(f"shard-{shard.index}")).result(timeout=5) for shard in shards]
+    try:
+        # A mutation within one shard refetches queries rendered by another shard within that shard's loop
+        shards[0].submit(_arefetch(shared_query)).result(timeout=5)
+        for shard in shards:
+            shard.submit(asyncio.sleep(0)).result(timeout=5)
+        assert refetched == {
+            "shard-0": ["ReactPyBackhaul-0"],
+            "shard-1": ["ReactPyBackhaul-1"],
+        }
+
+        # Refetching outside of any event loop is also dispatched to each query's loop
+        _refetch(shared_query)
+        for shard in shards:
+            shard.submit(asyncio.sleep(0)).result(timeout=5)
+        assert refetched["shard-1"] == ["ReactPyBackhaul-1", "ReactPyBackhaul-1"]
+    finally:
+        for callback in callbacks:
+            _REFETCH_CALLBACKS[shared_query].pop(callback)
+        for shard in shards:
+            shard.loop.call_soon_threadsafe(shard.loop.stop)
+
+
+async def _arefetch(query):
+    _refetch(query)
+
+
+async def _render_forever(layout: Layout):
+    while True:
+        await layout.render()
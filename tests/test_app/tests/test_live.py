@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.test import TransactionTestCase
+from reactpy import component, html
+from reactpy.core.layout import Layout
+
+from reactpy_django import config
+from reactpy_django.hooks import use_query
+from reactpy_django.live import LIVE_QUERIES, query_models
+from test_app.models import RelationalChild, RelationalParent, TodoItem
+
+EXECUTIONS: list[int] = []
+
+
+def get_items():
+    EXECUTIONS.append(1)
+    return TodoItem.objects.all()
+
+
+def create_items(count: int):
+    with transaction.atomic():
+        for index in range(count):
+            TodoItem.objects.create(text=f"live {index}", done=False)
+
+
+class LiveQueryTests(TransactionTestCase):
+    databases = ("default", config.REACTPY_DATABASE)
+
+    def test_query_models(self):
+        child = RelationalChild.objects.create(text="child")
+        parent = RelationalParent.objects.create(one_to_one=child)
+        parent.many_to_many.add(child)
+        parents = RelationalParent.objects.prefetch_related("many_to_many")
+        list(parents)
+
+        assert query_models(parents) == {RelationalParent, RelationalChild}
+        assert query_models({"items": [TodoItem(text="item", done=False)]}) == {TodoItem}
+        assert query_models(RelationalParent.objects.none()) == {RelationalParent}
+
+    def test_live_query_is_refetched(self):
+        lengths: list[int] = []
+
+        @component
+        def live_list():
+            query = use_query(get_items, thread_sensitive=False, live=True)
+            if query.data is not None:
+                lengths.append(len(query.data))
+            return html.p(str(lengths))
+
+        async def render():
+            async with Layout(live_list()) as layout:
+                render_task = asyncio.create_task(_render_forever(layout))
+                await asyncio.sleep(0.3)
+                assert len(EXECUTIONS) == 1
+                assert TodoItem in LIVE_QUERIES.watched
+
+                # Changes are applied once their transaction commits, and a burst of changes
+                # causes the query to be refetched once
+                await sync_to_async(create_items, thread_sensitive=False)(3)
+                await asyncio.sleep(0.5)
+                assert len(EXECUTIONS) == 2
+                assert lengths[-1] == 3
+
+                # Unrelated models do not cause a refetch
+                await sync_to_async(RelationalChild.objects.create, thread_sensitive=False)(text="unrelated")
+                await asyncio.sleep(0.3)
+                assert len(EXECUTIONS) == 2
+                render_task.cancel()
+
+        EXECUTIONS.clear()
+        asyncio.run(render())
+        assert not any(LIVE_QUERIES.callbacks[TodoItem])
+
+
+async def _render_forever(layout: Layout):
+    while True:
+        await layout.render()
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from reactpy import component, hooks, html
+from reactpy.types import Location
+
+from reactpy_django.exceptions import ProcessPoolExhaustedError
+from reactpy_django.websocket import process
+
+COUNTER = "test_app.tests.test_process.process_counter"
+
+
+@component
+def process_counter(start: int = 0):
+    count, set_count = hooks.use_state(start)
+    return html.button({"id": "counter", "onClick": lambda _: set_count(count + 1)}, str(count))
+
+
+@pytest.fixture
+def pool_size(monkeypatch):
+    from reactpy_django import config
+
+    def set_pool_size(size: int) -> None:
+        monkeypatch.setattr(config, "REACTPY_PROCESS_POOL_SIZE", size)
+
+    monkeypatch.setattr(process, "_PROCESS_POOL", None)
+    monkeypatch.setattr(process, "_PROCESS_MANAGER", None)
+    monkeypatch.setattr(process, "_RELAY_EXECUTOR", None)
+    monkeypatch.setattr(process, "_BUSY_WORKERS", 0)
+    yield set_pool_size
+    if process._PROCESS_POOL is not None:
+        process._PROCESS_POOL.shutdown(cancel_futures=True)
+    if process._PROCESS_MANAGER is not None:
+        process._PROCESS_MANAGER.shutdown()
+    if process._RELAY_EXECUTOR is not None:
+        process._RELAY_EXECUTOR.shutdown(wait=False)
+
+
+@pytest.fixture
+def single_worker_pool(pool_size):
+    pool_size(1)
+
+
+class _Client:
+    """Mounts a component within a worker process, and records the messages it sends."""
+
+    def __init__(self, start: int = 0):
+        self.start = start
+        self.recv_queue: asyncio.Queue = asyncio.Queue()
+        self.messages: asyncio.Queue = asyncio.Queue()
+        self.task: asyncio.Task | None = None
+
+    def mount(self) -> asyncio.Task:
+        self.task = asyncio.create_task(
+            process.serve_layout_in_process(
+                COUNTER,
+                (),
+                {"start": self.start},
+                {"type": "websocket", "path": "/", "reactpy": {"id": "test"}},
+                Location(path="/", query_string=""),
+                self.messages.put,
+                self.recv_queue,
+            )
+        )
+        return self.task
+
+    async def next_model(self) -> dict:
+        message = await asyncio.wait_for(self.messages.get(), timeout=60)
+        assert message["type"] == "layout-update"
+        return message["model"]
+
+    async def unmount(self) -> None:
+        assert self.task
+        self.task.cancel()
+        await asyncio.gather(self.task, return_exceptions=True)
+
+
+def _button(model: dict) -> dict:
+    while model.get("tagName") != "button":
+        model = model["children"][0]
+    return model
+
+
+def test_mount_and_event_round_trip(single_worker_pool):
+    async def run():
+        client = _Client(start=5)
+        client.mount()
+        button = _button(await client.next_model())
+        assert button["children"] == ["5"]
+
+        # Events are relayed into the worker, and the resulting updates are relayed back out
+        target = button["eventHandlers"]["onClick"]["target"]
+        await client.recv_queue.put({"type": "layout-event", "target": target, "data": [{}]})
+        assert _button(await client.next_model())["children"] == ["6"]
+        await client.unmount()
+
+    asyncio.run(run())
+
+
+def test_pool_exhaustion(single_worker_pool):
+    async def run():
+        first = _Client()
+        first.mount()
+        await first.next_model()
+
+        # Every worker is in use, so further components are rejected instead of waiting forever
+        with pytest.raises(ProcessPoolExhaustedError):
+            await asyncio.wait_for(_Client().mount(), timeout=5)
+
+        # The worker becomes available again once its component is unmounted
+        await first.unmount()
+        for _ in range(100):
+            if not process._BUSY_WORKERS:
+                break
+            await asyncio.sleep(0.1)
+        assert process._BUSY_WORKERS == 0
+
+        second = _Client(start=2)
+        second.mount()
+        assert _button(await second.next_model())["children"] == ["2"]
+        await second.unmount()
+
+    asyncio.run(run())
+
+
+def test_components_do_not_exhaust_default_executor(pool_size):
+    pool_size(3)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        default_executor = ThreadPoolExecutor(max_workers=2)
+        loop.set_default_executor(default_executor)
+
+        # Mount more components than the default executor has threads
+        clients = [_Client(start=index) for index in range(3)]
+        for client in clients:
+            client.mount()
+        buttons = [_button(await client.next_model()) for client in clients]
+
+        # The default executor is still available to everything else on this event loop
+        assert await asyncio.wait_for(asyncio.to_thread(lambda: "available"), timeout=5) == "available"
+
+        target = buttons[-1]["eventHandlers"]["onClick"]["target"]
+        await clients[-1].recv_queue.put({"type": "layout-event", "target": target, "data": [{}]})
+        assert _button(await clients[-1].next_model())["children"] == ["3"]
+
+        for client in clients:
+            await client.unmount()
+
+    asyncio.run(run())
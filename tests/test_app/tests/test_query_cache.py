@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+import pytest
+
+from reactpy_django import query_cache
+from test_app.models import TodoItem
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    from reactpy_django import config
+
+    monkeypatch.setattr(config, "REACTPY_QUERY_CACHE_MAX_ENTRIES", 2)
+    monkeypatch.setattr(config, "REACTPY_QUERY_CACHE_SHARED", False)
+    return query_cache.QueryCache()
+
+
+class _CountingQuery:
+    def __init__(self, delay: float = 0):
+        self.calls = 0
+        self.delay = delay
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.calls
+
+
+def test_concurrent_queries_share_one_execution(cache):
+    query = _CountingQuery(delay=0.01)
+
+    async def run_queries():
+        return await asyncio.gather(*(cache.get_or_execute("query", "key", query, ttl=60) for _ in range(10)))
+
+    assert asyncio.run(run_queries()) == [1] * 10
+    assert query.calls == 1
+
+
+def test_cached_results_expire(cache):
+    query = _CountingQuery()
+
+    async def run_queries():
+        assert await cache.get_or_execute("query", "key", query, ttl=60) == 1
+        assert await cache.get_or_execute("query", "key", query, ttl=60) == 1
+        assert await cache.get_or_execute("query", "key", query, ttl=60, force=True) == 2
+
+        # Stale results are returned while the query is re-executed in the background
+        cache.entries["key"].fresh_until = 0
+        cache.entries["key"].stale_until = float("inf")
+        assert await cache.get_or_execute("query", "key", query, ttl=60, stale_ttl=60) == 2
+        await asyncio.sleep(0.01)
+        assert await cache.get_or_execute("query", "key", query, ttl=60, stale_ttl=60) == 3
+
+        # Expired results are not returned at all
+        cache.entries["key"].fresh_until = cache.entries["key"].stale_until = 0
+        assert await cache.get_or_execute("query", "key", query, ttl=60) == 4
+
+    asyncio.run(run_queries())
+
+
+def test_invalidation_and_eviction(cache):
+    query = _CountingQuery()
+
+    async def run_queries():
+        await cache.get_or_execute("query", "a", query, ttl=60)
+        await cache.get_or_execute("other", "b", query, ttl=60)
+        await cache.ainvalidate("query")
+        assert set(cache.entries) == {"b"}
+
+        # Least recently used entries are evicted once `REACTPY_QUERY_CACHE_MAX_ENTRIES` is reached
+        await cache.get_or_execute("query", "c", query, ttl=60)
+        await cache.get_or_execute("query", "d", query, ttl=60)
+        assert set(cache.entries) == {"c", "d"}
+        assert cache.keys_by_query == {"query": {"c", "d"}, "other": set()}
+
+    asyncio.run(run_queries())
+
+
+def test_concurrent_threads(cache):
+    query = _CountingQuery()
+
+    async def run_queries(thread: int):
+        for index in range(200):
+            await cache.get_or_execute(f"query-{index % 3}", f"{thread}-{index % 5}", query, ttl=60)
+            if index % 7 == 0:
+                await cache.ainvalidate(f"query-{index % 3}")
+
+    # Each backhaul thread uses the same cache at once
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for future in [executor.submit(asyncio.run, run_queries(thread)) for thread in range(4)]:
+            future.result(timeout=30)
+
+    assert len(cache.entries) <= 2
+    assert set(cache.entries) == set().union(*cache.keys_by_query.values())
+
+
+def test_shared_cache(monkeypatch):
+    from reactpy_django import config
+
+    monkeypatch.setattr(config, "REACTPY_QUERY_CACHE_SHARED", True)
+    query = _CountingQuery()
+
+    async def run_queries():
+        first_process, second_process = query_cache.QueryCache(), query_cache.QueryCache()
+        await first_process.ainvalidate("shared_query")
+        assert await first_process.get_or_execute("shared_query", "key", query, ttl=60) == 1
+        assert await second_process.get_or_execute("shared_query", "key", query, ttl=60) == 1
+
+        # Invalidation applies to every process
+        await first_process.ainvalidate("shared_query")
+        assert await query_cache.QueryCache().get_or_execute("shared_query", "key", query, ttl=60) == 2
+
+    asyncio.run(run_queries())
+
+
+def test_query_cache_key():
+    def get_items():
+        pass
+
+    key = query_cache.query_cache_key(get_items, {"b": 1, "a": {2, 1}}, None, {})
+    assert key == query_cache.query_cache_key(get_items, {"a": {1, 2}, "b": 1}, None, {})
+    assert key != query_cache.query_cache_key(get_items, {"a": {1, 2}, "b": 2}, None, {})
+
+
+def get_module_items():
+    pass
+
+
+def test_query_name():
+    def get_items():
+        pass
+
+    def make_query():
+        def get_items():
+            pass
+
+        return get_items
+
+    # Module level functions are identified by name, so that they can be shared between processes
+    assert query_cache.query_name(get_module_items) == f"{__name__}.get_module_items"
+
+    # Other functions also include their identity, so that functions with the same name never collide
+    first, second = make_query(), make_query()
+    assert query_cache.query_name(first) != query_cache.query_name(second)
+    assert query_cache.query_name(first) == query_cache.query_name(first)
+    assert query_cache.query_name(lambda: 1) != query_cache.query_name(lambda: 2)
+    assert query_cache.query_name(get_items).startswith(f"{__name__}.test_query_name.<locals>.get_items:")
+
+
+def test_query_cache_key_without_repr():
+    query = _CountingQuery()
+
+    # Values without a stable representation cannot be keyed, so the query is not cached
+    assert query_cache.query_cache_key(get_module_items, {"value": object()}, None, {}) is None
+    assert query_cache.query_cache_key(get_module_items, {"value": query}, None, {}) is None
+    assert query_cache.query_cache_key(get_module_items, {"value": TodoItem.objects.all()}, None, {}) is None
+    assert query_cache.query_cache_key(get_module_items, {"value": TodoItem(text="unsaved")}, None, {}) is None
+
+    key = query_cache.query_cache_key(get_module_items, {"value": TodoItem(pk=1), "price": Decimal("1.50")}, None, {})
+    assert key == query_cache.query_cache_key(
+        get_module_items, {"value": TodoItem(pk=1), "price": Decimal("1.50")}, None, {}
+    )
+    assert key != query_cache.query_cache_key(
+        get_module_items, {"value": TodoItem(pk=2), "price": Decimal("1.50")}, None, {}
+    )
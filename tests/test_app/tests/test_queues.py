@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from collections import Counter
+
+import pytest
+
+from reactpy_django.websocket import queues
+
+
+@pytest.fixture(autouse=True)
+def isolated_stats(monkeypatch):
+    monkeypatch.setattr(queues, "EVENT_QUEUE_STATS", Counter())
+
+
+def _event(target: str, value: int) -> dict:
+    return {"type": "layout-event", "target": target, "data": [value]}
+
+
+def test_unbounded_queue_accepts_everything():
+    queue = queues.ComponentEventQueue()
+    for value in range(100):
+        assert queue.offer(_event("a", value))
+    assert queue.qsize() == 100
+
+
+def test_drop_oldest():
+    queue = queues.ComponentEventQueue(2, "drop-oldest")
+    for value in range(3):
+        assert queue.offer(_event("a", value))
+
+    assert [queue.get_nowait()["data"][0] for _ in range(queue.qsize())] == [1, 2]
+    assert queues.EVENT_QUEUE_STATS["dropped"] == 1
+
+
+def test_coalesce_same_target():
+    queue = queues.ComponentEventQueue(2, "coalesce")
+    assert queue.offer(_event("a", 0))
+    assert queue.offer(_event("b", 1))
+    assert queue.offer(_event("a", 2))
+
+    assert [queue.get_nowait()["data"][0] for _ in range(queue.qsize())] == [2, 1]
+    assert queues.EVENT_QUEUE_STATS["coalesced"] == 1
+
+
+def test_reject():
+    queue = queues.ComponentEventQueue(1, "reject")
+    assert queue.offer(_event("a", 0))
+    assert not queue.offer(_event("a", 1))
+
+    assert queue.get_nowait()["data"][0] == 0
+    assert queues.EVENT_QUEUE_STATS["rejected"] == 1
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+from threading import current_thread
+
+import pytest
+from reactpy import Ref
+
+from reactpy_django import hooks, refetch
+from reactpy_django.query_cache import query_name
+from reactpy_django.websocket.backhaul import BackhaulShard
+
+
+def example_query(): ...
+
+
+@pytest.fixture
+def buses(monkeypatch):
+    from reactpy_django import config
+
+    monkeypatch.setattr(config, "REACTPY_REFETCH_CHANNEL_LAYER", "default")
+    monkeypatch.setattr(config, "REACTPY_REFETCH_INTERVAL", 10)
+    return refetch.RefetchBus(), refetch.RefetchBus()
+
+
+def test_refetches_are_sent_to_other_processes(buses):
+    publisher, subscriber = buses
+    refetched: list[str] = []
+    callback = lambda: refetched.append("subscriber")
+
+    async def mutate():
+        hooks._REFETCH_CALLBACKS[example_query][callback] = (Ref({}), asyncio.get_running_loop())
+        publisher.start()
+        subscriber.start()
+        await asyncio.sleep(0.01)
+
+        # A burst of mutations only results in one refetch
+        for _ in range(5):
+            publisher.publish([(query_name(example_query), None)])
+        await asyncio.sleep(0.1)
+
+        publisher.listener.cancel()
+        subscriber.listener.cancel()
+
+    try:
+        asyncio.run(mutate())
+    finally:
+        hooks._REFETCH_CALLBACKS.pop(example_query)
+
+    # The publisher has already refetched its own queries, so it ignores its own message
+    assert refetched == ["subscriber"]
+
+
+def test_refetches_are_applied_within_each_query_loop(buses):
+    publisher, subscriber = buses
+    shard = BackhaulShard(0)
+    refetched: list[str] = []
+    callback = lambda: refetched.append(current_thread().name)
+
+    async def register():
+        hooks._REFETCH_CALLBACKS[example_query][callback] = (Ref({}), asyncio.get_running_loop())
+
+    async def mutate():
+        publisher.start()
+        subscriber.start()
+        await asyncio.sleep(0.01)
+        publisher.publish([(query_name(example_query), None)])
+        await asyncio.sleep(0.1)
+
+        publisher.listener.cancel()
+        subscriber.listener.cancel()
+
+    shard.submit(register()).result(timeout=5)
+    try:
+        asyncio.run(mutate())
+        shard.submit(asyncio.sleep(0)).result(timeout=5)
+    finally:
+        hooks._REFETCH_CALLBACKS.pop(example_query)
+        shard.loop.call_soon_threadsafe(shard.loop.stop)
+
+    # The query was refetched within the thread that rendered it, rather than the listener's thread
+    assert refetched == ["ReactPyBackhaul-0"]
+
+
+def test_model_changes_are_sent_to_other_processes(buses):
+    from reactpy_django.live import LIVE_QUERIES
+    from test_app.models import TodoItem
+
+    publisher, subscriber = buses
+    refetched: list[str] = []
+    callback = lambda: refetched.append("subscriber")
+
+    async def change_models():
+        publisher.start()
+        subscriber.start()
+        LIVE_QUERIES.subscribe(callback, [TodoItem])
+        await asyncio.sleep(0.01)
+
+        # Changes made within a thread are also published
+        await asyncio.to_thread(publisher.publish_models, ["test_app.todoitem"])
+        publisher.publish_models(["test_app.todoitem", "test_app.missing"])
+        await asyncio.sleep(0.1)
+
+        publisher.listener.cancel()
+        subscriber.listener.cancel()
+
+    try:
+        asyncio.run(change_models())
+    finally:
+        LIVE_QUERIES.unsubscribe(callback)
+
+    assert refetched == ["subscriber"]
+
+
+class _FlakyChannelLayer:
+    """A channel layer that fails to receive once, and quickly forgets group members."""
+
+    group_expiry = 0.1
+
+    def __init__(self):
+        self.group_adds = 0
+        self.receives = 0
+        self.messages: asyncio.Queue = asyncio.Queue()
+
+    async def new_channel(self):
+        return "channel"
+
+    async def group_add(self, group, channel):
+        self.group_adds += 1
+
+    async def group_discard(self, group, channel): ...
+
+    async def receive(self, channel):
+        self.receives += 1
+        if self.receives == 1:
+            msg = "Connection lost"
+            raise ConnectionError(msg)
+        return await self.messages.get()
+
+
+def test_listener_recovers(buses, monkeypatch):
+    bus, _ = buses
+    channel_layer = _FlakyChannelLayer()
+    monkeypatch.setattr(refetch, "get_channel_layer", lambda _: channel_layer)
+    monkeypatch.setattr(bus, "retry_delay", 0.01)
+
+    async def listen():
+        bus.start()
+        await asyncio.sleep(0.3)
+
+        # The listener restarts after failing to receive, and renews its group membership
+        assert not bus.listener.done()
+        assert channel_layer.receives == 2
+        assert channel_layer.group_adds >= 3
+
+        await channel_layer.messages.put({"type": "refetch", "origin": "other", "queries": [], "models": ["a.b"]})
+        await asyncio.sleep(0.01)
+        assert bus.incoming_models == {"a.b"}
+        bus.listener.cancel()
+        bus.apply_task.cancel()
+
+    asyncio.run(listen())
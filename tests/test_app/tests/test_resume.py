@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import asyncio
+
+from .utils import RecordingConsumer
+
+
+def test_resume_replays_parked_messages():
+    asyncio.run(_resume_replays_parked_messages())
+
+
+async def _resume_replays_parked_messages():
+    parked = RecordingConsumer()
+    parked.component_tasks["root"] = asyncio.create_task(asyncio.sleep(0))
+
+    await parked._park()
+    await parked.send_component_message({"type": "layout-update", "rootId": "root"})
+    assert parked.sent == []
+
+    resumed = RecordingConsumer()
+    await resumed._resume(parked)
+    assert resumed.component_tasks is parked.component_tasks
+    assert resumed.sent == [{"type": "layout-update", "rootId": "root"}]
+
+    # Components of the parked connection now send via the resumed connection
+    await parked.send_component_message({"type": "layout-update", "rootId": "root", "n": 2})
+    assert resumed.sent[-1]["n"] == 2
+    assert parked.sent == []
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+
+import pytest
+
+from reactpy_django import sessions
+
+
+class _RecordingStore(sessions.ComponentSessionStore):
+    def __init__(self):
+        self.touched: list[set[str]] = []
+
+    async def atouch_many(self, uuids):
+        self.touched.append(set(uuids))
+
+
+@pytest.fixture
+def store(monkeypatch):
+    from reactpy_django import config
+
+    store = _RecordingStore()
+    monkeypatch.setattr(sessions, "SESSION_TOUCH_STATS", Counter())
+    monkeypatch.setattr(sessions, "get_session_store", lambda: store)
+    monkeypatch.setattr(config, "REACTPY_SESSION_TOUCH_INTERVAL", 0.01)
+    return store
+
+
+def test_touches_are_coalesced(store):
+    async def disconnect_clients():
+        toucher = sessions.SessionToucher()
+        await toucher.touch({"a", "b"})
+        await toucher.touch({"b", "c"})
+        await asyncio.sleep(0.05)
+
+        # Sessions that were touched recently are skipped
+        await toucher.touch({"a"})
+        await toucher.flush()
+
+    asyncio.run(disconnect_clients())
+
+    assert store.touched == [{"a", "b", "c"}]
+    assert sessions.SESSION_TOUCH_STATS == Counter(requested=5, skipped=2, written=3, flushes=1)
+
+
+def test_touches_are_flushed_after_event_loop_closes(store):
+    toucher = sessions.SessionToucher()
+
+    # The event loop closes before its flush has a chance to run
+    asyncio.run(toucher.touch({"a"}))
+    assert store.touched == []
+
+    async def touch_later():
+        await toucher.touch({"b"})
+        await asyncio.sleep(0.05)
+
+    # Sessions are still flushed by the next event loop to touch a session
+    asyncio.run(touch_later())
+    assert store.touched == [{"a", "b"}]
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from django.db import connection
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from reactpy_django import config
+from reactpy_django.utils import django_query_postprocessor
+from test_app.models import ForiegnChild, RelationalChild, RelationalParent
+
+
+class QueryPostprocessorTests(TransactionTestCase):
+    databases = ("default", config.REACTPY_DATABASE)
+
+    def setUp(self):
+        for index in range(10):
+            one_to_one = RelationalChild.objects.create(text=f"one_to_one {index}")
+            parent = RelationalParent.objects.create(one_to_one=one_to_one)
+            parent.many_to_many.add(
+                *(RelationalChild.objects.create(text=f"many_to_many {index} {child}") for child in range(3))
+            )
+            for child in range(3):
+                ForiegnChild.objects.create(text=f"many_to_one {index} {child}", parent=parent)
+
+    def assert_fully_fetched(self, parent: RelationalParent):
+        with self.assertNumQueries(0):
+            assert parent.one_to_one.text.startswith("one_to_one")
+            assert len(parent.many_to_many.all()) == 3
+            for child in parent.many_to_many.all():
+                assert child.text.startswith("many_to_many")
+                assert not hasattr(child, "one_to_one")
+            for child in parent.many_to_one.all():
+                assert child.parent is parent
+
+    def test_queryset_is_fetched_in_bulk(self):
+        # Query count does not depend on the number of rows
+        with CaptureQueriesContext(connection) as queries:
+            parents = django_query_postprocessor(RelationalParent.objects.only("pk"))
+        assert len(queries) == 3
+        assert len(parents) == 10
+        for parent in parents:
+            self.assert_fully_fetched(parent)
+
+    def test_model_is_fetched_in_bulk(self):
+        parent = RelationalParent.objects.only("pk").first()
+        with CaptureQueriesContext(connection) as queries:
+            django_query_postprocessor(parent)
+        assert len(queries) == 4
+        self.assert_fully_fetched(parent)
+
+    def test_postprocessor_kwargs(self):
+        with CaptureQueriesContext(connection) as queries:
+            parents = django_query_postprocessor(RelationalParent.objects.all(), many_to_many=False, max_depth=0)
+        assert len(queries) == 1
+        assert not hasattr(parents[0], "_prefetched_objects_cache")
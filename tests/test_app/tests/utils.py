@@ -17,6 +17,7 @@ from django.test.utils import modify_settings
 from playwright.sync_api import sync_playwright
 
 from reactpy_django.utils import str_to_bool
+from reactpy_django.websocket.consumer import ReactpyAsyncWebsocketConsumer
 
 if TYPE_CHECKING:
     from daphne.testing import DaphneProcess
@@ -152,3 +153,17 @@ def navigate_to_page(path: str, *, server_num=0):
         return _wrapper(func)
 
     return _decorator
+
+
+class RecordingConsumer(ReactpyAsyncWebsocketConsumer):
+    """A consumer that records the messages it would send to the client, rather than sending them."""
+
+    def __init__(self, batch_interval: float = 0, batch_max_messages: int = 0):
+        super().__init__()
+        self.scope = {"user": None}
+        self.batch_interval = batch_interval
+        self.batch_max_messages = batch_max_messages
+        self.sent: list = []
+
+    async def send_json(self, content, close=False):
+        self.sent.append(content)